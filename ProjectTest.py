@@ -1,11 +1,45 @@
 import random
-import json
+import bisect
 import os
-import logging
-from datetime import datetime, time
+import threading
+from abc import ABC, abstractmethod
+from datetime import time
 from enum import Enum
-import yaml
-from typing import List, Dict, Set, Optional
+from typing import TYPE_CHECKING, List, Dict, Iterable, NamedTuple, Set, Optional, Sequence
+from event_log import NULL_EVENT_LOG
+from game_clock import GameClock, parse_time_of_day
+
+if TYPE_CHECKING:
+    from save_store import SaveJournal
+
+# yaml, logging, pickle, json and save_store are imported where first needed: a
+# process that never reads config.yaml, logs or saves never pays for them.
+
+_logger = None
+
+def get_logger():
+    """The game log (university_sim.log), configured on first use.
+
+    Records are handed to a QueueListener thread, so logging from many
+    sessions never waits on the file.
+    """
+    global _logger
+    if _logger is None:
+        import atexit
+        import logging
+        import logging.handlers
+        import queue
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(records, logging.FileHandler('university_sim.log'))
+        listener.start()
+        atexit.register(listener.stop)
+        logging.basicConfig(
+            handlers=[logging.handlers.QueueHandler(records)],
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        _logger = logging.getLogger()
+    return _logger
 
 # Enums
 class Weather(Enum):
@@ -14,6 +48,8 @@ class Weather(Enum):
     SNOWY = "snowy"
     CLOUDY = "cloudy"
 
+WEATHERS = tuple(Weather)  # Draw order for weather changes
+
 class Difficulty(Enum):
     EASY = "easy"
     MEDIUM = "medium"
@@ -32,13 +68,160 @@ class MajorPlot(Enum):
     ENTREPRENEURIAL_SPIRIT = "Entrepreneurial Spirit"
     RESEARCH_PIONEER = "Research Pioneer"
 
+# Game entities use __slots__: at many resident sessions the per-object dicts dominate
+def _copy_slots(obj):
+    """Shallow copy of a __slots__ object: a new instance sharing every attribute value."""
+    cls = type(obj)
+    clone = object.__new__(cls)
+    for name in cls.__slots__:
+        setattr(clone, name, getattr(obj, name))
+    return clone
+
 class Item:
+    """An item definition, treated as immutable so one instance can be shared.
+
+    Item.define returns the same instance for the same (name, type, value),
+    so inventories hold references to a handful of shared definitions.
+    """
+    __slots__ = ("name", "type", "value")
+    _definitions: Dict[tuple, 'Item'] = {}
+
     def __init__(self, name: str, item_type: str, value: int):
         self.name = name
         self.type = item_type
         self.value = value
 
+    @classmethod
+    def define(cls, name: str, item_type: str, value: int) -> 'Item':
+        key = (name, item_type, value)
+        item = cls._definitions.get(key)
+        if item is None:
+            item = cls._definitions[key] = cls(name, item_type, value)
+        return item
+
+    # Equal definitions are the same item, whether interned or not
+    def __eq__(self, other):
+        if not isinstance(other, Item):
+            return NotImplemented
+        return (self.name, self.type, self.value) == (other.name, other.type, other.value)
+
+    def __hash__(self):
+        return hash((self.name, self.type, self.value))
+
+class Inventory:
+    """A multiset of items: a count per item definition and per item type.
+
+    Adding, consuming and "do I hold any study_aid" checks are O(1)
+    however many items are held, and memory grows with the number of
+    distinct definitions rather than items. Iterating yields every held
+    item, grouped by definition in order of first acquisition.
+
+    copy() is copy-on-write: both inventories share their count tables
+    until either one changes.
+    """
+    __slots__ = ("_counts", "_type_counts", "_size", "_shared")
+
+    def __init__(self, items: Iterable[Item] = ()):
+        self._counts: Dict[Item, int] = {}
+        self._type_counts: Dict[str, int] = {}
+        self._size = 0
+        self._shared = False
+        for item in items:
+            self.add(item)
+
+    def _unshare(self):
+        self._counts = dict(self._counts)
+        self._type_counts = dict(self._type_counts)
+        self._shared = False
+
+    def add(self, item: Item, count: int = 1):
+        if self._shared:
+            self._unshare()
+        self._counts[item] = self._counts.get(item, 0) + count
+        self._type_counts[item.type] = self._type_counts.get(item.type, 0) + count
+        self._size += count
+
+    def remove(self, item: Item, count: int = 1) -> bool:
+        """Consume count of item; returns False (and changes nothing) if not held."""
+        held = self._counts.get(item, 0)
+        if held < count:
+            return False
+        if self._shared:
+            self._unshare()
+        if held == count:
+            del self._counts[item]
+        else:
+            self._counts[item] = held - count
+        remaining = self._type_counts[item.type] - count
+        if remaining:
+            self._type_counts[item.type] = remaining
+        else:
+            del self._type_counts[item.type]
+        self._size -= count
+        return True
+
+    def count(self, item: Item) -> int:
+        return self._counts.get(item, 0)
+
+    def has_type(self, item_type: str) -> bool:
+        return item_type in self._type_counts
+
+    def count_type(self, item_type: str) -> int:
+        return self._type_counts.get(item_type, 0)
+
+    def stacks(self) -> List[tuple]:
+        """(item, count) per distinct definition held."""
+        return list(self._counts.items())
+
+    def copy(self) -> 'Inventory':
+        clone = _copy_slots(self)
+        self._shared = clone._shared = True
+        return clone
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, item):
+        return item in self._counts
+
+    def __iter__(self):
+        for item, count in self._counts.items():
+            for _ in range(count):
+                yield item
+
+_uniform_sum_pmfs: Dict[tuple, List[List[float]]] = {}
+
+def uniform_sum_pmf(count: int, low: int, high: int) -> List[float]:
+    """Exact pmf of the sum of count independent randint(low, high) draws.
+
+    Index i is the probability that the sum is count * low + i. Built by
+    repeated convolution and cached per (low, high).
+    """
+    pmfs = _uniform_sum_pmfs.setdefault((low, high), [[1.0]])
+    width = high - low + 1
+    while len(pmfs) <= count:
+        previous = pmfs[-1]
+        pmf = [0.0] * (len(previous) + width - 1)
+        for i, p in enumerate(previous):
+            p /= width
+            for j in range(i, i + width):
+                pmf[j] += p
+        pmfs.append(pmf)
+    return pmfs[count]
+
+def _draw_index(weights: List[float], rng) -> int:
+    r = rng.random() * sum(weights)
+    for i, weight in enumerate(weights):
+        r -= weight
+        if r < 0:
+            return i
+    return max(i for i, weight in enumerate(weights) if weight > 0)
+
 class ResearchProject:
+    __slots__ = ("name", "difficulty", "duration", "progress", "completed")
+
+    PROGRESS_DRAW = (1, 5)  # Per-hour progress is skill_level + randint(1, 5)
+
     def __init__(self, name: str, difficulty: int, duration: int):
         self.name = name
         self.difficulty = difficulty
@@ -46,37 +229,225 @@ class ResearchProject:
         self.progress = 0
         self.completed = False
 
-    def work_on_project(self, hours: int, skill_level: int):
-        progress_made = hours * (skill_level + random.randint(1, 5))
+    def work_on_project(self, hours: int, skill_level: int, rng=random):
+        progress_made = hours * (skill_level + rng.randint(*self.PROGRESS_DRAW))
         self.progress += progress_made
         if self.progress >= 100:
             self.completed = True
         return progress_made
 
+    def fork(self) -> 'ResearchProject':
+        return _copy_slots(self)
+
+    def work_sessions(self, sessions: int, hours: int, skill_level: int, rng=random) -> tuple:
+        """Outcome of sessions calls of Student.work_on_research, drawn in one go.
+
+        Every session adds hours * (skill + randint(1, 5)), and each
+        session that ends with the project complete raises the Research
+        skill by one (as work_on_research does). The session that
+        completes the project is drawn from its exact distribution (the
+        pmf of summed uniform draws), then the progress at that session
+        given it completes; later sessions only need the sum of their
+        draws. The result has the same distribution as step-by-step play,
+        although the rng is consumed differently.
+
+        Returns (progress made, 1-based session that completed the project
+        or None, Research skill gained).
+        """
+        low, high = self.PROGRESS_DRAW
+        if sessions <= 0:
+            return 0, None, 0
+        made = 0
+        completed_at = None
+        skill = skill_level
+        done = 0  # Sessions accounted for before the completed phase
+        if not self.completed:
+            need = 100 - self.progress
+            # After j sessions the project is complete once the draw sum reaches threshold(j)
+            def threshold(j):
+                return -((hours * j * skill - need) // hours)
+
+            def below(j):
+                # P(sum of j draws < threshold(j)), i.e. still incomplete after j sessions
+                t = threshold(j) - j * low
+                pmf = uniform_sum_pmf(j, low, high)
+                return sum(pmf[:max(0, t)])
+
+            r = rng.random()
+            for k in range(1, sessions + 1):
+                if r < 1.0 - below(k):  # P(completed within k sessions)
+                    completed_at = k
+                    break
+            if completed_at is None:
+                # Incomplete throughout: the draw sum given it stays below the threshold
+                pmf = uniform_sum_pmf(sessions, low, high)
+                total = sessions * low + _draw_index(pmf[:max(1, threshold(sessions) - sessions * low)], rng)
+                self.progress += hours * (sessions * skill + total)
+                return hours * (sessions * skill + total), None, 0
+            # Completed at session k: draw (sum of the first k - 1, k-th draw) jointly
+            k = completed_at
+            previous = uniform_sum_pmf(k - 1, low, high)
+            limit, reach = threshold(k - 1) - (k - 1) * low, threshold(k)
+            pairs = [(a, u) for a in range(min(len(previous), limit)) for u in range(low, high + 1)
+                     if a + (k - 1) * low + u >= reach]
+            a, u = pairs[_draw_index([previous[a] for a, _ in pairs], rng)]
+            made = hours * (k * skill + a + (k - 1) * low + u)
+            done = k
+            skill += 1
+        # Sessions on a completed project: skill rises by one after each
+        later = sessions - done
+        if later:
+            total = sum(rng.randint(low, high) for _ in range(later))
+            made += hours * (later * skill + later * (later - 1) // 2 + total)
+        self.progress += made
+        self.completed = True
+        return made, completed_at, (1 if done else 0) + later
+
+class Assignment:
+    """One graded piece of work. Treated as a value: regrading replaces it,
+    so forked courses can share their assignments."""
+    __slots__ = ("name", "weight", "grade")
+
+    def __init__(self, name: str, weight: float, grade: float = 0.0):
+        self.name = name
+        self.weight = weight
+        self.grade = grade
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "weight": self.weight, "grade": self.grade}
+
 class Course:
+    """A course and its grade inputs.
+
+    final_grade is the final exam score; the course grade derived from it,
+    the midterm and the weighted assignments is calculate_final_grade().
+    The weighted assignment sum is kept as a running total, so changing
+    any input is O(1) and the course grade is only recomputed when read
+    after a change. Grade assignments through grade_assignment so the
+    total stays in step. revision counts input changes.
+    """
+    __slots__ = ("name", "credits", "difficulty", "assignments", "_midterm_grade", "_final_grade",
+                 "attendance", "participation", "_assignment_total", "_grade", "revision")
+
     def __init__(self, name: str, credits: int, difficulty: int):
         self.name = name
         self.credits = credits
         self.difficulty = difficulty
-        self.assignments = []
-        self.midterm_grade = 0.0
-        self.final_grade = 0.0
+        self.assignments: List[Assignment] = []
+        self._midterm_grade = 0.0
+        self._final_grade = 0.0
         self.attendance = 0
         self.participation = 0.0
+        self._assignment_total = 0.0
+        self._grade: Optional[float] = 0.0
+        self.revision = 0
+
+    def _changed(self):
+        self._grade = None
+        self.revision += 1
+
+    @property
+    def midterm_grade(self) -> float:
+        return self._midterm_grade
+
+    @midterm_grade.setter
+    def midterm_grade(self, grade: float):
+        self._midterm_grade = float(grade)
+        self._changed()
 
-    def add_assignment(self, name: str, weight: float):
-        self.assignments.append({"name": name, "weight": weight, "grade": 0.0})
+    @property
+    def final_grade(self) -> float:
+        return self._final_grade
+
+    @final_grade.setter
+    def final_grade(self, grade: float):
+        self._final_grade = float(grade)
+        self._changed()
+
+    def add_assignment(self, name: str, weight: float, grade: float = 0.0):
+        self.assignments.append(Assignment(name, weight, grade))
+        self._assignment_total += grade * weight
+        self._changed()
 
     def grade_assignment(self, assignment_index: int, grade: float):
-        self.assignments[assignment_index]["grade"] = grade
+        assignment = self.assignments[assignment_index]
+        self._assignment_total += (grade - assignment.grade) * assignment.weight
+        self.assignments[assignment_index] = Assignment(assignment.name, assignment.weight, grade)
+        self._changed()
+
+    def fork(self) -> 'Course':
+        clone = _copy_slots(self)
+        clone.assignments = list(self.assignments)
+        return clone
+
+    def calculate_final_grade(self) -> float:
+        if self._grade is None:
+            self._grade = (self._assignment_total * 0.4) + (self._midterm_grade * 0.3) + (self._final_grade * 0.3)
+        return self._grade
 
-    def calculate_final_grade(self):
-        assignment_total = sum(a["grade"] * a["weight"] for a in self.assignments)
-        self.final_grade = (assignment_total * 0.4) + (self.midterm_grade * 0.3) + (self.final_grade * 0.3)
-        return self.final_grade
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "credits": self.credits,
+            "difficulty": self.difficulty,
+            "assignments": [a.to_dict() for a in self.assignments],
+            "midterm_grade": self.midterm_grade,
+            "final_grade": self.final_grade,
+            "attendance": self.attendance,
+            "participation": self.participation
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Course':
+        course = cls(data["name"], data["credits"], data["difficulty"])
+        for a in data["assignments"]:
+            course.add_assignment(a["name"], a["weight"], a["grade"])
+        course.midterm_grade = data["midterm_grade"]
+        course.final_grade = data["final_grade"]
+        course.attendance = data["attendance"]
+        course.participation = data["participation"]
+        return course
+
+# Arc key -> (display name, milestones). Shared by every StoryProgress; only the position is per player.
+STORY_ARCS = {
+    "personal_growth": ("Personal Growth", (
+        "Freshman Orientation",
+        "Identity Crisis",
+        "Finding Your Passion",
+        "Leadership Opportunity",
+        "Personal Transformation",
+        "Legacy Planning"
+    )),
+    "academic_journey": ("Academic Journey", (
+        "First Major Assignment",
+        "Choosing Specialization",
+        "Internship Application",
+        "Research Project",
+        "Thesis Proposal",
+        "Final Presentation"
+    )),
+    "social_life": ("Social Life", (
+        "Roommate Introduction",
+        "Club Fair",
+        "Campus Event Organization",
+        "Relationship Dilemma",
+        "Spring Break Adventure",
+        "Graduation Party Planning"
+    )),
+    "career_development": ("Career Development", (
+        "Career Center Visit",
+        "First Job Fair",
+        "Summer Internship",
+        "Networking Event",
+        "Job Interview Preparation",
+        "Job Offer Negotiation"
+    ))
+}
 
 class StoryArc:
-    def __init__(self, name: str, milestones: List[str]):
+    __slots__ = ("name", "milestones", "current_milestone")
+
+    def __init__(self, name: str, milestones: Sequence[str]):
         self.name = name
         self.milestones = milestones
         self.current_milestone = 0
@@ -90,49 +461,33 @@ class StoryArc:
     def get_current_milestone(self) -> str:
         return self.milestones[self.current_milestone]
 
+    def fork(self) -> 'StoryArc':
+        return _copy_slots(self)
+
 class StoryProgress:
+    __slots__ = ("semester", "major_plot", "story_arcs", "relationships", "key_decisions",
+                 "global_awareness", "achievements")
+
     def __init__(self):
         self.semester = 1
         self.major_plot: Optional[MajorPlot] = None
         self.story_arcs: Dict[str, StoryArc] = {
-            "personal_growth": StoryArc("Personal Growth", [
-                "Freshman Orientation",
-                "Identity Crisis",
-                "Finding Your Passion",
-                "Leadership Opportunity",
-                "Personal Transformation",
-                "Legacy Planning"
-            ]),
-            "academic_journey": StoryArc("Academic Journey", [
-                "First Major Assignment",
-                "Choosing Specialization",
-                "Internship Application",
-                "Research Project",
-                "Thesis Proposal",
-                "Final Presentation"
-            ]),
-            "social_life": StoryArc("Social Life", [
-                "Roommate Introduction",
-                "Club Fair",
-                "Campus Event Organization",
-                "Relationship Dilemma",
-                "Spring Break Adventure",
-                "Graduation Party Planning"
-            ]),
-            "career_development": StoryArc("Career Development", [
-                "Career Center Visit",
-                "First Job Fair",
-                "Summer Internship",
-                "Networking Event",
-                "Job Interview Preparation",
-                "Job Offer Negotiation"
-            ])
+            key: StoryArc(name, milestones) for key, (name, milestones) in STORY_ARCS.items()
         }
         self.relationships: Dict[str, int] = {}
         self.key_decisions: Dict[str, str] = {}
         self.global_awareness = 0
         self.achievements: Set[str] = set()
 
+    def fork(self) -> 'StoryProgress':
+        """An independent copy sharing only immutable parts (arc definitions, enums)."""
+        clone = _copy_slots(self)
+        clone.story_arcs = {key: arc.fork() for key, arc in self.story_arcs.items()}
+        clone.relationships = dict(self.relationships)
+        clone.key_decisions = dict(self.key_decisions)
+        clone.achievements = set(self.achievements)
+        return clone
+
     def advance_semester(self):
         self.semester += 1
         for arc in self.story_arcs.values():
@@ -168,6 +523,10 @@ class StoryProgress:
         return summary
 
 class Student:
+    __slots__ = ("name", "major", "semester", "energy", "max_energy", "gpa", "credits", "inventory",
+                 "skills", "money", "mental_state", "stress_level", "relationships", "courses", "job",
+                 "extracurriculars", "stats", "research_projects", "skill_levels", "_semester_gpa")
+
     def __init__(self, name: str, major: str, difficulty: Difficulty = Difficulty.MEDIUM):
         self.name = name
         self.major = major
@@ -176,7 +535,7 @@ class Student:
         self.max_energy = 100
         self.gpa = 0.0
         self.credits = 0
-        self.inventory: List[Item] = []
+        self.inventory = Inventory()
         self.skills: List[str] = []
         self.money = 1000 if difficulty == Difficulty.EASY else 500
         self.mental_state = MentalState.GOOD
@@ -199,22 +558,51 @@ class Student:
             "Presentation": 1,
             "Teamwork": 1
         }
+        self._semester_gpa = ((), 0.0)  # (course revisions it was computed from, value)
+
+    def fork(self) -> 'Student':
+        """An independent copy for what-if play.
+
+        The inventory is copy-on-write, assignments and item definitions
+        are shared values, the job is a shared catalog entry; the small
+        containers play can change are copied.
+        """
+        clone = _copy_slots(self)
+        clone.inventory = self.inventory.copy()
+        clone.skills = list(self.skills)
+        clone.relationships = dict(self.relationships)
+        clone.courses = [course.fork() for course in self.courses]
+        clone.extracurriculars = list(self.extracurriculars)
+        clone.stats = dict(self.stats)
+        clone.research_projects = [project.fork() for project in self.research_projects]
+        clone.skill_levels = dict(self.skill_levels)
+        return clone
 
     def add_item(self, item: Item):
-        self.inventory.append(item)
+        self.inventory.add(item)
 
     def remove_item(self, item: Item):
-        if item in self.inventory:
-            self.inventory.remove(item)
+        self.inventory.remove(item)
 
-    def semester_up(self):
+    def semester_up(self, output=print):
         self.semester += 1
         self.max_energy += 10
         self.energy = self.max_energy
         if self.semester % 2 == 0:
             new_skill = f"{self.major} Expertise Level {self.semester // 2}"
             self.skills.append(new_skill)
-            print(f"You learned a new skill: {new_skill}!")
+            output(f"You learned a new skill: {new_skill}!")
+
+    def semester_gpa(self) -> float:
+        """Credit-weighted mean of the current course grades, cached until a course changes."""
+        key = tuple((course, course.revision) for course in self.courses)
+        cached_key, value = self._semester_gpa
+        if cached_key != key:
+            total_credits = sum(course.credits for course in self.courses)
+            weighted_grades = sum(course.calculate_final_grade() * course.credits for course in self.courses)
+            value = weighted_grades / total_credits if total_credits > 0 else 0
+            self._semester_gpa = (key, value)
+        return value
 
     def update_mental_state(self):
         if self.stress_level < 20:
@@ -241,15 +629,15 @@ class Student:
     def start_research_project(self, project: ResearchProject):
         self.research_projects.append(project)
 
-    def work_on_research(self, project_index: int, hours: int):
+    def work_on_research(self, project_index: int, hours: int, output=print, rng=random):
         if project_index < len(self.research_projects):
             project = self.research_projects[project_index]
-            progress = project.work_on_project(hours, self.skill_levels["Research"])
+            progress = project.work_on_project(hours, self.skill_levels["Research"], rng)
             self.energy -= hours * 5
             self.stress_level += hours * 2
             if project.completed:
                 self.skill_levels["Research"] += 1
-                print(f"Congratulations! You completed the research project: {project.name}")
+                output(f"Congratulations! You completed the research project: {project.name}")
             return progress
         return 0
 
@@ -281,7 +669,8 @@ class Student:
                     "completed": p.completed
                 } for p in self.research_projects
             ],
-            "skill_levels": self.skill_levels
+            "skill_levels": self.skill_levels,
+            "courses": [course.to_dict() for course in self.courses]
         }
 
     @classmethod
@@ -292,8 +681,8 @@ class Student:
         student.max_energy = data["max_energy"]
         student.gpa = data["gpa"]
         student.credits = data["credits"]
-        student.inventory = [Item(item["name"], item["type"], item["value"]) 
-                           for item in data["inventory"]]
+        student.inventory = Inventory(Item.define(item["name"], item["type"], item["value"])
+                                      for item in data["inventory"])
         student.skills = data["skills"]
         student.money = data.get("money", 500)
         student.mental_state = MentalState(data.get("mental_state", "good"))
@@ -321,228 +710,763 @@ class Student:
             "Presentation": 1,
             "Teamwork": 1
         })
+        student.courses = [Course.from_dict(c) for c in data.get("courses", [])]
         return student
 
-class UniversityLifeSimulator:
+def challenge_success_chance(energy: int, skill_count: int, gpa: float,
+                             stress_level: int, has_study_aid: bool) -> float:
+    """Threshold that academic_challenge compares a 0-100 roll against."""
+    success_chance = (
+        (energy / 2) +
+        (skill_count * 10) +
+        (gpa * 10) -
+        (stress_level / 2)
+    )
+    if has_study_aid:
+        success_chance += 20
+    return success_chance
+
+def discard_output(*args, **kwargs):
+    """Output sink for headless runs: drops everything the game would print."""
+    pass
+
+# Scenario tables for random encounters; items are shared Item definitions
+SCENARIOS = {
+    "locations": [
+        "library during finals", "crowded cafeteria", "student union", 
+        "lecture hall", "professor's office", "group study room",
+        "campus coffee shop", "dormitory", "campus gym", "computer lab",
+        "online zoom class", "campus park", "research lab",
+        "career fair venue", "student club room"
+    ],
+    "challenges": [
+        "Pop Quiz",
+        "Group Project",
+        "Final Exam",
+        "Research Paper",
+        "Presentation",
+        "Lab Assignment",
+        "Coding Challenge",
+        "Field Work",
+        "Case Study"
+    ],
+    "items": [
+        Item.define("Textbook", "study_aid", 50),
+        Item.define("Coffee", "energy_boost", 5),
+        Item.define("Study Guide", "study_aid", 30),
+        Item.define("Energy Drink", "energy_boost", 10),
+        Item.define("Calculator", "study_aid", 20)
+    ]
+}
+
+# Decision policies
+class DecisionPolicy(ABC):
+    """Answers every prompt the simulator would otherwise read from input().
+
+    Choices are 1-based like make_decision. Subclasses must implement every
+    method, so an incomplete policy fails when it is created rather than at
+    the first prompt it cannot answer.
+    """
+
+    @abstractmethod
+    def choose(self, options: List[str]) -> int:
+        ...
+
+    @abstractmethod
+    def confirm(self, prompt: str) -> bool:
+        ...
+
+    @abstractmethod
+    def ask_text(self, prompt: str) -> str:
+        ...
+
+    @abstractmethod
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        ...
+
+    @abstractmethod
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        """Return (name, major_choice, difficulty_choice), choices 1-based."""
+
+class ConsolePolicy(DecisionPolicy):
+    """The interactive player: reads every answer from stdin."""
+
+    def choose(self, options: List[str]) -> int:
+        while True:
+            try:
+                choice = int(input("Enter the number of your choice: "))
+                if 1 <= choice <= len(options):
+                    return choice
+                print(f"Please enter a number between 1 and {len(options)}")
+            except ValueError:
+                print("Please enter a valid number")
+
+    def confirm(self, prompt: str) -> bool:
+        return input(prompt).lower() == 'y'
+
+    def ask_text(self, prompt: str) -> str:
+        return input(prompt)
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        # Range checks are left to the caller, same as the original prompts
+        return kind(input(prompt))
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        name = input("Enter your name: ")
+        print("\nChoose your major:")
+        for i, major in enumerate(majors, 1):
+            print(f"{i}. {major}")
+        major_choice = int(input("Enter the number of your choice: "))
+        print("\nChoose difficulty:")
+        for i, diff in enumerate(difficulties, 1):
+            print(f"{i}. {diff}")
+        diff_choice = int(input("Enter the number of your choice: "))
+        return name, major_choice, diff_choice
+
+class RandomPolicy(DecisionPolicy):
+    """Uniformly random player for headless balance and regression runs."""
+
+    def __init__(self, seed: Optional[int] = None, name: str = "Bot"):
+        self.rng = random.Random(seed)
+        self.name = name
+
+    def choose(self, options: List[str]) -> int:
+        return self.rng.randint(1, len(options))
+
+    def confirm(self, prompt: str) -> bool:
+        return False  # Never load saves; headless runs always start fresh
+
+    def ask_text(self, prompt: str) -> str:
+        return f"Task {self.rng.randint(1, 99)}"
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        if kind is int:
+            return self.rng.randint(int(low), int(high))
+        return kind(self.rng.uniform(low, high))
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        return (self.name,
+                self.rng.randint(1, len(majors)),
+                self.rng.randint(1, len(difficulties)))
+
+# Story event dispatch
+class DataEventHandler:
+    """A milestone handler described in config data instead of code.
+
+    Spec keys: "intro" (optional text), "choices" (list of {"text",
+    "message", "effects"}) and "achievement" (optional). Effects may set
+    energy, stress_level, gpa, credits, money (added to the player),
+    skill_levels and relationships (mappings of deltas), global_awareness,
+    and key_decision ([decision, choice]).
+    """
+
+    PLAYER_FIELDS = ("energy", "stress_level", "gpa", "credits", "money")
+    EFFECT_KEYS = set(PLAYER_FIELDS) | {"skill_levels", "relationships",
+                                         "global_awareness", "key_decision"}
+
+    def __init__(self, arc: str, milestone: str, spec: Dict):
+        self.__name__ = f"data:{arc}/{milestone}"
+        self.arc = arc
+        self.milestone = milestone
+        choices = spec.get("choices")
+        if not choices or not isinstance(choices, list):
+            raise ValueError(f"Event '{milestone}' needs a list of at least one choice")
+        for choice in choices:
+            if not isinstance(choice, dict) or not isinstance(choice.get("text"), str):
+                raise ValueError(f"Every choice of event '{milestone}' must be a mapping with a 'text'")
+            effects = choice.get("effects", {})
+            if not isinstance(effects, dict):
+                raise ValueError(f"Effects in event '{milestone}' must be a mapping")
+            unknown = set(effects) - self.EFFECT_KEYS
+            if unknown:
+                raise ValueError(f"Unknown effects {sorted(unknown)} in event '{milestone}'")
+            self._check_effects(milestone, effects)
+        self.intro = spec.get("intro", f"{milestone}!")
+        self.choices = choices
+        self.achievement = spec.get("achievement")
+
+    @classmethod
+    def _check_effects(cls, milestone: str, effects: Dict):
+        def number(value):
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+        for key, value in effects.items():
+            if key in cls.PLAYER_FIELDS or key == "global_awareness":
+                valid = number(value)
+            elif key == "key_decision":
+                valid = (isinstance(value, (list, tuple)) and len(value) == 2
+                         and all(isinstance(part, str) for part in value))
+            else:
+                valid = (isinstance(value, dict)
+                         and all(isinstance(name, str) and number(delta) for name, delta in value.items()))
+            if not valid:
+                raise ValueError(f"Bad value for effect '{key}' in event '{milestone}': {value!r}")
+
+    def __call__(self, sim: 'UniversityLifeSimulator'):
+        sim.output(f"\n{self.intro}")
+        choice = self.choices[sim.make_decision([c["text"] for c in self.choices]) - 1]
+        if choice.get("message"):
+            sim.output(choice["message"])
+        effects = choice.get("effects", {})
+        player, story = sim.player, sim.story_progress
+        for field in self.PLAYER_FIELDS:
+            if field in effects:
+                setattr(player, field, getattr(player, field) + effects[field])
+        for skill, delta in effects.get("skill_levels", {}).items():
+            player.skill_levels[skill] = player.skill_levels.get(skill, 0) + delta
+        for character, delta in effects.get("relationships", {}).items():
+            story.update_relationship(character, delta)
+        if "global_awareness" in effects:
+            story.increase_global_awareness(effects["global_awareness"])
+        if "key_decision" in effects:
+            story.make_key_decision(*effects["key_decision"])
+        if self.achievement:
+            story.add_achievement(self.achievement)
+
+def build_data_events(specs: Optional[List[Dict]]) -> List[DataEventHandler]:
+    """Handlers for a config's "events" entries; raises ValueError for any bad spec."""
+    handlers = []
+    for spec in specs or []:
+        arc = STORY_ARCS.get(spec["arc"])
+        if arc is None or spec["milestone"] not in arc[1]:
+            raise ValueError(f"Event for unknown milestone ({spec['arc']!r}, {spec['milestone']!r})")
+        handlers.append(DataEventHandler(spec["arc"], spec["milestone"], spec))
+    return handlers
+
+class EventRegistry:
+    """Maps (arc, milestone) to the handler that plays it.
+
+    Built once: milestone methods on the simulator class are found by name
+    ("Club Fair" -> club_fair) and data handlers from the config's "events"
+    list are layered on top, replacing a method for the same milestone.
+    Milestones left without a handler are reported by validate() and play
+    as an uneventful pass instead of failing mid-game.
+    """
+
     def __init__(self):
+        self._handlers: Dict[tuple, object] = {}
+        self.missing: List[tuple] = []
+
+    def register(self, arc: str, milestone: str, handler):
+        """handler is called with the simulator as its only argument."""
+        self._handlers[(arc, milestone)] = handler
+
+    def get(self, arc: str, milestone: str):
+        return self._handlers.get((arc, milestone))
+
+    def handler_names(self) -> Set[str]:
+        return {handler.__name__ for handler in self._handlers.values()}
+
+    def dispatch(self, sim: 'UniversityLifeSimulator', arc: str, milestone: str):
+        handler = self._handlers.get((arc, milestone))
+        if handler is None:
+            sim.output(f"\n{milestone}: nothing eventful happens this time.")
+        else:
+            handler(sim)
+
+    def validate(self, story_arcs: Dict[str, 'StoryArc']) -> List[tuple]:
+        known = {(arc_name, milestone) for arc_name, arc in story_arcs.items()
+                 for milestone in arc.milestones}
+        for key in self._handlers:
+            if key not in known:
+                raise ValueError(f"Event handler registered for unknown milestone {key}")
+        self.missing = sorted(known - set(self._handlers))
+        return self.missing
+
+    @classmethod
+    def build(cls, simulator_cls, story_arcs: Dict[str, 'StoryArc'],
+              data_events: Sequence[DataEventHandler] = ()) -> 'EventRegistry':
+        registry = cls()
+        for arc_name, arc in story_arcs.items():
+            for milestone in arc.milestones:
+                handler = getattr(simulator_cls, milestone.lower().replace(" ", "_"), None)
+                if callable(handler):
+                    registry.register(arc_name, milestone, handler)
+        for handler in data_events:
+            registry.register(handler.arc, handler.milestone, handler)
+        registry.validate(story_arcs)
+        return registry
+
+# Used when there is no config.yaml; shared and read-only like SCENARIOS
+DEFAULT_CONFIG = {
+    "jobs": [
+        {"title": "Library Assistant", "hourly_rate": 12},
+        {"title": "Cafe Barista", "hourly_rate": 15},
+        {"title": "Teaching Assistant", "hourly_rate": 18},
+        {"title": "Research Assistant", "hourly_rate": 20},
+        {"title": "Campus Tour Guide", "hourly_rate": 14}
+    ],
+    "extracurriculars": [
+        "Student Government",
+        "Chess Club",
+        "Sports Team",
+        "Drama Club",
+        "Coding Club",
+        "Debate Team",
+        "Music Band",
+        "Environmental Club"
+    ],
+    "course_list": [
+        {"name": "Introduction to Programming", "credits": 3, "difficulty": 2},
+        {"name": "Advanced Mathematics", "credits": 4, "difficulty": 3},
+        {"name": "Business Ethics", "credits": 3, "difficulty": 2},
+        {"name": "Data Structures", "credits": 4, "difficulty": 3},
+        {"name": "World History", "credits": 3, "difficulty": 2}
+    ]
+}
+
+RESEARCH_PROJECTS = [
+    {"name": "AI in Education", "difficulty": 3, "duration": 100},
+    {"name": "Sustainable Energy Solutions", "difficulty": 4, "duration": 150},
+    {"name": "Blockchain Applications", "difficulty": 3, "duration": 120},
+    {"name": "Genetic Engineering Ethics", "difficulty": 5, "duration": 200},
+    {"name": "Urban Planning Innovations", "difficulty": 2, "duration": 80}
+]
+
+class FastForwardReport(NamedTuple):
+    weeks: int
+    money_earned: int
+    research_progress: Dict[str, float]  # Progress made per project
+    energy_change: int
+    stress_change: int
+    # (week, event, detail) for each threshold crossed: "research_complete"
+    # (project name), "burnout" and "exhausted" (energy at or below zero)
+    thresholds: List[tuple]
+
+class Catalog:
+    """Courses, clubs and jobs from the config, indexed once for menus.
+
+    Courses are looked up by name, credits or difficulty; courses and
+    clubs can be searched by case-insensitive name prefix (bisect over a
+    sorted key list). Config order is kept for menus.
+    """
+
+    def __init__(self, courses: Sequence[Dict], clubs: Sequence[str], jobs: Sequence[Dict]):
+        self.courses = tuple(courses)
+        self.clubs = tuple(clubs)
+        self.jobs = tuple(jobs)
+        self.job_titles = [job["title"] for job in self.jobs]
+        self.course_by_name = {course["name"]: course for course in self.courses}
+        self.courses_by_credits: Dict[int, List[Dict]] = {}
+        self.courses_by_difficulty: Dict[int, List[Dict]] = {}
+        for course in self.courses:
+            self.courses_by_credits.setdefault(course["credits"], []).append(course)
+            self.courses_by_difficulty.setdefault(course["difficulty"], []).append(course)
+        self._course_keys = sorted((course["name"].casefold(), i) for i, course in enumerate(self.courses))
+        self._club_keys = sorted((club.casefold(), i) for i, club in enumerate(self.clubs))
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'Catalog':
+        return cls(config.get("course_list", []), config.get("extracurriculars", []), config.get("jobs", []))
+
+    @staticmethod
+    def _search(keys: List[tuple], entries: tuple, prefix: str) -> List:
+        prefix = prefix.casefold()
+        start = bisect.bisect_left(keys, (prefix,))
+        positions = []
+        for key, position in keys[start:]:
+            if not key.startswith(prefix):
+                break
+            positions.append(position)
+        return [entries[position] for position in sorted(positions)]
+
+    def search_courses(self, prefix: str) -> List[Dict]:
+        """Courses whose name starts with prefix, in config order."""
+        return self._search(self._course_keys, self.courses, prefix)
+
+    def search_clubs(self, prefix: str) -> List[str]:
+        return self._search(self._club_keys, self.clubs, prefix)
+
+    def remaining_courses(self, enrolled: Set[str], courses: Optional[Sequence[Dict]] = None) -> List[Dict]:
+        return [course for course in (self.courses if courses is None else courses)
+                if course["name"] not in enrolled]
+
+    def remaining_clubs(self, joined: Set[str], clubs: Optional[Sequence[str]] = None) -> List[str]:
+        return [club for club in (self.clubs if clubs is None else clubs) if club not in joined]
+
+def validate_config(config, source: str = "config") -> Dict:
+    """Check the shape of a loaded config; raises ValueError naming the first problem."""
+    def fail(problem):
+        raise ValueError(f"{source}: {problem}")
+
+    def records(section, key, fields, required=True):
+        entries = section.get(key)
+        if entries is None:
+            if required:
+                fail(f"missing '{key}'")
+            return
+        if not isinstance(entries, list):
+            fail(f"'{key}' must be a list")
+        for i, entry in enumerate(entries):
+            if fields is None:
+                if not isinstance(entry, str):
+                    fail(f"{key}[{i}] must be a string")
+                continue
+            if not isinstance(entry, dict):
+                fail(f"{key}[{i}] must be a mapping")
+            for field, kind in fields.items():
+                value = entry.get(field)
+                if not isinstance(value, kind) or isinstance(value, bool):
+                    fail(f"{key}[{i}].{field} must be {kind.__name__ if isinstance(kind, type) else 'a number'}")
+
+    if not isinstance(config, dict):
+        fail("top level must be a mapping")
+    records(config, "jobs", {"title": str, "hourly_rate": (int, float)})
+    records(config, "extracurriculars", None)
+    records(config, "course_list", {"name": str, "credits": int, "difficulty": int})
+    records(config, "research_projects", {"name": str, "difficulty": int, "duration": int}, required=False)
+    records(config, "events", {"arc": str, "milestone": str}, required=False)
+    try:
+        # The whole spec, so a bad event is rejected here and not at the first story event
+        build_data_events(config.get("events"))
+    except ValueError as e:
+        fail(e)
+    except (TypeError, AttributeError, KeyError) as e:
+        # A shape the checks above did not anticipate; still a bad config, not a crash
+        fail(f"malformed event spec ({type(e).__name__}: {e})")
+    scenarios = config.get("scenarios", {})
+    if not isinstance(scenarios, dict):
+        fail("'scenarios' must be a mapping")
+    records(scenarios, "locations", None, required=False)
+    records(scenarios, "challenges", None, required=False)
+    records(scenarios, "items", {"name": str, "type": str, "value": int}, required=False)
+    return config
+
+class GameConfig:
+    """A validated config and the tables derived from it, shared by every simulator.
+
+    Obtained through load_game_config, which parses each file version once
+    per process. Nothing here may be mutated: the catalog, research
+    project templates and scenario pools are read by every game, and event
+    registries are built once per simulator class. Data event handlers are
+    built here, so a config with a bad event is rejected when it is loaded
+    even though registries are only put together at the first story event.
+    """
+
+    def __init__(self, data: Dict, path: Optional[str] = None, version=None):
+        self.data = data
+        self.path = path
+        self.version = version  # (mtime_ns, size) of the file it was parsed from
+        self.catalog = Catalog.from_config(data)
+        self.research_templates = tuple(
+            ResearchProject(p["name"], p["difficulty"], p["duration"])
+            for p in data.get("research_projects", RESEARCH_PROJECTS))
+        scenarios = data.get("scenarios", {})
+        self.scenarios = {
+            "locations": scenarios.get("locations", SCENARIOS["locations"]),
+            "challenges": scenarios.get("challenges", SCENARIOS["challenges"]),
+            "items": ([Item.define(i["name"], i["type"], i["value"]) for i in scenarios["items"]]
+                      if "items" in scenarios else SCENARIOS["items"]),
+        }
+        self.data_events = build_data_events(data.get("events"))
+        self._registries: Dict[type, EventRegistry] = {}
+        self._lock = threading.Lock()
+
+    def event_registry(self, simulator_cls, story_arcs: Dict[str, 'StoryArc']) -> EventRegistry:
+        registry = self._registries.get(simulator_cls)
+        if registry is None:
+            with self._lock:
+                registry = self._registries.get(simulator_cls)
+                if registry is None:
+                    registry = EventRegistry.build(simulator_cls, story_arcs, self.data_events)
+                    if registry.missing and simulator_cls.REPORT_MISSING_HANDLERS:
+                        get_logger().warning("Story milestones without handlers: %s",
+                                             ", ".join(milestone for _, milestone in registry.missing))
+                    self._registries[simulator_cls] = registry
+        return registry
+
+_config_cache: Dict[str, GameConfig] = {}
+_config_lock = threading.Lock()
+
+def load_game_config(path: str = "config.yaml", default: Optional[Dict] = None) -> GameConfig:
+    """The GameConfig for path, re-parsed only when the file's mtime or size changes.
+
+    A missing file gives the default config. If an edited file fails to
+    parse or validate, the error is logged and the previous version stays
+    in use, so running games are never broken by a bad edit; with no
+    previous version the error is raised.
+    """
+    default = DEFAULT_CONFIG if default is None else default
+    key = os.path.abspath(path)
+    try:
+        stat = os.stat(key)
+        version = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        version = None
+
+    def current(cached):
+        return (cached is not None and cached.version == version
+                and (version is not None or cached.data is default))
+
+    cached = _config_cache.get(key)
+    if current(cached):
+        return cached
+    with _config_lock:
+        cached = _config_cache.get(key)
+        if current(cached):
+            return cached
+        try:
+            if version is None:
+                config = GameConfig(validate_config(default, "default config"), key)
+            else:
+                import yaml
+                try:
+                    with open(key, 'r') as f:
+                        data = yaml.safe_load(f)
+                except yaml.YAMLError as e:
+                    raise ValueError(f"{path}: {e}") from e
+                config = GameConfig(validate_config(data, path), key, version)
+        except (OSError, ValueError) as e:
+            if cached is None:
+                raise
+            get_logger().error("Keeping previous config; reloading %s failed: %s", path, e)
+            return cached
+        if cached is not None:
+            get_logger().info("Reloaded config from %s", path)
+        _config_cache[key] = config
+        return config
+
+class UniversityLifeSimulator:
+    SNAPSHOT_EVERY = 20  # journal entries between full save snapshots
+    MENU_SEARCH_THRESHOLD = 25  # longer course/club menus first ask for a name prefix
+    # Log the milestones that play as an uneventful pass (the default game has
+    # several, so this is off: every game would otherwise create the log)
+    REPORT_MISSING_HANDLERS = False
+
+    def __init__(self, policy: Optional[DecisionPolicy] = None, output=print,
+                 rng: Optional[random.Random] = None, autosave: bool = False, store=None,
+                 event_log=NULL_EVENT_LOG, session_id=None, narrator=None):
+        self.policy = policy or ConsolePolicy()
+        self.output = output
+        self.autosave = autosave
+        # Optional generated text for story decisions (narrative.NarrativeGenerator)
+        self.narrator = narrator
+        self.narration_wait: Optional[float] = None  # Seconds to wait for narration; None: the narrator's own
+        self.milestone: Optional[str] = None  # Story milestone being played, if any
+        self._narrations: Dict[tuple, Optional[str]] = {}
+        # Structured per-step events (event_log.EventLog); session_id tags them
+        self.event_log = event_log
+        self.session_id = session_id
+        # Optional database backend (sqlite_store.SqliteStore) used instead of save files
+        self.store = store
+        self.journal: Optional['SaveJournal'] = None
+        self._save_writer = None
+        self._saves = None
+        # Every random draw goes through this stream so seeded runs are reproducible
+        self.rng = rng if rng is not None else random.Random()
         self.player: Student = None
-        self.scenarios = self.load_scenarios()
-        self.setup_logging()
-        self.load_config()
-        self.current_time = time(8, 0)  # Start at 8 AM
-        self.current_weather = random.choice(list(Weather))
-        self.research_projects = self.load_research_projects()
         self.story_progress = StoryProgress()
-
-    def setup_logging(self):
-        logging.basicConfig(
-            filename='university_sim.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s'
-        )
+        self.load_config()
+        self.clock = GameClock(8 * 60)  # Day 0, 8 AM
+        self.current_weather = self.rng.choice(WEATHERS)
+        self.schedule_weather_shift()
+
+    @property
+    def current_time(self) -> time:
+        return time(*divmod(self.clock.minute_of_day, 60))
+
+    @current_time.setter
+    def current_time(self, value: time):
+        self.clock.set_time_of_day(value.hour * 60 + value.minute)
+
+    @property
+    def save_writer(self):
+        # Saves are written on a background thread so slow disks never stall play;
+        # the thread is started by the first save, not by the first prompt
+        if self._save_writer is None:
+            from save_store import background_writer
+            self._save_writer = background_writer()
+        return self._save_writer
+
+    @property
+    def saves(self):
+        if self._saves is None:
+            from save_store import SaveManifest
+            self._saves = SaveManifest(writer=self.save_writer)
+        return self._saves
+
+    @property
+    def events(self) -> EventRegistry:
+        # Built on the first story event rather than before the first prompt
+        if self._events is None:
+            self._events = self.build_event_registry()
+        return self._events
+
+    CONFIG_PATH = 'config.yaml'
 
     def load_config(self):
-        try:
-            with open('config.yaml', 'r') as f:
-                self.config = yaml.safe_load(f)
-        except FileNotFoundError:
-            self.config = self.get_default_config()
+        """Take the process-wide parsed config and its derived tables."""
+        self.apply_config(load_game_config(self.CONFIG_PATH, self.get_default_config()))
 
-    def get_default_config(self):
-        return {
-            "jobs": [
-                {"title": "Library Assistant", "hourly_rate": 12},
-                {"title": "Cafe Barista", "hourly_rate": 15},
-                {"title": "Teaching Assistant", "hourly_rate": 18},
-                {"title": "Research Assistant", "hourly_rate": 20},
-                {"title": "Campus Tour Guide", "hourly_rate": 14}
-            ],
-            "extracurriculars": [
-                "Student Government",
-                "Chess Club",
-                "Sports Team",
-                "Drama Club",
-                "Coding Club",
-                "Debate Team",
-                "Music Band",
-                "Environmental Club"
-            ],
-            "course_list": [
-                {"name": "Introduction to Programming", "credits": 3, "difficulty": 2},
-                {"name": "Advanced Mathematics", "credits": 4, "difficulty": 3},
-                {"name": "Business Ethics", "credits": 3, "difficulty": 2},
-                {"name": "Data Structures", "credits": 4, "difficulty": 3},
-                {"name": "World History", "credits": 3, "difficulty": 2}
-            ]
-        }
+    def reload_config(self) -> bool:
+        """Pick up an edited config.yaml between steps; returns True if it changed."""
+        game_config = load_game_config(self.CONFIG_PATH, self.get_default_config())
+        if game_config is self.game_config:
+            return False
+        self.apply_config(game_config)
+        return True
+
+    def apply_config(self, game_config: GameConfig):
+        self.game_config = game_config
+        self.config = game_config.data
+        self.catalog = game_config.catalog
+        self.scenarios = self.load_scenarios()
+        self.research_projects = self.load_research_projects()
+        self._events = None
+
+    def narrow_menu(self, entries: List, search, noun: str) -> List:
+        """Let the player narrow a long menu by name prefix; short menus are returned as is."""
+        if len(entries) <= self.MENU_SEARCH_THRESHOLD:
+            return entries
+        prefix = self.policy.ask_text(f"{len(entries)} {noun} available. Search by name (blank lists all): ").strip()
+        if not prefix:
+            return entries
+        matches = search(prefix)
+        if not matches:
+            self.output(f"No {noun} start with '{prefix}'; listing all.")
+            return entries
+        return matches
+
+    def get_default_config(self) -> Dict:
+        return DEFAULT_CONFIG
+
+    def build_event_registry(self) -> EventRegistry:
+        """Registry for this game, built once per config version and simulator class."""
+        return self.game_config.event_registry(type(self), self.story_progress.story_arcs)
 
     def load_scenarios(self) -> Dict:
-        return {
-            "locations": [
-                "library during finals", "crowded cafeteria", "student union", 
-                "lecture hall", "professor's office", "group study room",
-                "campus coffee shop", "dormitory", "campus gym", "computer lab",
-                "online zoom class", "campus park", "research lab",
-                "career fair venue", "student club room"
-            ],
-            "challenges": [
-                "Pop Quiz",
-                "Group Project",
-                "Final Exam",
-                "Research Paper",
-                "Presentation",
-                "Lab Assignment",
-                "Coding Challenge",
-                "Field Work",
-                "Case Study"
-            ],
-            "items": [
-                Item("Textbook", "study_aid", 50),
-                Item("Coffee", "energy_boost", 5),
-                Item("Study Guide", "study_aid", 30),
-                Item("Energy Drink", "energy_boost", 10),
-                Item("Calculator", "study_aid", 20)
-            ]
-        }
+        # Read-only tables, shared by every simulator in the process
+        return self.game_config.scenarios
 
-    def load_research_projects(self) -> List[ResearchProject]:
-        return [
-            ResearchProject("AI in Education", 3, 100),
-            ResearchProject("Sustainable Energy Solutions", 4, 150),
-            ResearchProject("Blockchain Applications", 3, 120),
-            ResearchProject("Genetic Engineering Ethics", 5, 200),
-            ResearchProject("Urban Planning Innovations", 2, 80)
-        ]
+    def load_research_projects(self) -> Sequence[ResearchProject]:
+        # Templates only: each player works on their own instance
+        return self.game_config.research_templates
 
     def create_character(self):
-        print("\nCreate your character:")
-        name = input("Enter your name: ")
-        print("\nChoose your major:")
+        self.output("\nCreate your character:")
         majors = ["Computer Science", "Business", "Engineering", "Arts", "Medicine"]
-        for i, major in enumerate(majors, 1):
-            print(f"{i}. {major}")
-        major_choice = int(input("Enter the number of your choice: ")) - 1
-        major = majors[major_choice]
-        
-        print("\nChoose difficulty:")
         difficulties = [d.value for d in Difficulty]
-        for i, diff in enumerate(difficulties, 1):
-            print(f"{i}. {diff}")
-        diff_choice = int(input("Enter the number of your choice: ")) - 1
-        difficulty = Difficulty(difficulties[diff_choice])
+        name, major_choice, diff_choice = self.policy.create_character(majors, difficulties)
+        major = majors[major_choice - 1]
+        difficulty = Difficulty(difficulties[diff_choice - 1])
         
         self.player = Student(name, major, difficulty)
 
     def generate_scenario(self) -> str:
-        location = random.choice(self.scenarios["locations"])
+        location = self.rng.choice(self.scenarios["locations"])
         return f"You are at the {location}..."
 
     def make_decision(self, options: List[str]) -> int:
-        print("\nAvailable actions:")
+        self.output("\nAvailable actions:")
         for i, option in enumerate(options, 1):
-            print(f"{i}. {option}")
-        while True:
-            try:
-                choice = int(input("Enter the number of your choice: "))
-                if 1 <= choice <= len(options):
-                    return choice
-                print(f"Please enter a number between 1 and {len(options)}")
-            except ValueError:
-                print("Please enter a valid number")
+            self.output(f"{i}. {option}")
+        if self.narrator is None or self.milestone is None:
+            return self.policy.choose(options)
+        signature = self.narrator.signature(self)
+        # Every option starts generating while the player reads them
+        self.narrator.prefetch(self.milestone, options, signature)
+        choice = self.policy.choose(options)
+        key = (self.milestone, choice, signature)
+        if key not in self._narrations:
+            # Remembered so that a step re-run by session_server prints the same lines;
+            # game_steps forgets them when the next step starts
+            self._narrations[key] = self.narrator.narrate(self.milestone, choice, options[choice - 1],
+                                                          signature, self.narration_wait)
+        if self._narrations[key]:
+            self.output(self._narrations[key])
+        return choice
 
     def academic_challenge(self, challenge: str, difficulty: int) -> bool:
-        print(f"\nChallenge: {challenge}")
-        print(f"Difficulty: {difficulty}")
+        self.output(f"\nChallenge: {challenge}")
+        self.output(f"Difficulty: {difficulty}")
         
-        success_chance = (
-            (self.player.energy / 2) +
-            (len(self.player.skills) * 10) +
-            (self.player.gpa * 10) -
-            (self.player.stress_level / 2)
+        success_chance = challenge_success_chance(
+            self.player.energy,
+            len(self.player.skills),
+            self.player.gpa,
+            self.player.stress_level,
+            self.player.inventory.has_type("study_aid")
         )
         
-        if any(item.type == "study_aid" for item in self.player.inventory):
-            success_chance += 20
-        
-        success = random.randint(0, 100) < success_chance
+        success = self.rng.randint(0, 100) < success_chance
         
         self.player.energy -= 20
         self.player.stress_level += 15
         
         if success:
-            print("Success! Your hard work paid off!")
+            self.output("Success! Your hard work paid off!")
             self.player.gpa = min(4.0, self.player.gpa + 0.1)
-            self.player.credits += random.randint(1, 3)
+            self.player.credits += self.rng.randint(1, 3)
         else:
-            print("Unfortunately, you didn't succeed this time.")
+            self.output("Unfortunately, you didn't succeed this time.")
             self.player.gpa = max(0.0, self.player.gpa - 0.1)
         
         return success
 
     def handle_item_usage(self):
         if not self.player.inventory:
-            print("You don't have any items!")
+            self.output("You don't have any items!")
             return
             
-        print("\nYour items:")
-        items = self.player.inventory
-        for i, item in enumerate(items, 1):
-            print(f"{i}. {item.name} ({item.type})")
+        self.output("\nYour items:")
+        stacks = self.player.inventory.stacks()
+        for i, (item, count) in enumerate(stacks, 1):
+            self.output(f"{i}. {item.name} ({item.type})" + (f" x{count}" if count > 1 else ""))
             
-        choice = self.make_decision([item.name for item in items])
-        used_item = items[choice - 1]
+        choice = self.make_decision([item.name for item, _ in stacks])
+        used_item = stacks[choice - 1][0]
         
         if used_item.type == "energy_boost":
             self.player.energy = min(self.player.max_energy, 
                                    self.player.energy + used_item.value)
-            print(f"Used {used_item.name}! Energy restored by {used_item.value}")
+            self.output(f"Used {used_item.name}! Energy restored by {used_item.value}")
         elif used_item.type == "study_aid":
             self.player.stress_level = max(0, self.player.stress_level - used_item.value)
-            print(f"Used {used_item.name}! Stress reduced by {used_item.value}")
+            self.output(f"Used {used_item.name}! Stress reduced by {used_item.value}")
             
         self.player.remove_item(used_item)
 
     def handle_study_session(self):
-        study_outcome = random.choice([
+        study_outcome = self.rng.choice([
             "skill improvement",
             "energy drain",
             "item discovery",
             "GPA boost"
         ])
         
-        print("\nStudying...")
+        self.output("\nStudying...")
         if study_outcome == "skill improvement":
             self.player.energy -= 10
-            print("Your dedicated study session pays off!")
-            if random.random() < 0.3 and self.player.semester > 1:
+            self.output("Your dedicated study session pays off!")
+            if self.rng.random() < 0.3 and self.player.semester > 1:
                 new_skill = f"{self.player.major} Study Technique {len(self.player.skills) + 1}"
                 self.player.skills.append(new_skill)
-                print(f"You learned: {new_skill}!")
+                self.output(f"You learned: {new_skill}!")
                 
         elif study_outcome == "energy drain":
-            energy_loss = random.randint(5, 15)
+            energy_loss = self.rng.randint(5, 15)
             self.player.energy = max(0, self.player.energy - energy_loss)
-            print(f"Intense studying drains {energy_loss} energy!")
+            self.output(f"Intense studying drains {energy_loss} energy!")
             
         elif study_outcome == "item discovery":
-            found_item = random.choice(self.scenarios["items"])
+            found_item = self.rng.choice(self.scenarios["items"])
             self.player.add_item(found_item)
-            print(f"While studying, you found a {found_item.name}!")
+            self.output(f"While studying, you found a {found_item.name}!")
             
         elif study_outcome == "GPA boost":
-            gpa_increase = random.uniform(0.05, 0.15)
+            gpa_increase = self.rng.uniform(0.05, 0.15)
             self.player.gpa = min(4.0, self.player.gpa + gpa_increase)
-            print(f"Your studying improved your GPA by {gpa_increase:.2f}!")
+            self.output(f"Your studying improved your GPA by {gpa_increase:.2f}!")
 
     def handle_rest(self):
-        energy_recovery = random.randint(20, 40)
-        stress_relief = random.randint(10, 25)
+        energy_recovery = self.rng.randint(20, 40)
+        stress_relief = self.rng.randint(10, 25)
         
         self.player.energy = min(self.player.max_energy, self.player.energy + energy_recovery)
         self.player.stress_level = max(0, self.player.stress_level - stress_relief)
         
-        print(f"You took some rest and recovered {energy_recovery} energy!")
-        print(f"Your stress level decreased by {stress_relief} points.")
+        self.output(f"You took some rest and recovered {energy_recovery} energy!")
+        self.output(f"Your stress level decreased by {stress_relief} points.")
 
     def apply_weather_effects(self):
         weather_message = f"Current weather: {self.current_weather.value}"
@@ -554,7 +1478,7 @@ class UniversityLifeSimulator:
             self.player.energy -= 10
             self.player.stress_level += 5
             weather_message += " (Energy -10, Stress +5)"
-        print(weather_message)
+        self.output(weather_message)
 
     def handle_social_interaction(self):
         available_interactions = [
@@ -565,151 +1489,244 @@ class UniversityLifeSimulator:
             "Sports Activity"
         ]
         
-        print("\nChoose a social activity:")
+        self.output("\nChoose a social activity:")
         choice = self.make_decision(available_interactions)
         interaction = available_interactions[choice - 1]
         
-        energy_cost = random.randint(5, 15)
-        stress_relief = random.randint(5, 20)
+        energy_cost = self.rng.randint(5, 15)
+        stress_relief = self.rng.randint(5, 20)
         
         self.player.energy -= energy_cost
         self.player.stress_level = max(0, self.player.stress_level - stress_relief)
         self.player.stats["social_events"] += 1
         
-        print(f"\nYou participated in: {interaction}")
-        print(f"Energy cost: {energy_cost}")
-        print(f"Stress relieved: {stress_relief}")
+        self.output(f"\nYou participated in: {interaction}")
+        self.output(f"Energy cost: {energy_cost}")
+        self.output(f"Stress relieved: {stress_relief}")
 
-        if random.random() < 0.3:
+        if self.rng.random() < 0.3:
             new_friend = f"Friend_{len(self.player.relationships) + 1}"
             self.player.relationships[new_friend] = 50
-            print(f"You made a new friend: {new_friend}!")
+            self.output(f"You made a new friend: {new_friend}!")
 
     def manage_time(self, hours: int):
-        current_datetime = datetime.combine(datetime.today(), self.current_time)
-        new_datetime = current_datetime.replace(hour=(current_datetime.hour + hours) % 24)
-        self.current_time = new_datetime.time()
-        
-        if random.random() < 0.2:
-            self.current_weather = random.choice(list(Weather))
-            print(f"Weather changed to {self.current_weather.value}!")
+        """Let hours of game time pass, firing whatever clock events come due.
+
+        Weather shifts are the only timed events so far. Assignments,
+        jobs and research have no due times in the game rules (jobs and
+        research are worked in sessions the player picks), so there is
+        nothing of theirs to schedule yet. A new timed rule is a name
+        passed to clock.schedule plus an on_<name> method.
+        """
+        for name, args in self.clock.advance(hours * 60):
+            self.run_clock_handler(name, args)
+
+    def run_clock_handler(self, name: str, args: tuple):
+        # "weather_shift" -> on_weather_shift(*args). Not named *_event, which
+        # story_explorer takes to be a story event handler
+        getattr(self, f"on_{name}")(*args)
+
+    WEATHER_SHIFT_MINUTES = (12 * 60, 36 * 60)  # Range of the gap between weather changes
+
+    def schedule_weather_shift(self):
+        self.clock.schedule_in(self.rng.randint(*self.WEATHER_SHIFT_MINUTES), "weather_shift")
+
+    def on_weather_shift(self):
+        self.current_weather = self.rng.choice(WEATHERS)
+        self.output(f"Weather changed to {self.current_weather.value}!")
+        self.schedule_weather_shift()
+
+    BURNOUT_STRESS = 80  # Stress at which update_mental_state reports burnout
+
+    def fast_forward(self, weeks: int, schedule: Dict[str, int]) -> FastForwardReport:
+        """Play weeks of a fixed weekly routine in one aggregated step.
+
+        schedule maps "job" and/or the name of one of the player's research
+        projects to hours per week, 1 to 8 like an interactive work session;
+        "job" needs the player to have one. Each week counts as one work
+        session per activity, as if handle_job_activities /
+        handle_research_activities were answered with those hours, so
+        money, energy, stress and research progress follow the same
+        distribution as playing the weeks out; with at most one research
+        project the draws are independent of order, which is what makes
+        the closed form exact. The game clock
+        moves on by the same number of weeks, firing its events.
+        """
+        if weeks < 0:
+            raise ValueError("weeks must not be negative")
+        player = self.player
+        projects = {project.name: project for project in player.research_projects}
+        unknown = set(schedule) - ({"job"} if player.job else set()) - set(projects)
+        if unknown:
+            raise ValueError(f"Nothing to schedule for: {', '.join(sorted(unknown))}")
+        invalid = sorted(name for name, hours in schedule.items() if not 1 <= hours <= 8)
+        if invalid:
+            raise ValueError(f"Hours must be between 1 and 8 for: {', '.join(invalid)}")
+        researched = [name for name in schedule if name != "job"]
+        if len(researched) > 1:
+            raise ValueError("fast_forward works one research project at a time")
+        job_hours = schedule.get("job", 0)
+        hours = job_hours + sum(schedule[name] for name in researched)
+        thresholds = []
+
+        earned = weeks * job_hours * player.job["hourly_rate"] if job_hours else 0
+        player.money += earned
+        player.stats["money_earned"] += earned
+
+        progress = {}
+        for name in researched:
+            project = projects[name]
+            made, completed_at, skill_gain = project.work_sessions(
+                weeks, schedule[name], player.skill_levels["Research"], self.rng)
+            player.skill_levels["Research"] += skill_gain
+            progress[name] = made
+            if completed_at is not None:
+                thresholds.append((completed_at, "research_complete", name))
+                self.output(f"Congratulations! You completed the research project: {name}")
+
+        # Work costs 5 energy and 2 stress an hour, whichever the activity
+        energy_change, stress_change = -5 * hours * weeks, 2 * hours * weeks
+        if hours and weeks:
+            if player.stress_level < self.BURNOUT_STRESS <= player.stress_level + stress_change:
+                week = -((player.stress_level - self.BURNOUT_STRESS) // (2 * hours))
+                thresholds.append((week, "burnout", player.stress_level + 2 * hours * week))
+            if player.energy > 0 >= player.energy + energy_change:
+                week = -(-player.energy // (5 * hours))
+                thresholds.append((week, "exhausted", player.energy - 5 * hours * week))
+        player.energy += energy_change
+        player.stress_level += stress_change
+        player.update_mental_state()
+        self.manage_time(weeks * 7 * 24)
+        thresholds.sort(key=lambda threshold: threshold[0])
+        return FastForwardReport(weeks, earned, progress, energy_change, stress_change, thresholds)
 
     def handle_job_activities(self):
         if not self.player.job:
-            print("\nAvailable Jobs:")
-            job_choice = self.make_decision([job["title"] for job in self.config["jobs"]])
-            self.player.job = self.config["jobs"][job_choice - 1]
-            print(f"Congratulations! You got a job as {self.player.job['title']}!")
+            self.output("\nAvailable Jobs:")
+            job_choice = self.make_decision(self.catalog.job_titles)
+            self.player.job = self.catalog.jobs[job_choice - 1]
+            self.output(f"Congratulations! You got a job as {self.player.job['title']}!")
         else:
             try:
-                hours = int(input("How many hours do you want to work? (1-8): "))
+                hours = self.policy.ask_number("How many hours do you want to work? (1-8): ", 1, 8)
                 hours = min(8, max(1, hours))
                 earned = self.player.work_part_time(hours)
                 self.manage_time(hours)
-                print(f"You earned ${earned} from work!")
-                print(f"Current balance: ${self.player.money}")
+                self.output(f"You earned ${earned} from work!")
+                self.output(f"Current balance: ${self.player.money}")
             except ValueError:
-                print("Please enter a valid number of hours.")
+                self.output("Please enter a valid number of hours.")
 
     def handle_extracurricular(self):
         if len(self.player.extracurriculars) >= 3:
-            print("You're already involved in the maximum number of extracurriculars!")
+            self.output("You're already involved in the maximum number of extracurriculars!")
             return
 
-        available = [x for x in self.config["extracurriculars"] 
-                    if x not in self.player.extracurriculars]
+        joined = set(self.player.extracurriculars)
+        available = self.catalog.remaining_clubs(joined)
         if not available:
-            print("No more extracurriculars available!")
+            self.output("No more extracurriculars available!")
             return
+        available = self.narrow_menu(
+            available, lambda prefix: self.catalog.remaining_clubs(joined, self.catalog.search_clubs(prefix)),
+            "activities")
 
-        print("\nAvailable Extracurricular Activities:")
+        self.output("\nAvailable Extracurricular Activities:")
         choice = self.make_decision(available)
         activity = available[choice - 1]
         self.player.extracurriculars.append(activity)
         self.player.stress_level += 5
         self.player.energy -= 10
-        print(f"You joined {activity}!")
+        self.output(f"You joined {activity}!")
 
     def manage_courses(self):
         if not self.player.courses:
-            print("\nSelect courses for this semester:")
-            available_courses = self.config["course_list"]
+            self.output("\nSelect courses for this semester:")
+            enrolled: Set[str] = set()
             while len(self.player.courses) < 4:
-                print("\nAvailable courses:")
-                remaining_courses = [c for c in available_courses 
-                                  if c["name"] not in [course.name for course in self.player.courses]]
+                remaining_courses = self.catalog.remaining_courses(enrolled)
+                if not remaining_courses:
+                    break
+                remaining_courses = self.narrow_menu(
+                    remaining_courses,
+                    lambda prefix: self.catalog.remaining_courses(enrolled, self.catalog.search_courses(prefix)),
+                    "courses")
+                self.output("\nAvailable courses:")
                 for i, course in enumerate(remaining_courses, 1):
-                    print(f"{i}. {course['name']} (Credits: {course['credits']})")
+                    self.output(f"{i}. {course['name']} (Credits: {course['credits']})")
                 
                 choice = self.make_decision([c["name"] for c in remaining_courses])
                 selected = remaining_courses[choice - 1]
                 new_course = Course(selected["name"], selected["credits"], selected["difficulty"])
                 self.player.courses.append(new_course)
-                print(f"Enrolled in {new_course.name}")
+                enrolled.add(new_course.name)
+                self.output(f"Enrolled in {new_course.name}")
         else:
-            print("\nCurrent courses:")
+            self.output("\nCurrent courses:")
             for i, course in enumerate(self.player.courses, 1):
-                print(f"{i}. {course.name} (Current Grade: {course.calculate_final_grade():.1f})")
+                self.output(f"{i}. {course.name} (Current Grade: {course.calculate_final_grade():.1f})")
             
             course_choice = self.make_decision([c.name for c in self.player.courses])
             chosen_course = self.player.courses[course_choice - 1]
             
-            print(f"\nManaging {chosen_course.name}")
+            self.output(f"\nManaging {chosen_course.name}")
             options = ["Add Assignment", "Grade Assignment", "Take Midterm", "Take Final", "Back"]
             action = self.make_decision(options)
             
             if action == 1:  # Add Assignment
-                name = input("Enter assignment name: ")
-                weight = float(input("Enter assignment weight (0-1): "))
+                name = self.policy.ask_text("Enter assignment name: ")
+                weight = self.policy.ask_number("Enter assignment weight (0-1): ", 0, 1, float)
                 chosen_course.add_assignment(name, weight)
-                print(f"Assignment '{name}' added to {chosen_course.name}")
+                self.output(f"Assignment '{name}' added to {chosen_course.name}")
             elif action == 2:  # Grade Assignment
                 if not chosen_course.assignments:
-                    print("No assignments to grade.")
+                    self.output("No assignments to grade.")
                 else:
                     for i, assignment in enumerate(chosen_course.assignments, 1):
-                        print(f"{i}. {assignment['name']} (Current Grade: {assignment['grade']})")
-                    assignment_choice = int(input("Choose an assignment to grade: ")) - 1
-                    grade = float(input("Enter the grade (0-100): "))
+                        self.output(f"{i}. {assignment.name} (Current Grade: {assignment.grade})")
+                    assignment_choice = self.policy.ask_number("Choose an assignment to grade: ", 1, len(chosen_course.assignments)) - 1
+                    grade = self.policy.ask_number("Enter the grade (0-100): ", 0, 100, float)
                     chosen_course.grade_assignment(assignment_choice, grade)
-                    print(f"Assignment graded. New course grade: {chosen_course.calculate_final_grade():.1f}")
+                    self.output(f"Assignment graded. New course grade: {chosen_course.calculate_final_grade():.1f}")
             elif action == 3:  # Take Midterm
                 grade = self.academic_challenge(f"{chosen_course.name} Midterm", chosen_course.difficulty * 10)
                 chosen_course.midterm_grade = grade
-                print(f"Midterm grade: {grade:.1f}")
+                self.output(f"Midterm grade: {grade:.1f}")
             elif action == 4:  # Take Final
                 grade = self.academic_challenge(f"{chosen_course.name} Final", chosen_course.difficulty * 15)
                 chosen_course.final_grade = grade
-                print(f"Final grade: {grade:.1f}")
+                self.output(f"Final grade: {grade:.1f}")
             
-            print(f"Updated course grade: {chosen_course.calculate_final_grade():.1f}")
+            self.output(f"Updated course grade: {chosen_course.calculate_final_grade():.1f}")
 
     def handle_research_activities(self):
         if not self.player.research_projects:
-            print("\nAvailable Research Projects:")
+            self.output("\nAvailable Research Projects:")
             project_choice = self.make_decision([p.name for p in self.research_projects])
-            chosen_project = self.research_projects[project_choice - 1]
+            template = self.research_projects[project_choice - 1]
+            chosen_project = ResearchProject(template.name, template.difficulty, template.duration)
             self.player.start_research_project(chosen_project)
-            print(f"You've started the research project: {chosen_project.name}")
+            self.output(f"You've started the research project: {chosen_project.name}")
         else:
-            print("\nYour ongoing research projects:")
+            self.output("\nYour ongoing research projects:")
             for i, project in enumerate(self.player.research_projects, 1):
-                print(f"{i}. {project.name} - Progress: {project.progress}%")
+                self.output(f"{i}. {project.name} - Progress: {project.progress}%")
             
             project_choice = self.make_decision([p.name for p in self.player.research_projects])
             chosen_project = self.player.research_projects[project_choice - 1]
             
-            hours = int(input("How many hours do you want to work on this project? (1-8): "))
+            hours = self.policy.ask_number("How many hours do you want to work on this project? (1-8): ", 1, 8)
             hours = min(8, max(1, hours))
-            progress = self.player.work_on_research(project_choice - 1, hours)
+            progress = self.player.work_on_research(project_choice - 1, hours, self.output, self.rng)
             self.manage_time(hours)
-            print(f"You made {progress:.2f}% progress on {chosen_project.name}")
+            self.output(f"You made {progress:.2f}% progress on {chosen_project.name}")
 
-    def save_game(self):
-        save_data = {
+    def build_save_data(self) -> Dict:
+        return {
             "player": self.player.to_dict(),
-            "current_time": self.current_time.strftime("%H:%M"),
+            "current_time": self.clock.time_of_day(),
             "current_weather": self.current_weather.value,
+            "clock": self.clock.to_dict(),
             "story_progress": {
                 "semester": self.story_progress.semester,
                 "major_plot": self.story_progress.major_plot.value if self.story_progress.major_plot else None,
@@ -717,171 +1734,265 @@ class UniversityLifeSimulator:
                 "relationships": self.story_progress.relationships,
                 "key_decisions": self.story_progress.key_decisions,
                 "global_awareness": self.story_progress.global_awareness,
-                "achievements": list(self.story_progress.achievements)
+                "achievements": sorted(self.story_progress.achievements)
             }
         }
+
+    def apply_save_data(self, save_data: Dict):
+        self.player = Student.from_dict(save_data["player"])
+        self.current_weather = Weather(save_data["current_weather"])
+        if "clock" in save_data:
+            self.clock = GameClock.from_dict(save_data["clock"])
+        else:
+            # Saves from before the game clock only have the time of day
+            self.clock = GameClock(parse_time_of_day(save_data["current_time"]))
+            self.schedule_weather_shift()
         
+        story_progress = save_data["story_progress"]
+        self.story_progress.semester = story_progress["semester"]
+        self.story_progress.major_plot = MajorPlot(story_progress["major_plot"]) if story_progress["major_plot"] else None
+        for name, milestone in story_progress["story_arcs"].items():
+            self.story_progress.story_arcs[name].current_milestone = milestone
+        self.story_progress.relationships = story_progress["relationships"]
+        self.story_progress.key_decisions = story_progress["key_decisions"]
+        self.story_progress.global_awareness = story_progress["global_awareness"]
+        self.story_progress.achievements = set(story_progress["achievements"])
+
+    def save_journal(self, filename: str) -> 'SaveJournal':
+        if self.journal is None or self.journal.snapshot_path != filename:
+            from save_store import SaveJournal
+            self.journal = SaveJournal(filename, self.SNAPSHOT_EVERY, self.save_writer)
+        return self.journal
+
+    def save_game(self, reason: Optional[str] = None, announce: bool = True):
         filename = f"save_{self.player.name.lower()}.json"
         try:
-            with open(filename, 'w') as f:
-                json.dump(save_data, f)
-            print(f"Game saved successfully as {filename}")
+            if self.store is not None:
+                player_id = self.store.save(self)
+                if announce:
+                    self.output(f"Game saved successfully for {player_id}")
+                return
+            save_data = self.build_save_data()
+            journal = self.save_journal(filename)
+            if journal.save(save_data, reason) != "unchanged":
+                self.saves.record(filename, save_data, journal.offset)
+            if announce:
+                self.output(f"Game saved successfully as {filename}")
         except Exception as e:
-            print(f"Error saving game: {e}")
+            self.output(f"Error saving game: {e}")
 
     def load_game(self):
-        save_files = [f for f in os.listdir() if f.startswith("save_") and f.endswith(".json")]
-        if not save_files:
-            print("No save files found.")
+        slots = self.saves.slots() if self.store is None else self.store.slots()
+        if not slots:
+            self.output("No save files found.")
             return False
         
-        print("Available save files:")
-        for i, file in enumerate(save_files, 1):
-            print(f"{i}. {file}")
+        self.output("Available save files:")
+        for i, info in enumerate(slots, 1):
+            self.output(f"{i}. {info.describe()}")
         
-        choice = self.make_decision(save_files)
-        filename = save_files[choice - 1]
+        choice = self.make_decision([info.slot for info in slots])
+        info = slots[choice - 1]
+        filename = info.slot
         
         try:
-            with open(filename, 'r') as f:
-                save_data = json.load(f)
-            
-            self.player = Student.from_dict(save_data["player"])
-            self.current_time = datetime.strptime(save_data["current_time"], "%H:%M").time()
-            self.current_weather = Weather(save_data["current_weather"])
-            
-            story_progress = save_data["story_progress"]
-            self.story_progress.semester = story_progress["semester"]
-            self.story_progress.major_plot = MajorPlot(story_progress["major_plot"]) if story_progress["major_plot"] else None
-            for name, milestone in story_progress["story_arcs"].items():
-                self.story_progress.story_arcs[name].current_milestone = milestone
-            self.story_progress.relationships = story_progress["relationships"]
-            self.story_progress.key_decisions = story_progress["key_decisions"]
-            self.story_progress.global_awareness = story_progress["global_awareness"]
-            self.story_progress.achievements = set(story_progress["achievements"])
-            
-            print(f"Game loaded successfully from {filename}")
+            if self.store is not None:
+                self.store.restore(self, info.slot)
+            else:
+                self.apply_save_data(self.save_journal(filename).load(info.offset))
+            self.output(f"Game loaded successfully from {filename}")
             return True
         except Exception as e:
-            print(f"Error loading game: {e}")
+            self.output(f"Error loading game: {e}")
             return False
 
     def run_game(self):
-        print("Welcome to University Life Simulator!")
-        
-        load_game = input("Do you want to load a saved game? (y/n): ").lower()
-        if load_game == 'y':
-            if not self.load_game():
-                self.create_character()
-                self.choose_major_plot()
+        steps = self.game_steps()
+        result = None
+        while True:
+            try:
+                _, step = steps.send(result)
+            except StopIteration:
+                return
+            result = step()
+
+    def game_steps(self, resume_at: Optional[str] = None, offer_load: bool = True):
+        """The game as a sequence of (label, step) pairs; each step is a zero-argument callable.
+
+        Every player decision happens inside a step, and the result of each
+        step is sent back into the generator. run_game just runs them in
+        order; session_server re-runs a step from capture_state() when it
+        has to wait for the player in the middle of it. resume_at starts
+        from the step with that label, taking everything else from the
+        current state. Without offer_load a new game goes straight to
+        character creation, never touching the save files.
+        """
+        semester_steps = ([("start_semester", self.start_semester)] +
+                          [(f"event_round_{i}", self.run_event_round) for i in range(1, 4)] +  # 3 major events per semester
+                          [("end_semester", self.end_semester)])
+        labels = [label for label, _ in semester_steps]
+
+        if resume_at is None:
+            self.output("Welcome to University Life Simulator!")
+            resume_at = "offer_load_game" if offer_load else "create_character"
+
+        def logged(label, step):
+            # A new step starts: narration kept for re-runs of the last one is done with
+            self._narrations.clear()
+            return self.logged_step(label, step)
+
+        if resume_at == "offer_load_game":
+            loaded = yield resume_at, logged(resume_at, self.offer_load_game)
+            resume_at = "start_semester" if loaded else "create_character"
+        if resume_at == "create_character":
+            yield resume_at, logged(resume_at, self.create_character)
+            resume_at = "choose_major_plot"
+        if resume_at == "choose_major_plot":
+            yield resume_at, logged(resume_at, self.choose_major_plot)
+            resume_at = "start_semester"
+
+        if resume_at in labels:
+            first = labels.index(resume_at)
+            while self.story_progress.semester <= 8:  # 4 years, 2 semesters per year
+                for label, step in semester_steps[first:]:
+                    if label == "start_semester":
+                        # Between steps: a step re-run from capture_state() must see the same config
+                        self.reload_config()
+                    yield label, logged(label, step)
+                first = 0
+
+        yield "graduation_ceremony", logged("graduation_ceremony", self.graduation_ceremony)
+
+    # Player state reported in step events, as changes over the step
+    EVENT_FIELDS = ("energy", "stress_level", "gpa", "credits", "money", "semester")
+
+    def event_state(self) -> Optional[Dict]:
+        if self.player is None:
+            return None
+        state = {name: getattr(self.player, name) for name in self.EVENT_FIELDS}
+        state["mental_state"] = self.player.mental_state.value
+        return state
+
+    def logged_step(self, label: str, step):
+        """step, wrapped to emit a "step" event when it completes; step itself if logging is off.
+
+        The event is emitted only once the step returns, so a step that is
+        re-run (session_server does this while waiting for input) is
+        logged once.
+        """
+        if not self.event_log.enabled:
+            return step
+
+        def run():
+            before = self.event_state()
+            result = step()
+            after = self.event_state()
+            if after is None:
+                delta = {}
+            elif before is None:
+                delta = after
+            else:
+                delta = {name: (value - before[name] if isinstance(value, (int, float)) else value)
+                         for name, value in after.items() if value != before[name]}
+            self.event_log.emit("step", self.session_id, label=label,
+                                semester=self.story_progress.semester, delta=delta)
+            return result
+        return run
+
+    def fork(self, policy: Optional[DecisionPolicy] = None, output=discard_output) -> 'UniversityLifeSimulator':
+        """A child game to play ahead in (e.g. each option of a decision) without touching this one.
+
+        The child gets its own player, story, clock, weather and a copy of
+        the rng, so it replays exactly what this game would do given the
+        same answers. Config, catalog and event tables are shared. It never
+        autosaves, logs events or narrates, and answers through policy
+        (default: the parent's) with output discarded unless given.
+        """
+        child = object.__new__(type(self))
+        child.__dict__.update(self.__dict__)
+        child.policy = policy or self.policy
+        child.output = output
+        child.autosave = False
+        child.store = None
+        child.journal = None
+        child.event_log = NULL_EVENT_LOG
+        child.narrator = None
+        child._narrations = {}
+        child._saves = None
+        child._save_writer = None
+        child.player = self.player.fork() if self.player is not None else None
+        child.story_progress = self.story_progress.fork()
+        child.clock = self.clock.copy()
+        if type(self.rng) is random.Random:
+            # Half the cost of copy.copy, which goes through __reduce__
+            child.rng = random.Random.__new__(random.Random)
+            child.rng.setstate(self.rng.getstate())
         else:
-            self.create_character()
-            self.choose_major_plot()
+            import copy
+            child.rng = copy.copy(self.rng)
+        return child
+
+    def offer_load_game(self) -> bool:
+        return self.policy.confirm("Do you want to load a saved game? (y/n): ") and self.load_game()
+
+    # Everything a step can change, for capture_state/restore_state
+    STATE_ATTRIBUTES = ("player", "story_progress", "clock", "current_weather")
 
-        while self.story_progress.semester <= 8:  # 4 years, 2 semesters per year
-            self.start_semester()
-            self.run_semester_events()
-            self.end_semester()
+    def capture_state(self) -> Dict:
+        import pickle
+        # Pickled rather than deep-copied: several times faster, and compact while held
+        return {
+            "attributes": pickle.dumps({name: getattr(self, name) for name in self.STATE_ATTRIBUTES},
+                                       pickle.HIGHEST_PROTOCOL),
+            "rng": self.rng.getstate(),
+        }
 
-        self.graduation_ceremony()
+    def restore_state(self, state: Dict):
+        """Rewind to a capture_state() result; the same state can be restored repeatedly."""
+        import pickle
+        for name, value in pickle.loads(state["attributes"]).items():
+            setattr(self, name, value)
+        self.rng.setstate(state["rng"])
 
     def choose_major_plot(self):
-        print("\nAs you begin your university journey, you feel drawn to a particular path:")
+        self.output("\nAs you begin your university journey, you feel drawn to a particular path:")
         options = [plot.value for plot in MajorPlot]
         choice = self.make_decision(options)
         self.story_progress.set_major_plot(MajorPlot(options[choice - 1]))
-        print(f"You've chosen to focus on {self.story_progress.major_plot.value}!")
+        self.output(f"You've chosen to focus on {self.story_progress.major_plot.value}!")
 
     def start_semester(self):
-        print(f"\n--- Semester {self.story_progress.semester} Begins ---")
+        self.output(f"\n--- Semester {self.story_progress.semester} Begins ---")
         self.player.energy = self.player.max_energy
         self.player.stress_level = 0
         self.manage_courses()
 
-    def run_semester_events(self):
-        for _ in range(3):  # 3 major events per semester
-            self.trigger_story_event()
-            self.player.update_mental_state()
-            if self.player.mental_state == MentalState.BURNOUT:
-                print("You're experiencing burnout! Taking a mental health day...")
-                self.handle_rest()
+    def run_event_round(self):
+        self.trigger_story_event()
+        if self.autosave:
+            self.save_game(reason=f"semester {self.story_progress.semester} event", announce=False)
+        self.player.update_mental_state()
+        if self.player.mental_state == MentalState.BURNOUT:
+            self.output("You're experiencing burnout! Taking a mental health day...")
+            self.handle_rest()
 
     def end_semester(self):
-        print(f"\n--- Semester {self.story_progress.semester} Ends ---")
+        self.output(f"\n--- Semester {self.story_progress.semester} Ends ---")
         self.calculate_semester_gpa()
         self.story_progress.advance_semester()
-        self.player.semester_up()
+        self.player.semester_up(self.output)
 
     def trigger_story_event(self):
         for arc_name, arc in self.story_progress.story_arcs.items():
-            if arc_name == "personal_growth":
-                self.personal_growth_event(arc.get_current_milestone())
-            elif arc_name == "academic_journey":
-                self.academic_journey_event(arc.get_current_milestone())
-            elif arc_name == "social_life":
-                self.social_life_event(arc.get_current_milestone())
-            elif arc_name == "career_development":
-                self.career_development_event(arc.get_current_milestone())
-
-    def personal_growth_event(self, milestone: str):
-        if milestone == "Freshman Orientation":
-            self.freshman_orientation()
-        elif milestone == "Identity Crisis":
-            self.identity_crisis()
-        elif milestone == "Finding Your Passion":
-            self.finding_your_passion()
-        elif milestone == "Leadership Opportunity":
-            self.leadership_opportunity()
-        elif milestone == "Personal Transformation":
-            self.personal_transformation()
-        elif milestone == "Legacy Planning":
-            self.legacy_planning()
-
-    def academic_journey_event(self, milestone: str):
-        if milestone == "First Major Assignment":
-            self.first_major_assignment()
-        elif milestone == "Choosing Specialization":
-            self.choosing_specialization()
-        elif milestone == "Internship Application":
-            self.internship_application()
-        elif milestone == "Research Project":
-            self.research_project()
-        elif milestone == "Thesis Proposal":
-            self.thesis_proposal()
-        elif milestone == "Final Presentation":
-            self.final_presentation()
-
-    def social_life_event(self, milestone: str):
-        if milestone == "Roommate Introduction":
-            self.roommate_introduction()
-        elif milestone == "Club Fair":
-            self.club_fair()
-        elif milestone == "Campus Event Organization":
-            self.campus_event_organization()
-        elif milestone == "Relationship Dilemma":
-            self.relationship_dilemma()
-        elif milestone == "Spring Break Adventure":
-            self.spring_break_adventure()
-        elif milestone == "Graduation Party Planning":
-            self.graduation_party_planning()
-
-    def career_development_event(self, milestone: str):
-        if milestone == "Career Center Visit":
-            self.career_center_visit()
-        elif milestone == "First Job Fair":
-            self.first_job_fair()
-        elif milestone == "Summer Internship":
-            self.summer_internship()
-        elif milestone == "Networking Event":
-            self.networking_event()
-        elif milestone == "Job Interview Preparation":
-            self.job_interview_preparation()
-        elif milestone == "Job Offer Negotiation":
-            self.job_offer_negotiation()
+            self.milestone = arc.get_current_milestone()
+            try:
+                self.events.dispatch(self, arc_name, self.milestone)
+            finally:
+                self.milestone = None
 
     # Example implementation of one event from each story arc
     def freshman_orientation(self):
-        print("\nWelcome to Freshman Orientation!")
+        self.output("\nWelcome to Freshman Orientation!")
         choice = self.make_decision([
             "Attend all the informational sessions",
             "Focus on meeting new people",
@@ -890,18 +2001,18 @@ class UniversityLifeSimulator:
             "Explore the campus on your own"
         ])
         if choice == 1:
-            print("You gain valuable information about university resources.")
+            self.output("You gain valuable information about university resources.")
             self.player.skill_levels["Academic"] = self.player.skill_levels.get("Academic", 0) + 1
         elif choice == 2:
-            print("You make several new friends!")
+            self.output("You make several new friends!")
             self.story_progress.update_relationship("New Friends", 20)
         else:
-            print("You discover some hidden spots on campus.")
+            self.output("You discover some hidden spots on campus.")
             self.story_progress.increase_global_awareness(5)
         self.story_progress.add_achievement("Oriented Freshman")
 
     def first_major_assignment(self):
-        print("\nYour first major assignment is due soon!")
+        self.output("\nYour first major assignment is due soon!")
         choice = self.make_decision([
             "Pull an all-nighter to complete it",
             "Seek help from a study group",
@@ -910,57 +2021,57 @@ class UniversityLifeSimulator:
         if choice == 1:
             success = self.academic_challenge("All-Night Study Session", 70)
             if success:
-                print("Your hard work pays off!")
+                self.output("Your hard work pays off!")
                 self.player.gpa += 0.2
             else:
-                print("You're exhausted and your work suffers.")
+                self.output("You're exhausted and your work suffers.")
                 self.player.gpa -= 0.1
         elif choice == 2:
-            print("Collaborating improves your understanding.")
+            self.output("Collaborating improves your understanding.")
             self.player.gpa += 0.1
             self.story_progress.update_relationship("Classmates", 10)
         else:
-            print("Your professor grants the extension but seems disappointed.")
+            self.output("Your professor grants the extension but seems disappointed.")
             self.story_progress.update_relationship("Professor", -5)
         self.story_progress.add_achievement("First Assignment Survivor")
 
     def roommate_introduction(self):
-        print("\nTime to meet your roommate, Xahoor!")
+        self.output("\nTime to meet your roommate, Xahoor!")
         choice = self.make_decision([
             "Suggest going out for coffee to get to know each other",
             "Propose setting up room rules right away",
             "Keep to yourself and be polite but distant"
         ])
         if choice == 1:
-            print("You and Xahoor hit it off over coffee!")
+            self.output("You and Xahoor hit it off over coffee!")
             self.story_progress.update_relationship("Xahoor", 20)
         elif choice == 2:
-            print("You and Xahoor establish clear boundaries.")
+            self.output("You and Xahoor establish clear boundaries.")
             self.story_progress.update_relationship("Xahoor", 10)
         else:
-            print("Things remain cordial but cool with Xahoor.")
+            self.output("Things remain cordial but cool with Xahoor.")
         self.story_progress.add_achievement("Roommate Roulette Survivor")
 
     def career_center_visit(self):
-        print("\nYou decide to visit the university's career center.")
+        self.output("\nYou decide to visit the university's career center.")
         choice = self.make_decision([
             "Get help with your resume",
             "Explore internship opportunities",
             "Take a career aptitude test"
         ])
         if choice == 1:
-            print("Your resume is now much more professional!")
+            self.output("Your resume is now much more professional!")
             self.player.skill_levels["Professional Writing"] = self.player.skill_levels.get("Professional Writing", 0) + 1
         elif choice == 2:
-            print("You find some interesting internship leads.")
+            self.output("You find some interesting internship leads.")
             self.story_progress.make_key_decision("Internship Focus", "Early Explorer")
         else:
-            print("The test results give you new career ideas to consider.")
+            self.output("The test results give you new career ideas to consider.")
             self.story_progress.increase_global_awareness(10)
         self.story_progress.add_achievement("Career Planner")
 
     def roommate_drama_event(self):
-        print("Your roommate Xahoor has been acting strange lately...")
+        self.output("Your roommate Xahoor has been acting strange lately...")
         choice = self.make_decision([
             "Confront Xahoor directly",
             "Explore the coredoor with freinds",
@@ -971,32 +2082,30 @@ class UniversityLifeSimulator:
             "Ignore the situation and hope it improves"
         ])
         if choice == 1:
-            print("You have a heart-to-heart with Xahoor and resolve your issues.")
+            self.output("You have a heart-to-heart with Xahoor and resolve your issues.")
             self.story_progress.update_relationship("Xahoor", 20)
             self.player.stress_level -= 10
         elif choice == 2:
-            print("Your RA mediates the situation, but things remain a bit awkward.")
+            self.output("Your RA mediates the situation, but things remain a bit awkward.")
             self.story_progress.update_relationship("Xahoor", 5)
             self.player.stress_level -= 5
         else:
-            print("The tension with Xahoor continues to build...")
+            self.output("The tension with Xahoor continues to build...")
             self.story_progress.update_relationship("Xahoor", -10)
             self.player.stress_level += 15
         
         self.story_progress.add_achievement("Roommate Drama Survivor")
 
     def calculate_semester_gpa(self):
-        total_credits = sum(course.credits for course in self.player.courses)
-        weighted_grades = sum(course.calculate_final_grade() * course.credits for course in self.player.courses)
-        semester_gpa = weighted_grades / total_credits if total_credits > 0 else 0
+        semester_gpa = self.player.semester_gpa()
         self.player.gpa = (self.player.gpa + semester_gpa) / 2  # Average with previous GPA
-        print(f"Your semester GPA: {semester_gpa:.2f}")
-        print(f"Your cumulative GPA: {self.player.gpa:.2f}")
+        self.output(f"Your semester GPA: {semester_gpa:.2f}")
+        self.output(f"Your cumulative GPA: {self.player.gpa:.2f}")
 
     def graduation_ceremony(self):
-        print("\nCongratulations! You've made it to graduation!")
-        print(f"Your final GPA: {self.player.gpa:.2f}")
-        print("As you reflect on your university journey, you feel:")
+        self.output("\nCongratulations! You've made it to graduation!")
+        self.output(f"Your final GPA: {self.player.gpa:.2f}")
+        self.output("As you reflect on your university journey, you feel:")
         choice = self.make_decision([
             "Proud of Your academic achievements",
             "Gratefull for the friendships you've made",
@@ -1018,9 +2127,16 @@ class UniversityLifeSimulator:
         else:
             self.story_progress.add_achievement("Campus Enthusiast")
         
-        print("\nYour University Life Summary:")
-        print(self.story_progress.get_story_summary())
-        print("\nThank you for playing University Life Simulator!")
+        self.output("\nYour University Life Summary:")
+        self.output(self.story_progress.get_story_summary())
+        self.output("\nThank you for playing University Life Simulator!")
+
+def run_headless(policy: DecisionPolicy, output=discard_output,
+                 seed: Optional[int] = None) -> UniversityLifeSimulator:
+    """Play one full game with no console I/O and return the finished simulator."""
+    game = UniversityLifeSimulator(policy=policy, output=output, rng=random.Random(seed))
+    game.run_game()
+    return game
 
 if __name__ == "__main__":
     game = UniversityLifeSimulator()
@@ -0,0 +1,170 @@
+"""Exact odds and expected values for academic challenges, without sampling.
+
+academic_challenge succeeds when random.randint(0, 100) < success_chance, so
+the probability is simply the number of winning rolls out of 101. On top of
+that, ExpectedValueEvaluator runs a memoized dynamic program over challenge
+and rest outcomes to give the exact expected end-of-semester GPA (or any
+other metric) for a decision policy.
+"""
+import math
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+from ProjectTest import Student, challenge_success_chance
+
+ROLL_OUTCOMES = 101  # randint(0, 100) is inclusive on both ends
+CREDITS_EXPECTED = 2.0  # mean of randint(1, 3) on success
+BURNOUT_STRESS = 80  # Student.update_mental_state switches to BURNOUT here
+
+class ChallengeState(NamedTuple):
+    energy: int
+    max_energy: int
+    stress_level: int
+    gpa: float
+    skill_count: int
+    has_study_aid: bool
+
+    @classmethod
+    def from_student(cls, student: Student) -> 'ChallengeState':
+        return cls(
+            student.energy,
+            student.max_energy,
+            student.stress_level,
+            round(student.gpa, 6),
+            len(student.skills),
+            student.inventory.has_type("study_aid")
+        )
+
+class ChallengeOdds(NamedTuple):
+    success_probability: float
+    gpa_delta: float
+    credits_delta: float
+    energy_delta: int
+    stress_delta: int
+
+def success_probability(success_chance: float) -> float:
+    """P(randint(0, 100) < success_chance)."""
+    winning_rolls = min(ROLL_OUTCOMES, max(0, math.ceil(success_chance)))
+    return winning_rolls / ROLL_OUTCOMES
+
+def challenge_odds(state: ChallengeState) -> ChallengeOdds:
+    """Exact success probability and expected deltas of one academic_challenge."""
+    p = success_probability(challenge_success_chance(
+        state.energy, state.skill_count, state.gpa, state.stress_level, state.has_study_aid))
+    gpa_up = min(4.0, state.gpa + 0.1) - state.gpa
+    gpa_down = max(0.0, state.gpa - 0.1) - state.gpa
+    return ChallengeOdds(
+        success_probability=p,
+        gpa_delta=p * gpa_up + (1 - p) * gpa_down,
+        credits_delta=p * CREDITS_EXPECTED,
+        energy_delta=-20,
+        stress_delta=15
+    )
+
+def challenge_outcomes(state: ChallengeState) -> List[Tuple[float, ChallengeState]]:
+    p = success_probability(challenge_success_chance(
+        state.energy, state.skill_count, state.gpa, state.stress_level, state.has_study_aid))
+    after = state._replace(energy=state.energy - 20, stress_level=state.stress_level + 15)
+    outcomes = []
+    if p > 0:
+        outcomes.append((p, after._replace(gpa=round(min(4.0, state.gpa + 0.1), 6))))
+    if p < 1:
+        outcomes.append((1 - p, after._replace(gpa=round(max(0.0, state.gpa - 0.1), 6))))
+    return outcomes
+
+@lru_cache(maxsize=None)
+def _rest_marginals(energy: int, max_energy: int, stress_level: int):
+    energy_weights: Dict[int, int] = {}
+    for recovery in range(20, 41):
+        rested = min(max_energy, energy + recovery)
+        energy_weights[rested] = energy_weights.get(rested, 0) + 1
+    stress_weights: Dict[int, int] = {}
+    for relief in range(10, 26):
+        relieved = max(0, stress_level - relief)
+        stress_weights[relieved] = stress_weights.get(relieved, 0) + 1
+    return tuple(energy_weights.items()), tuple(stress_weights.items())
+
+def rest_outcomes(state: ChallengeState) -> List[Tuple[float, ChallengeState]]:
+    """Distribution of handle_rest: randint(20, 40) energy, randint(10, 25) stress relief."""
+    energies, stresses = _rest_marginals(state.energy, state.max_energy, state.stress_level)
+    total = 21 * 16
+    return [(ew * sw / total,
+             ChallengeState(energy, state.max_energy, stress, state.gpa,
+                            state.skill_count, state.has_study_aid))
+            for energy, ew in energies
+            for stress, sw in stresses]
+
+Policy = Callable[[ChallengeState], str]
+
+def always_challenge(state: ChallengeState) -> str:
+    return "challenge"
+
+def rest_when_tired(state: ChallengeState) -> str:
+    return "rest" if state.energy < 40 or state.stress_level >= 60 else "challenge"
+
+class ExpectedValueEvaluator:
+    """Exact expectation of a metric after a number of policy steps.
+
+    At each step the policy picks "challenge", "rest" or "skip" for the
+    current state. Like run_event_round, a student who ends a step in
+    burnout takes a rest before the next one. Results are memoized per
+    (state, steps), so sweeping many starting states reuses shared subtrees.
+    """
+
+    ACTIONS = {
+        "challenge": challenge_outcomes,
+        "rest": rest_outcomes,
+        "skip": lambda state: [(1.0, state)],
+    }
+
+    def __init__(self, policy: Policy, metric: Callable[[ChallengeState], float] = None,
+                 rest_on_burnout: bool = True):
+        self.policy = policy
+        self.metric = metric or (lambda state: state.gpa)
+        self.rest_on_burnout = rest_on_burnout
+        self._cache: Dict[Tuple[ChallengeState, int], float] = {}
+        self._rest_cache: Dict[Tuple[ChallengeState, int], float] = {}
+
+    def expected(self, state: ChallengeState, steps: int) -> float:
+        key = (state, steps)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        if steps <= 0:
+            value = self.metric(state)
+        else:
+            action = self.policy(state)
+            value = 0.0
+            for p, next_state in self.ACTIONS[action](state):
+                value += p * self._after_step(next_state, steps - 1)
+        self._cache[key] = value
+        return value
+
+    def _after_step(self, state: ChallengeState, steps: int) -> float:
+        if not (self.rest_on_burnout and state.stress_level >= BURNOUT_STRESS):
+            return self.expected(state, steps)
+        key = (state, steps)
+        cached = self._rest_cache.get(key)
+        if cached is None:
+            cached = sum(p * self.expected(rested, steps) for p, rested in rest_outcomes(state))
+            self._rest_cache[key] = cached
+        return cached
+
+    def cache_size(self) -> int:
+        return len(self._cache) + len(self._rest_cache)
+
+def expected_semester_gpa(student: Student, policy: Policy = always_challenge,
+                          events: int = 3) -> float:
+    """Expected GPA after one semester of `events` decision points, from a fresh start."""
+    state = ChallengeState.from_student(student)._replace(
+        energy=student.max_energy, stress_level=0)
+    return ExpectedValueEvaluator(policy).expected(state, events)
+
+if __name__ == "__main__":
+    student = Student("Sample", "Computer Science")
+    state = ChallengeState.from_student(student)
+    print(challenge_odds(state))
+    for name, policy in [("always challenge", always_challenge), ("rest when tired", rest_when_tired)]:
+        evaluator = ExpectedValueEvaluator(policy)
+        print(f"{name}: expected GPA after 6 steps = {evaluator.expected(state, 6):.4f} "
+              f"({evaluator.cache_size()} states)")
@@ -0,0 +1,163 @@
+"""Population-level simulator: a whole cohort of students as NumPy columns.
+
+Applies the same rules as UniversityLifeSimulator.academic_challenge,
+handle_rest, apply_weather_effects, Student.update_mental_state and
+Student.semester_up, but to every student at once. Meant for balance
+questions such as "what fraction burns out by semester 4 on HARD" where
+one Python object per student is far too slow. Requires NumPy.
+"""
+from typing import Optional
+
+import numpy as np
+
+from ProjectTest import Difficulty, MentalState, Weather
+
+# update_mental_state as a threshold lookup: stress < 20 -> EXCELLENT, ... >= 80 -> BURNOUT
+MENTAL_THRESHOLDS = np.array([20, 40, 60, 80])
+MENTAL_STATES = [MentalState.EXCELLENT, MentalState.GOOD, MentalState.OKAY,
+                 MentalState.STRESSED, MentalState.BURNOUT]
+BURNOUT = MENTAL_STATES.index(MentalState.BURNOUT)
+
+WEATHERS = list(Weather)
+# Energy and stress change per weather code, same as apply_weather_effects
+WEATHER_ENERGY = np.array([{Weather.RAINY: -5, Weather.SNOWY: -10}.get(w, 0) for w in WEATHERS])
+WEATHER_STRESS = np.array([{Weather.RAINY: 2, Weather.SNOWY: 5}.get(w, 0) for w in WEATHERS])
+
+SKILLS = ["Research", "Writing", "Programming", "Presentation", "Teamwork"]
+
+class Cohort:
+    def __init__(self, size: int, difficulty: Difficulty = Difficulty.MEDIUM,
+                 seed: Optional[int] = None):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.energy = np.full(size, 100, dtype=np.int32)
+        self.max_energy = np.full(size, 100, dtype=np.int32)
+        self.stress_level = np.zeros(size, dtype=np.int32)
+        self.gpa = np.zeros(size, dtype=np.float64)
+        self.credits = np.zeros(size, dtype=np.int32)
+        self.money = np.full(size, 1000 if difficulty == Difficulty.EASY else 500, dtype=np.int32)
+        self.semester = np.ones(size, dtype=np.int32)
+        self.skill_count = np.zeros(size, dtype=np.int32)  # len(Student.skills)
+        self.skill_levels = {skill: np.ones(size, dtype=np.int32) for skill in SKILLS}
+        self.has_study_aid = np.zeros(size, dtype=bool)
+        self.mental_state = np.full(size, MENTAL_STATES.index(MentalState.GOOD), dtype=np.int8)
+        self.weather = self.rng.integers(0, len(WEATHERS), size, dtype=np.int8)
+        # First semester in which each student hit burnout, 0 if never
+        self.burnout_semester = np.zeros(size, dtype=np.int32)
+
+    def _select(self, mask: Optional[np.ndarray]) -> np.ndarray:
+        return np.ones(self.size, dtype=bool) if mask is None else mask
+
+    def academic_challenge(self, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """Resolve one challenge for every selected student; returns the success mask."""
+        mask = self._select(mask)
+        success_chance = (
+            (self.energy / 2) +
+            (self.skill_count * 10) +
+            (self.gpa * 10) -
+            (self.stress_level / 2)
+        ) + np.where(self.has_study_aid, 20, 0)
+        success = (self.rng.integers(0, 101, self.size) < success_chance) & mask
+
+        self.energy -= np.where(mask, 20, 0).astype(np.int32)
+        self.stress_level += np.where(mask, 15, 0).astype(np.int32)
+
+        failed = mask & ~success
+        self.gpa = np.where(success, np.minimum(4.0, self.gpa + 0.1), self.gpa)
+        self.gpa = np.where(failed, np.maximum(0.0, self.gpa - 0.1), self.gpa)
+        self.credits += np.where(success, self.rng.integers(1, 4, self.size), 0).astype(np.int32)
+        return success
+
+    def handle_rest(self, mask: Optional[np.ndarray] = None):
+        mask = self._select(mask)
+        energy_recovery = self.rng.integers(20, 41, self.size)
+        stress_relief = self.rng.integers(10, 26, self.size)
+        self.energy = np.where(mask, np.minimum(self.max_energy, self.energy + energy_recovery),
+                               self.energy).astype(np.int32)
+        self.stress_level = np.where(mask, np.maximum(0, self.stress_level - stress_relief),
+                                     self.stress_level).astype(np.int32)
+
+    def shift_weather(self, probability: float = 0.2):
+        """Give each student new weather with the given probability.
+
+        The game changes weather through a scheduled weather_shift clock
+        event, 12 to 36 game hours after the previous one
+        (UniversityLifeSimulator.WEATHER_SHIFT_MINUTES). The cohort has no
+        clock, so this stands in with one independent draw per event round.
+        """
+        changed = self.rng.random(self.size) < probability
+        new_weather = self.rng.integers(0, len(WEATHERS), self.size, dtype=np.int8)
+        self.weather = np.where(changed, new_weather, self.weather)
+
+    def apply_weather_effects(self):
+        self.energy += WEATHER_ENERGY[self.weather].astype(np.int32)
+        self.stress_level += WEATHER_STRESS[self.weather].astype(np.int32)
+
+    def update_mental_state(self):
+        self.mental_state = np.searchsorted(MENTAL_THRESHOLDS, self.stress_level,
+                                            side="right").astype(np.int8)
+        burned_out = self.mental_state == BURNOUT
+        first_time = burned_out & (self.burnout_semester == 0)
+        self.burnout_semester = np.where(first_time, self.semester, self.burnout_semester)
+        return burned_out
+
+    def semester_up(self):
+        self.semester += 1
+        self.max_energy += 10
+        self.energy = self.max_energy.copy()
+        self.skill_count += (self.semester % 2 == 0).astype(np.int32)
+
+    def run_semester(self, events: int = 3, challenges_per_event: float = 1.0,
+                     weather: bool = True):
+        """Play one semester for the whole cohort.
+
+        Mirrors start_semester/run_event_round/end_semester: energy and
+        stress reset, then each event round applies weather, resolves
+        challenges (each student faces one with probability
+        challenges_per_event when it is below 1), updates the mental state
+        and rests the burned-out students. Course grades and story choices
+        are not modelled; pass weather=False to skip the weather rules.
+        """
+        self.energy = self.max_energy.copy()
+        self.stress_level[:] = 0
+        for _ in range(events):
+            if weather:
+                self.shift_weather()
+                self.apply_weather_effects()
+            remaining = challenges_per_event
+            while remaining > 0:
+                mask = None if remaining >= 1 else self.rng.random(self.size) < remaining
+                self.academic_challenge(mask)
+                remaining -= 1
+            burned_out = self.update_mental_state()
+            self.handle_rest(burned_out)
+        self.semester_up()
+
+    def run(self, semesters: int = 8, **kwargs):
+        for _ in range(semesters):
+            self.run_semester(**kwargs)
+        return self
+
+    def burnout_fraction(self, by_semester: int) -> float:
+        """Fraction of the cohort that has burned out at or before the given semester."""
+        hit = (self.burnout_semester > 0) & (self.burnout_semester <= by_semester)
+        return float(hit.mean())
+
+    def mental_state_counts(self):
+        counts = np.bincount(self.mental_state, minlength=len(MENTAL_STATES))
+        return {state: int(count) for state, count in zip(MENTAL_STATES, counts)}
+
+    def summary(self):
+        return {
+            "size": self.size,
+            "gpa_mean": float(self.gpa.mean()),
+            "gpa_p10": float(np.percentile(self.gpa, 10)),
+            "gpa_p90": float(np.percentile(self.gpa, 90)),
+            "credits_mean": float(self.credits.mean()),
+            "ever_burned_out": float((self.burnout_semester > 0).mean()),
+        }
+
+if __name__ == "__main__":
+    cohort = Cohort(1_000_000, Difficulty.HARD, seed=0).run(semesters=4, challenges_per_event=2)
+    print(f"Burned out by semester 4 on HARD: {cohort.burnout_fraction(4):.2%}")
+    print(cohort.summary())
@@ -0,0 +1,142 @@
+"""Structured game-event log, written off the game's thread.
+
+Each event is one JSON line:
+
+    {"ts": 1760680000.12, "type": "step", "session": 7, "label": "start_semester",
+     "semester": 1, "delta": {"energy": 10, "stress_level": -20}}
+
+emit() only puts a tuple on a queue; a daemon thread takes whatever has
+queued up (after a short batch_delay, as save_store.BackgroundWriter
+does), encodes it and appends it with a single write. Once the file would
+pass max_bytes it is rotated to path.1 ... path.<backups>, like
+logging.handlers.RotatingFileHandler. Many sessions emitting at once
+therefore never contend for the file, only for the queue.
+
+A disabled log is NULL_EVENT_LOG, whose enabled is False. Callers check
+enabled before building an event's fields, so turning the log off costs
+one attribute test per event site.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Dict, Optional
+
+class NullEventLog:
+    """Stands in for an EventLog when event logging is off."""
+    enabled = False
+
+    def emit(self, event_type: str, session=None, **fields):
+        pass
+
+    def flush(self, timeout: Optional[float] = None):
+        pass
+
+    def close(self):
+        pass
+
+NULL_EVENT_LOG = NullEventLog()
+
+_CLOSE = object()
+
+class EventLog:
+    enabled = True
+
+    def __init__(self, path: str, max_bytes: int = 10 * 2**20, backups: int = 3,
+                 batch_delay: float = 0.05):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.batch_delay = batch_delay
+        self.batches = 0
+        self.events = 0
+        self.rotations = 0
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, event_type: str, session=None, **fields):
+        """Queue one event; never blocks on the file."""
+        self._queue.put((time.time(), event_type, session, fields))
+
+    def flush(self, timeout: Optional[float] = None):
+        """Wait until everything emitted so far has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def _rotate(self, f):
+        f.close()
+        for i in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+        return open(self.path, 'ab')
+
+    def _run(self):
+        import json  # Only paid for by processes that actually log events
+        encode = json.JSONEncoder(separators=(",", ":"), default=str).encode
+        f = open(self.path, 'ab')
+        size = f.tell()
+        try:
+            while True:
+                batch = [self._queue.get()]
+                if batch[0] is not _CLOSE:
+                    # Let a burst of events pile up so they share one write
+                    time.sleep(self.batch_delay)
+                try:
+                    while True:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                lines = []
+                waiters = []
+                closing = False
+                for item in batch:
+                    if item is _CLOSE:
+                        closing = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        ts, event_type, session, fields = item
+                        record: Dict = {"ts": round(ts, 6), "type": event_type, "session": session}
+                        record.update(fields)
+                        lines.append(encode(record) + "\n")
+                if lines:
+                    data = "".join(lines).encode()
+                    try:
+                        if size and size + len(data) > self.max_bytes:
+                            f = self._rotate(f)
+                            size = 0
+                        f.write(data)
+                        f.flush()
+                        size += len(data)
+                    except OSError:
+                        import logging
+                        logging.exception("Event log write to %s failed; %d events dropped",
+                                          self.path, len(lines))
+                    self.batches += 1
+                    self.events += len(lines)
+                for waiter in waiters:
+                    waiter.set()
+                if closing:
+                    return
+        finally:
+            f.close()
@@ -0,0 +1,117 @@
+"""Monotonic game clock counting whole minutes, with a scheduler of timed events.
+
+Minute 0 is midnight at the start of day 0, so the time of day and the
+day number are plain integer arithmetic and nothing wraps at midnight.
+Events are (due minute, name, args) entries on a heap: scheduling and
+firing are O(log n), and advance() walks straight from one due event to
+the next, so fast-forwarding weeks costs one step per event rather than
+one per minute or hour.
+
+Events are named rather than holding callbacks. The clock is plain data
+that pickles and saves (to_dict/from_dict), and the owner decides what
+each name means when advance() hands the event back.
+"""
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MINUTES_PER_HOUR = 60
+MINUTES_PER_DAY = 24 * MINUTES_PER_HOUR
+
+def parse_time_of_day(text: str) -> int:
+    """Minutes past midnight for an "HH:MM" string."""
+    hours, minutes = text.split(":")
+    return int(hours) * MINUTES_PER_HOUR + int(minutes)
+
+class GameClock:
+    __slots__ = ("minutes", "_events", "_seq")
+
+    def __init__(self, minutes: int = 8 * MINUTES_PER_HOUR):
+        self.minutes = minutes
+        self._events: List[Tuple[int, int, str, tuple]] = []
+        self._seq = 0  # Keeps events due at the same minute in scheduling order
+
+    @property
+    def day(self) -> int:
+        return self.minutes // MINUTES_PER_DAY
+
+    @property
+    def minute_of_day(self) -> int:
+        return self.minutes % MINUTES_PER_DAY
+
+    def time_of_day(self) -> str:
+        """The "HH:MM" form saves have always used for current_time."""
+        hours, minutes = divmod(self.minute_of_day, MINUTES_PER_HOUR)
+        return f"{hours:02d}:{minutes:02d}"
+
+    def set_time_of_day(self, minute_of_day: int):
+        """Move to minute_of_day on the current day (for saves that only know the time)."""
+        self.minutes = self.day * MINUTES_PER_DAY + minute_of_day
+
+    def schedule(self, at: int, name: str, *args) -> tuple:
+        """Queue event name to fire at minute at; returns a handle for cancel()."""
+        entry = (at, self._seq, name, args)
+        self._seq += 1
+        heapq.heappush(self._events, entry)
+        return entry
+
+    def schedule_in(self, delay: int, name: str, *args) -> tuple:
+        return self.schedule(self.minutes + delay, name, *args)
+
+    def cancel(self, handle: tuple) -> bool:
+        try:
+            self._events.remove(handle)
+        except ValueError:
+            return False
+        heapq.heapify(self._events)
+        return True
+
+    def cancel_all(self, name: str) -> int:
+        before = len(self._events)
+        self._events = [entry for entry in self._events if entry[2] != name]
+        heapq.heapify(self._events)
+        return before - len(self._events)
+
+    def next_due(self, name: Optional[str] = None) -> Optional[int]:
+        """Minute of the next event (of that name, if given), or None."""
+        if name is None:
+            return self._events[0][0] if self._events else None
+        due = [entry[0] for entry in self._events if entry[2] == name]
+        return min(due) if due else None
+
+    def pending(self) -> List[Tuple[int, str, tuple]]:
+        return [(at, name, args) for at, _, name, args in sorted(self._events)]
+
+    def advance(self, minutes: int) -> Iterator[Tuple[str, tuple]]:
+        """Move the clock forward, yielding (name, args) for each event that comes due.
+
+        While an event is being handled the clock reads its due minute, and
+        events the handler schedules within the window fire in order too.
+        Consume the whole iterator (the clock only reaches the target once
+        it is exhausted).
+        """
+        if minutes < 0:
+            raise ValueError("The game clock only moves forward")
+        target = self.minutes + minutes
+        events = self._events
+        while events and events[0][0] <= target:
+            at, _, name, args = heapq.heappop(events)
+            self.minutes = max(self.minutes, at)
+            yield name, args
+        self.minutes = target
+
+    def copy(self) -> 'GameClock':
+        clone = GameClock(self.minutes)
+        clone._events = list(self._events)  # Entries are immutable tuples
+        clone._seq = self._seq
+        return clone
+
+    def to_dict(self) -> Dict:
+        return {"minutes": self.minutes,
+                "events": [[at, name, list(args)] for at, name, args in self.pending()]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'GameClock':
+        clock = cls(data["minutes"])
+        for at, name, args in data["events"]:
+            clock.schedule(at, name, *args)
+        return clock
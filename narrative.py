@@ -0,0 +1,142 @@
+"""Generated story text for the options of story-event decisions.
+
+A NarrativeBackend turns a NarrativeRequest (milestone, chosen option,
+a compact signature of the player's situation) into a few sentences.
+Real backends call a language model; StubBackend is local and
+deterministic, for tests and offline play.
+
+NarrativeGenerator puts a backend behind a thread pool and an LRU cache
+keyed by (milestone, choice, signature). When a story event shows its
+options, make_decision calls prefetch() and every option starts
+generating while the player reads; by the time an answer arrives the
+text for it is usually done. narrate() waits at most `wait` seconds for
+text still in flight and otherwise returns None, so a slow model costs
+the player a missing paragraph rather than a stall; session_server,
+which plays every game on one event loop, does not wait at all. One
+generator is meant to be shared by every game in a process (session_server
+--narrate), and signatures are coarse on purpose: players in the same
+situation share cache entries, so repeats cost nothing.
+"""
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from typing import Dict, NamedTuple, Optional, Sequence
+
+class NarrativeRequest(NamedTuple):
+    milestone: str
+    choice: int  # 1-based, like make_decision
+    option: str
+    signature: str
+
+def state_signature(sim) -> str:
+    """Compact, coarse description of the player's situation, e.g. "Computer Science|s3|STRESSED|e2|t3|g3.0"."""
+    player = sim.player
+    if player is None:
+        return "-"
+    energy = min(100, max(0, player.energy)) // 25
+    stress = min(100, max(0, player.stress_level)) // 25
+    gpa = round(min(4.0, max(0.0, player.gpa)) * 2) / 2
+    return (f"{player.major}|s{sim.story_progress.semester}|{player.mental_state.name}"
+            f"|e{energy}|t{stress}|g{gpa:.1f}")
+
+class NarrativeBackend(ABC):
+    """Writes the text for one request. Called from worker threads, possibly several at once."""
+
+    @abstractmethod
+    def generate(self, request: NarrativeRequest) -> str:
+        ...
+
+class StubBackend(NarrativeBackend):
+    """Deterministic stand-in for a model: the same request always gives the same text.
+
+    latency (seconds) is slept before answering, to exercise prefetching
+    the way a remote model would.
+    """
+
+    OPENINGS = ("The moment stays with you.", "Looking back, it was a turning point.",
+                "Nobody on campus saw that coming.", "It felt right at the time.")
+    MOODS = {"EXCELLENT": "with a light step", "GOOD": "feeling steady", "OKAY": "a little unsure",
+             "STRESSED": "with your shoulders tight", "BURNOUT": "running on empty"}
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def generate(self, request: NarrativeRequest) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        self.calls += 1
+        digest = hashlib.blake2b(f"{request.milestone}:{request.choice}:{request.signature}".encode(),
+                                 digest_size=4).digest()
+        opening = self.OPENINGS[digest[0] % len(self.OPENINGS)]
+        fields = request.signature.split("|")
+        mood = self.MOODS.get(fields[2], "") if len(fields) > 2 else ""
+        option = request.option.rstrip(" .").lower()
+        return f"{opening} You chose to {option} {mood}".rstrip() + "."
+
+class NarrativeGenerator:
+    """Shared, thread-safe front end for a backend: prefetching, caching and bounded waits."""
+
+    def __init__(self, backend: NarrativeBackend, cache_size: int = 4096, workers: int = 4,
+                 wait: float = 0.2):
+        self.backend = backend
+        self.cache_size = cache_size
+        self.wait = wait
+        self._cache: "OrderedDict[tuple, Future]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="narrative")
+        self.hits = 0
+        self.misses = 0  # Requests that had to start generating
+        self.late = 0  # narrate() calls that gave up waiting
+
+    signature = staticmethod(state_signature)
+
+    def _future(self, request: NarrativeRequest) -> Future:
+        key = (request.milestone, request.choice, request.signature)
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return future
+            self.misses += 1
+            future = self._pool.submit(self.backend.generate, request)
+            # Cached while still running, so concurrent requests share one generation
+            self._cache[key] = future
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return future
+
+    def prefetch(self, milestone: str, options: Sequence[str], signature: str):
+        """Start generating the text of every option that is not cached yet."""
+        for choice, option in enumerate(options, 1):
+            self._future(NarrativeRequest(milestone, choice, option, signature))
+
+    def narrate(self, milestone: str, choice: int, option: str, signature: str,
+                wait: Optional[float] = None) -> Optional[str]:
+        """The text for the chosen option, or None if it is not ready within wait (default self.wait) seconds."""
+        request = NarrativeRequest(milestone, choice, option, signature)
+        future = self._future(request)
+        try:
+            return future.result(self.wait if wait is None else wait)
+        except TimeoutError:
+            # Left running: the next player in this situation gets it for free
+            self.late += 1
+            return None
+        except Exception:
+            import logging
+            logging.exception("Narrative backend failed for %s", request)
+            with self._lock:
+                key = (milestone, choice, signature)
+                if self._cache.get(key) is future:
+                    del self._cache[key]  # Retried next time rather than failing forever
+            return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "late": self.late, "cached": len(self._cache)}
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
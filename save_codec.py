@@ -0,0 +1,659 @@
+"""Compact binary save format (.sav) with lazily decoded sections.
+
+save_game keeps writing JSON slots; .sav files are exports of them for
+storage and for tools that only need part of a save (see the numbers
+below). `python save_codec.py DIR --to binary|json` exports slots and
+imports them back.
+
+Layout (little endian):
+
+    magic  b"ULSV"
+    u16    format version
+    u16    section count
+    count x (u8 section id, u32 offset, u32 length)
+    section payloads
+
+Sections hold the listing header (name, major, semesters, GPA, plot), the
+player's core stats, courses, the inventory, research projects, story
+progress and anything else in the save dict. A reader only decodes the
+sections it is asked for, so listing a save unpacks one small struct and
+reading core stats (e.g. for a leaderboard) never touches courses or the
+story.
+
+The header is a struct. Every other section is packed by a fixed schema
+into three arrays: integers (1, 2 or 4 bytes each, the narrowest that
+holds them all), floats (4 bytes when that is exact, else 8) and strings
+(one NUL-separated UTF-8 block). No key names are written; mappings that
+start with the keys the game always writes (stats, skill levels, story
+arcs) store only how many of those they have, and enum values are stored
+as their index. Decoding a section is three bulk conversions and a walk
+over the schema. Inventories are a table of distinct items plus one index
+per item. A section whose data does not fit its schema is stored as JSON
+instead, and keys the schemas do not know go to the last section, so
+every JSON save round-trips losslessly.
+
+Measured on a finished game's save: 1987 bytes of JSON become 748 (about
+2.7x smaller; a 500-item inventory goes from 27 KB to 1.8 KB). Reading
+the header takes about a fifth of json.loads' time and the core stats
+about three fifths, but decoding the whole save is about 1.6x slower than
+json.loads, so the format pays off for partial reads and storage, not
+for a full load, which is why the game does not load from it.
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from array import array
+from itertools import islice
+from typing import Callable, Dict, List, Optional, Tuple
+
+MAGIC = b"ULSV"
+VERSION = 2  # Version 1 kept most sections as JSON arrays
+_PREAMBLE = struct.Struct("<4sHH")
+_ENTRY = struct.Struct("<BII")
+_HEADER_NUMBERS = struct.Struct("<Bidi")
+_COUNTS = struct.Struct("<HHHB")  # ints, floats, string block bytes, layout
+
+HEADER, CORE, INVENTORY, RESEARCH, STORY, EXTRA, COURSES = range(1, 8)
+SECTION_IDS = {"header": HEADER, "core": CORE, "courses": COURSES, "inventory": INVENTORY,
+               "research": RESEARCH, "story": STORY, "extra": EXTRA}
+
+# Keys each section stores by position (no key strings on disk)
+HEADER_PLAYER_KEYS = ("name", "major", "semester", "gpa")
+HEADER_STORY_KEYS = ("semester", "major_plot")
+CORE_PLAYER_KEYS = ("energy", "max_energy", "credits", "money", "mental_state", "stress_level",
+                    "skills", "relationships", "job", "extracurriculars", "stats", "skill_levels")
+CORE_TOP_KEYS = ("current_time", "current_weather", "clock")
+STORY_KEYS = ("story_arcs", "relationships", "key_decisions", "global_awareness", "achievements")
+JOB_KEYS = ("title", "hourly_rate")
+CLOCK_KEYS = ("minutes", "events")
+COURSE_KEYS = ("name", "credits", "difficulty", "assignments", "midterm_grade", "final_grade",
+               "attendance", "participation")
+ASSIGNMENT_KEYS = ("name", "weight", "grade")
+ITEM_KEYS = ("name", "type", "value")
+PROJECT_KEYS = ("name", "difficulty", "duration", "progress", "completed")
+# Sections holding one list of the player's
+LIST_SECTIONS = {COURSES: "courses", INVENTORY: "inventory", RESEARCH: "research_projects"}
+
+# Keys the game writes first in these mappings, and the values of its enums.
+# Part of the format: only ever append to them.
+STAT_KEYS = ("classes_attended", "assignments_completed", "social_events", "money_earned")
+SKILL_KEYS = ("Research", "Writing", "Programming", "Presentation", "Teamwork")
+ARC_KEYS = ("personal_growth", "academic_journey", "social_life", "career_development")
+MENTAL_STATES = ("excellent", "good", "okay", "stressed", "burnout")
+WEATHERS = ("sunny", "rainy", "snowy", "cloudy")
+
+# Section payload modes
+_ABSENT, _PACKED, _VERBATIM, _EMPTY = range(4)
+# Integer typecodes by range; the lowest value of the chosen type marks a float
+_INT_TYPES = (("b", 2**7), ("h", 2**15), ("i", 2**31))
+_LAYOUTS = tuple((int_code, float_code) for int_code in "bhi" for float_code in "fd")
+_SIZES = {"b": 1, "h": 2, "i": 4, "f": 4, "d": 8}
+_MIXED = 0x80  # Layout flag: some ints are marks for floats
+_SWAP = sys.byteorder != "little"
+
+class SaveFormatError(ValueError):
+    pass
+
+class _Unpackable(Exception):
+    """A value does not fit the schema of the section being packed."""
+
+def _dumps(value) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+def _remaining(source: Dict, keys) -> Dict:
+    return {key: value for key, value in source.items() if key not in keys}
+
+def _positional(source: Dict, keys: Tuple[str, ...]) -> list:
+    """[presence bitmask, value per key...]."""
+    mask = 0
+    values = []
+    for bit, key in enumerate(keys):
+        if key in source:
+            mask |= 1 << bit
+            values.append(source[key])
+        else:
+            values.append(None)
+    return [mask] + values
+
+def _from_positional(values: list, keys: Tuple[str, ...], target: Dict):
+    mask = values[0]
+    for bit, key in enumerate(keys):
+        if mask & (1 << bit):
+            target[key] = values[bit + 1]
+
+class _Packer:
+    """Collects the values of one packed section, split by kind."""
+
+    def __init__(self):
+        self.ints: List[Optional[int]] = []  # None where a float is read instead
+        self.floats: List[float] = []
+        self.strings: List[str] = []
+        self.mixed = False  # A float was given where an int is expected
+
+    def number(self, value):
+        """An int, or a float in its place (marked in the ints)."""
+        if type(value) is int:
+            self.ints.append(value)
+        elif type(value) is float:
+            self.ints.append(None)
+            self.floats.append(value)
+            self.mixed = True
+        else:
+            raise _Unpackable
+
+    def real(self, value):
+        """A float the schema always stores as one."""
+        if type(value) is not float:
+            raise _Unpackable
+        self.floats.append(value)
+
+    def flag(self, value: bool):
+        if type(value) is not bool:
+            raise _Unpackable
+        self.ints.append(int(value))
+
+    def string(self, value):
+        if type(value) is not str or "\0" in value:
+            raise _Unpackable
+        self.strings.append(value)
+
+    def symbol(self, value, known: Tuple[str, ...]):
+        """Index of value in known, or -1 and the string itself."""
+        if value in known:
+            self.ints.append(known.index(value))
+        else:
+            self.ints.append(-1)
+            self.string(value)
+
+    def count(self, values, kind: type) -> int:
+        if type(values) is not kind:
+            raise _Unpackable
+        self.ints.append(len(values))
+        return len(values)
+
+    def strings_list(self, values):
+        self.count(values, list)
+        for value in values:
+            self.string(value)
+
+    def mapping(self, values, value, known: Tuple[str, ...] = ()):
+        """A dict: how many of its first keys are known's, the rest of the keys, then the values."""
+        if type(values) is not dict:
+            raise _Unpackable
+        keys = list(values)
+        lead = 0
+        while lead < len(known) and lead < len(keys) and keys[lead] == known[lead]:
+            lead += 1
+        self.ints.append(lead)
+        self.strings_list(keys[lead:])
+        for item in values.values():
+            value(item)
+
+    @staticmethod
+    def check(record, keys: Tuple[str, ...]):
+        """record must be a dict with exactly these keys, in this order."""
+        if type(record) is not dict or tuple(record) != keys:
+            raise _Unpackable
+
+    def records(self, records, keys: Tuple[str, ...]) -> list:
+        """Counts and checks a list of records; returns it."""
+        self.count(records, list)
+        for record in records:
+            self.check(record, keys)
+        return records
+
+    def to_bytes(self) -> bytes:
+        values = [value for value in self.ints if value is not None]
+        low, high = min(values, default=0), max(values, default=0)
+        for int_code, limit in _INT_TYPES:
+            if -limit < low and high < limit:
+                break
+        else:
+            raise _Unpackable
+        ints = array(int_code, [-limit if value is None else value for value in self.ints])
+        float_code = "f"
+        try:
+            floats = array("f", self.floats)
+            if floats.tolist() != self.floats:
+                raise OverflowError
+        except OverflowError:
+            float_code = "d"
+            floats = array("d", self.floats)
+        block = "\0".join(self.strings).encode("utf-8")
+        if max(len(ints), len(floats), len(block)) > 0xFFFF:
+            raise _Unpackable
+        if _SWAP:
+            ints.byteswap()
+            floats.byteswap()
+        layout = _LAYOUTS.index((int_code, float_code)) | (_MIXED if self.mixed else 0)
+        return (bytes([_PACKED]) + _COUNTS.pack(len(ints), len(floats), len(block), layout) +
+                ints.tobytes() + floats.tobytes() + block)
+
+def _resolve(ints: list, next_float: Callable[[], float], mark: int):
+    for value in ints:
+        yield next_float() if value == mark else value
+
+class _Unpacker:
+    """A packed section's numbers, floats and strings, as iterators in packing order.
+
+    Reading a value is a plain next(), and whole mappings and lists are
+    taken with islice. Only a section with floats in place of ints pays
+    for checking each number.
+    """
+
+    def __init__(self, data):
+        int_count, float_count, block_size, layout = _COUNTS.unpack_from(data, 1)
+        if layout & ~_MIXED >= len(_LAYOUTS):
+            raise SaveFormatError("Unknown layout in save section")
+        int_code, float_code = _LAYOUTS[layout & ~_MIXED]
+        int_size, float_size = _SIZES[int_code], _SIZES[float_code]
+        ints_start = 1 + _COUNTS.size
+        ints_end = ints_start + int_count * int_size
+        floats_end = ints_end + float_count * float_size
+        if floats_end + block_size != len(data):
+            raise SaveFormatError("Save section is truncated")
+        ints = _read_array(data[ints_start:ints_end], int_code)
+        self.real: Callable[[], float] = iter(_read_array(data[ints_end:floats_end], float_code)).__next__
+        if layout & _MIXED:
+            self.numbers = _resolve(ints, self.real, -2 ** (8 * int_size - 1))
+        else:
+            self.numbers = iter(ints)
+        self.strings = iter(bytes(data[floats_end:]).decode("utf-8").split("\0"))
+        self.number: Callable[[], int] = self.numbers.__next__
+        self.string: Callable[[], str] = self.strings.__next__
+
+    def symbol(self, known: Tuple[str, ...]) -> str:
+        index = self.number()
+        return self.string() if index < 0 else known[index]
+
+    def strings_list(self) -> List[str]:
+        return list(islice(self.strings, self.number()))
+
+    def mapping(self, known: Tuple[str, ...] = (), strings: bool = False) -> Dict:
+        """A dict of numbers (or strings), as written by _Packer.mapping."""
+        keys = known[:self.number()] + tuple(islice(self.strings, self.number()))
+        return dict(zip(keys, islice(self.strings if strings else self.numbers, len(keys))))
+
+def _read_array(view: memoryview, typecode: str) -> list:
+    if _SWAP:
+        values = array(typecode)
+        values.frombytes(view)
+        values.byteswap()
+        return values.tolist()
+    return view.cast(typecode).tolist()
+
+def _packed(pack: Callable[[_Packer], None], fallback) -> bytes:
+    """pack's section, or fallback() as JSON if the data does not fit the schema."""
+    packer = _Packer()
+    try:
+        pack(packer)
+        return packer.to_bytes()
+    except (_Unpackable, KeyError):
+        return bytes([_VERBATIM]) + _dumps(fallback())
+
+# Sections
+def _encode_header(player: Dict, story: Dict) -> bytes:
+    packable = (
+        all(key in player for key in HEADER_PLAYER_KEYS) and
+        all(key in story for key in HEADER_STORY_KEYS) and
+        isinstance(player["name"], str) and isinstance(player["major"], str) and
+        type(player["semester"]) is int and type(player["gpa"]) is float and
+        type(story["semester"]) is int and
+        (story["major_plot"] is None or isinstance(story["major_plot"], str)) and
+        -2**31 <= player["semester"] < 2**31 and -2**31 <= story["semester"] < 2**31
+    )
+    strings = [player["name"], player["major"]] if packable else []
+    if packable and story["major_plot"] is not None:
+        strings.append(story["major_plot"])
+    if not packable or any("\0" in string for string in strings):
+        return bytes([_VERBATIM]) + _dumps([_positional(player, HEADER_PLAYER_KEYS),
+                                            _positional(story, HEADER_STORY_KEYS)])
+    return (_HEADER_NUMBERS.pack(_PACKED, player["semester"], player["gpa"], story["semester"]) +
+            "\0".join(strings).encode("utf-8"))
+
+def _decode_header(data) -> Dict:
+    if data[0] == _VERBATIM:
+        player_values, story_values = json.loads(bytes(data[1:]))
+        player, story = {}, {}
+        _from_positional(player_values, HEADER_PLAYER_KEYS, player)
+        _from_positional(story_values, HEADER_STORY_KEYS, story)
+        return {"player": player, "story_progress": story}
+    _, semester, gpa, story_semester = _HEADER_NUMBERS.unpack_from(data, 0)
+    strings = bytes(data[_HEADER_NUMBERS.size:]).decode("utf-8").split("\0")
+    if not 2 <= len(strings) <= 3:
+        raise SaveFormatError("Save header is damaged")
+    return {
+        "player": {"name": strings[0], "major": strings[1], "semester": semester, "gpa": gpa},
+        "story_progress": {"semester": story_semester,
+                           "major_plot": strings[2] if len(strings) == 3 else None},
+    }
+
+def _encode_core(save_data: Dict, player: Dict) -> bytes:
+    def pack(p: _Packer):
+        for key in ("energy", "max_energy", "credits", "money", "stress_level"):
+            p.number(player[key])
+        p.symbol(player["mental_state"], MENTAL_STATES)
+        p.strings_list(player["skills"])
+        p.mapping(player["relationships"], p.number)
+        job = player["job"]
+        p.flag(job is not None)
+        if job is not None:
+            p.check(job, JOB_KEYS)
+            p.string(job["title"])
+            p.number(job["hourly_rate"])
+        p.strings_list(player["extracurriculars"])
+        p.mapping(player["stats"], p.number, STAT_KEYS)
+        p.mapping(player["skill_levels"], p.number, SKILL_KEYS)
+        p.string(save_data["current_time"])
+        p.symbol(save_data["current_weather"], WEATHERS)
+        clock = save_data["clock"]
+        p.check(clock, CLOCK_KEYS)
+        p.number(clock["minutes"])
+        p.count(clock["events"], list)
+        for event in clock["events"]:
+            # Only argument-free events (all the game schedules) are packed
+            if type(event) is not list or len(event) != 3 or event[2] != []:
+                raise _Unpackable
+            p.number(event[0])
+            p.string(event[1])
+
+    return _packed(pack, lambda: {"player": {key: player[key] for key in CORE_PLAYER_KEYS if key in player},
+                                  "top": {key: save_data[key] for key in CORE_TOP_KEYS if key in save_data}})
+
+def _decode_core(u: _Unpacker) -> Dict:
+    number, string = u.number, u.string
+    player = {"energy": number(), "max_energy": number(), "credits": number(), "money": number(),
+              "stress_level": number(), "mental_state": u.symbol(MENTAL_STATES),
+              "skills": u.strings_list(), "relationships": u.mapping()}
+    player["job"] = {"title": string(), "hourly_rate": number()} if number() else None
+    player["extracurriculars"] = u.strings_list()
+    player["stats"] = u.mapping(STAT_KEYS)
+    player["skill_levels"] = u.mapping(SKILL_KEYS)
+    top = {"current_time": string(), "current_weather": u.symbol(WEATHERS)}
+    minutes = number()
+    top["clock"] = {"minutes": minutes, "events": [[number(), string(), []] for _ in range(number())]}
+    return {"player": player, "top": top}
+
+def _encode_courses(courses: list, p: _Packer):
+    for course in p.records(courses, COURSE_KEYS):
+        p.string(course["name"])
+        p.number(course["credits"])
+        p.number(course["difficulty"])
+        for assignment in p.records(course["assignments"], ASSIGNMENT_KEYS):
+            p.string(assignment["name"])
+            p.real(assignment["weight"])
+            p.real(assignment["grade"])
+        p.real(course["midterm_grade"])
+        p.real(course["final_grade"])
+        p.number(course["attendance"])
+        p.real(course["participation"])
+
+def _decode_courses(u: _Unpacker) -> list:
+    number, real, string = u.number, u.real, u.string
+    return [{"name": string(), "credits": number(), "difficulty": number(),
+             "assignments": [{"name": string(), "weight": real(), "grade": real()}
+                             for _ in range(number())],
+             "midterm_grade": real(), "final_grade": real(), "attendance": number(),
+             "participation": real()}
+            for _ in range(number())]
+
+def _encode_inventory(inventory: list, p: _Packer):
+    # Each item is its index in a table of distinct items; an index one
+    # past the end of the table so far is followed by the new item
+    table: Dict[tuple, int] = {}
+    for item in p.records(inventory, ITEM_KEYS):
+        key = (item["name"], item["type"], type(item["value"]), item["value"])
+        index = table.get(key)
+        if index is None:
+            index = table[key] = len(table)
+            p.number(index)
+            p.string(item["name"])
+            p.string(item["type"])
+            p.number(item["value"])
+        else:
+            p.number(index)
+
+def _decode_inventory(u: _Unpacker) -> list:
+    number, string = u.number, u.string
+    table: List[Dict] = []
+    inventory = []
+    for _ in range(number()):
+        index = number()
+        if index == len(table):
+            table.append({"name": string(), "type": string(), "value": number()})
+        inventory.append(dict(table[index]))
+    return inventory
+
+def _encode_research(projects: list, p: _Packer):
+    for project in p.records(projects, PROJECT_KEYS):
+        p.string(project["name"])
+        p.number(project["difficulty"])
+        p.number(project["duration"])
+        p.number(project["progress"])
+        p.flag(project["completed"])
+
+def _decode_research(u: _Unpacker) -> list:
+    number, string = u.number, u.string
+    return [{"name": string(), "difficulty": number(), "duration": number(),
+             "progress": number(), "completed": bool(number())}
+            for _ in range(number())]
+
+def _encode_list(player: Dict, key: str, encode: Callable[[list, _Packer], None]) -> bytes:
+    if key not in player:
+        return bytes([_ABSENT])
+    if player[key] == []:
+        return bytes([_EMPTY])
+    return _packed(lambda p: encode(player[key], p), lambda: player[key])
+
+def _encode_story(story: Optional[Dict]) -> bytes:
+    if story is None:
+        return bytes([_ABSENT])
+
+    def pack(p: _Packer):
+        p.mapping(story["story_arcs"], p.number, ARC_KEYS)
+        p.mapping(story["relationships"], p.number)
+        p.mapping(story["key_decisions"], p.string)
+        p.number(story["global_awareness"])
+        p.strings_list(story["achievements"])
+
+    return _packed(pack, lambda: {key: story[key] for key in STORY_KEYS if key in story})
+
+def _decode_story(u: _Unpacker) -> Dict:
+    return {"story_arcs": u.mapping(ARC_KEYS), "relationships": u.mapping(),
+            "key_decisions": u.mapping(strings=True), "global_awareness": u.number(),
+            "achievements": u.strings_list()}
+
+def _encode_extra(save_data: Dict, player: Dict, story: Optional[Dict]) -> bytes:
+    """Everything the other sections do not store, as JSON."""
+    extra = _remaining(save_data, ("player", "story_progress") + CORE_TOP_KEYS)
+    player_rest = _remaining(player, HEADER_PLAYER_KEYS + CORE_PLAYER_KEYS + tuple(LIST_SECTIONS.values()))
+    if player_rest:
+        extra["player"] = player_rest
+    story_rest = _remaining(story, HEADER_STORY_KEYS + STORY_KEYS) if story is not None else {}
+    if story_rest:
+        extra["story_progress"] = story_rest
+    return _dumps(extra)
+
+def _encode_sections(save_data: Dict) -> Dict[int, bytes]:
+    player = save_data["player"]
+    story = save_data.get("story_progress")
+    return {
+        HEADER: _encode_header(player, story or {}),
+        CORE: _encode_core(save_data, player),
+        COURSES: _encode_list(player, "courses", _encode_courses),
+        INVENTORY: _encode_list(player, "inventory", _encode_inventory),
+        RESEARCH: _encode_list(player, "research_projects", _encode_research),
+        STORY: _encode_story(story),
+        EXTRA: _encode_extra(save_data, player, story),
+    }
+
+def encode_save(save_data: Dict) -> bytes:
+    sections = _encode_sections(save_data)
+    out = bytearray(_PREAMBLE.pack(MAGIC, VERSION, len(sections)))
+    offset = _PREAMBLE.size + _ENTRY.size * len(sections)
+    for section_id, payload in sections.items():
+        out += _ENTRY.pack(section_id, offset, len(payload))
+        offset += len(payload)
+    for payload in sections.values():
+        out += payload
+    return bytes(out)
+
+_DECODERS = {CORE: _decode_core, COURSES: _decode_courses, INVENTORY: _decode_inventory,
+             RESEARCH: _decode_research, STORY: _decode_story}
+
+def _decode_section(section_id: int, payload) -> Dict:
+    if section_id == HEADER:
+        return _decode_header(payload)
+    if section_id == EXTRA:
+        return {} if payload == b"{}" else json.loads(bytes(payload))
+    mode = payload[0]
+    if mode == _PACKED:
+        value = _DECODERS[section_id](_Unpacker(payload))
+    elif mode == _VERBATIM:
+        value = json.loads(bytes(payload[1:]))
+    elif mode == _EMPTY and section_id in LIST_SECTIONS:
+        value = []
+    elif mode == _ABSENT and section_id in (STORY, *LIST_SECTIONS):
+        return {"present": False} if section_id == STORY else {}
+    else:
+        raise SaveFormatError(f"Bad mode {mode} for save section {section_id}")
+    if section_id in LIST_SECTIONS:
+        return {LIST_SECTIONS[section_id]: value}
+    if section_id == STORY:
+        return {"present": True, "story_progress": value}
+    return value
+
+class SaveReader:
+    """Decodes sections of a binary save on first access only.
+
+    Damage found while decoding, truncation included, raises SaveFormatError.
+    """
+
+    def __init__(self, data: bytes):
+        if len(data) < _PREAMBLE.size:
+            raise SaveFormatError("Save file is truncated")
+        magic, version, count = _PREAMBLE.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise SaveFormatError("Not a binary save file")
+        if version != VERSION:
+            raise SaveFormatError(f"Save format version {version} is not supported (expected {VERSION})")
+        if len(data) < _PREAMBLE.size + count * _ENTRY.size:
+            raise SaveFormatError("Save file is truncated")
+        self.version = version
+        self.data = memoryview(data)
+        entries = self.data[_PREAMBLE.size:_PREAMBLE.size + count * _ENTRY.size]
+        self._table: Dict[int, Tuple[int, int]] = {
+            section_id: (offset, length) for section_id, offset, length in _ENTRY.iter_unpack(entries)}
+        self._decoded: Dict[int, Dict] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'SaveReader':
+        with open(path, 'rb') as f:
+            return cls(f.read())
+
+    def section(self, name: str) -> Dict:
+        section_id = SECTION_IDS[name]
+        decoded = self._decoded.get(section_id)
+        if decoded is None:
+            if section_id not in self._table:
+                raise SaveFormatError(f"Save has no section {section_id}")
+            offset, length = self._table[section_id]
+            if length == 0 or offset + length > len(self.data):
+                raise SaveFormatError("Save file is truncated")
+            try:
+                decoded = _decode_section(section_id, self.data[offset:offset + length])
+            except SaveFormatError:
+                raise
+            except (struct.error, IndexError, KeyError, TypeError, ValueError, StopIteration) as e:
+                raise SaveFormatError(f"Save section '{name}' is damaged: {e!r}") from e
+            self._decoded[section_id] = decoded
+        return decoded
+
+    def header(self) -> Dict:
+        """name, major, semester, gpa and the story's semester/major_plot."""
+        return self.section("header")
+
+    def player(self) -> Dict:
+        """The Student.to_dict() layout: every section holding player fields."""
+        player = dict(self.header()["player"])
+        player.update(self.section("core")["player"])
+        player.update(self.section("courses"))
+        player.update(self.section("inventory"))
+        player.update(self.section("research"))
+        player.update(self.section("extra").get("player", {}))
+        return player
+
+    def to_save_data(self) -> Dict:
+        """Everything, in the same shape save_game writes as JSON."""
+        save_data = {"player": self.player()}
+        save_data.update(self.section("core")["top"])
+        extra = dict(self.section("extra"))
+        extra.pop("player", None)
+        story = self.section("story")
+        if story["present"]:
+            story_progress = dict(self.header()["story_progress"])
+            story_progress.update(story["story_progress"])
+            story_progress.update(extra.pop("story_progress", {}))
+            save_data["story_progress"] = story_progress
+        save_data.update(extra)
+        return save_data
+
+def decode_save(data: bytes) -> Dict:
+    return SaveReader(data).to_save_data()
+
+def write_save(path: str, save_data: Dict):
+    with open(path, 'wb') as f:
+        f.write(encode_save(save_data))
+
+def read_save(path: str) -> Dict:
+    return SaveReader.open(path).to_save_data()
+
+# Bulk conversion
+def convert_saves(directory: str = ".", to_format: str = "binary",
+                  remove_source: bool = False) -> List[str]:
+    """Export every save_*.json slot in directory to .sav, or import .sav files as slots.
+
+    Exports replay the slot's journal first, so the .sav holds the latest
+    state. Imported slots are recorded in the directory's SaveManifest so
+    load_game lists them; exported slots removed with remove_source are
+    dropped from it. Returns the paths written.
+    """
+    from save_store import SaveJournal, SaveManifest
+
+    manifest = SaveManifest(directory)
+
+    source_ext, target_ext = (".json", ".sav") if to_format == "binary" else (".sav", ".json")
+    written = []
+    for filename in sorted(os.listdir(directory)):
+        if not (filename.startswith("save_") and filename.endswith(source_ext)):
+            continue
+        source = os.path.join(directory, filename)
+        target = source[:-len(source_ext)] + target_ext
+        if to_format == "binary":
+            journal = SaveJournal(source)
+            write_save(target, journal.load())
+            if remove_source:
+                os.remove(source)
+                if os.path.exists(journal.journal_path):
+                    os.remove(journal.journal_path)
+                manifest.remove(filename)
+        else:
+            save_data = read_save(source)
+            # Also empties any journal left over from an earlier slot of the same name
+            SaveJournal(target).write_snapshot(save_data)
+            manifest.record(os.path.basename(target), save_data)
+            if remove_source:
+                os.remove(source)
+        written.append(target)
+    return written
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export save slots to binary .sav files or import them back.")
+    parser.add_argument("directory", nargs="?", default=".")
+    parser.add_argument("--to", choices=["binary", "json"], default="binary")
+    parser.add_argument("--remove-source", action="store_true")
+    args = parser.parse_args()
+    for path in convert_saves(args.directory, args.to, args.remove_source):
+        print(path)
@@ -0,0 +1,399 @@
+"""Save-file storage for the University Life Simulator.
+
+A save slot is a full JSON snapshot (the same save_<name>.json layout
+save_game has always written) plus an append-only journal next to it
+holding only what changed since. Every snapshot_every journal entries the
+snapshot is rewritten and the journal truncated, so each save costs disk
+writes proportional to what changed, and loading replays at most
+snapshot_every small entries on top of the snapshot.
+
+SaveManifest indexes every slot in a directory (player name, major,
+semester, GPA, save time and committed journal length) so the save picker
+never has to list the directory or open the saves themselves.
+
+All file writes go through a writer: DirectWriter writes immediately,
+BackgroundWriter hands them to a thread so the game loop never waits on
+the disk. Full rewrites always land through a temp file and os.replace,
+so a crash leaves either the old file or the new one, never half of each.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+Path = Tuple[str, ...]
+
+def flatten(data: Dict, prefix: Path = ()) -> Iterator[Tuple[Path, object]]:
+    """Yield (path, leaf) pairs; dicts are descended into, everything else is a leaf."""
+    for key, value in data.items():
+        path = prefix + (key,)
+        if isinstance(value, dict) and value:
+            yield from flatten(value, path)
+        else:
+            yield path, value
+
+def set_path(data: Dict, path: List[str], value):
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    data[path[-1]] = value
+
+def delete_path(data: Dict, path: List[str]):
+    for key in path[:-1]:
+        data = data.get(key)
+        if not isinstance(data, dict):
+            return
+    data.pop(path[-1], None)
+
+class _PendingWrite:
+    """Everything queued for one file: an optional full rewrite, then appends."""
+    __slots__ = ("content", "appended")
+
+    def __init__(self):
+        self.content: Optional[bytes] = None
+        self.appended = bytearray()
+
+def _write_files(pending: Dict[str, _PendingWrite], sync: bool = True):
+    """Apply pending writes in order with one fsync per touched file.
+
+    Rewrites go to path.tmp and are renamed into place only after every
+    file in the batch has been synced.
+    """
+    opened = []
+    for path, write in pending.items():
+        if write.content is None:
+            f = open(path, 'ab')
+            f.write(write.appended)
+            opened.append((f, None, path))
+        else:
+            temp_path = path + ".tmp"
+            f = open(temp_path, 'wb')
+            f.write(write.content)
+            f.write(write.appended)
+            opened.append((f, temp_path, path))
+    directories = set()
+    for f, temp_path, path in opened:
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+        f.close()
+        if temp_path is not None:
+            os.replace(temp_path, path)
+            directories.add(os.path.dirname(os.path.abspath(path)))
+    if sync and hasattr(os, "O_DIRECTORY"):
+        # Make the renames themselves durable
+        for directory in directories:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+class DirectWriter:
+    """Writes synchronously; used by tools and whenever no writer is given."""
+
+    def __init__(self, sync: bool = False):
+        self.sync = sync
+
+    def submit(self, path: str, data: bytes, append: bool = False):
+        write = _PendingWrite()
+        if append:
+            write.appended += data
+        else:
+            write.content = data
+        _write_files({path: write}, self.sync)
+
+    def flush(self, *paths: str):
+        pass
+
+class BackgroundWriter:
+    """Writes files on a daemon thread, coalescing what piles up in between.
+
+    A full rewrite of a path drops anything still queued for it, and appends
+    to the same path are joined into one write, so saving the same slot
+    repeatedly costs one disk write per batch. Files are written in the
+    order their rewrites were last submitted (an append keeps a queued
+    write where it is): callers that must not leave a newer file next to an
+    older one on a crash submit the dependent file first. Each
+    batch is fsynced once; flush() waits for everything submitted so far
+    and runs automatically at interpreter exit.
+    """
+
+    def __init__(self, batch_delay: float = 0.05, sync: bool = True):
+        self.batch_delay = batch_delay
+        self.sync = sync
+        self._pending: Dict[str, _PendingWrite] = {}
+        self._cond = threading.Condition()
+        self._busy = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self.batches = 0
+        self.coalesced = 0  # Submissions absorbed into an already queued write
+        atexit.register(self.close)
+
+    def submit(self, path: str, data: bytes, append: bool = False):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Save writer is closed")
+            write = self._pending.get(path)
+            if write is None:
+                write = self._pending[path] = _PendingWrite()
+            else:
+                self.coalesced += 1
+            if append:
+                # Stays in place: a journal emptied before a snapshot rewrite must
+                # still be renamed before the snapshot after a delta is added
+                write.appended += data
+            else:
+                write.content = data
+                write.appended = bytearray()
+                # Moved to the end so it is written after earlier submissions
+                self._pending[path] = self._pending.pop(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+            # Let a burst of saves pile up so they share one write and fsync
+            time.sleep(self.batch_delay)
+            with self._cond:
+                pending, self._pending = self._pending, {}
+                self._busy = True
+            try:
+                _write_files(pending, self.sync)
+            except OSError:
+                logging.exception("Background save failed for %s", ", ".join(pending))
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self.batches += 1
+                    self._cond.notify_all()
+
+    def flush(self, *paths: str):
+        """Wait until the given paths (by default, everything) are on disk."""
+        with self._cond:
+            while self._busy or (any(path in self._pending for path in paths) if paths
+                                 else self._pending):
+                if self._thread is None or not self._thread.is_alive():
+                    break
+                self._cond.wait()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self.flush()
+        if self._thread is not None:
+            self._thread.join()
+
+_background_writer: Optional[BackgroundWriter] = None
+
+def background_writer() -> BackgroundWriter:
+    """The process-wide writer the game saves through."""
+    global _background_writer
+    if _background_writer is None:
+        _background_writer = BackgroundWriter()
+    return _background_writer
+
+class SaveJournal:
+    def __init__(self, snapshot_path: str, snapshot_every: int = 20, writer=None):
+        self.snapshot_path = snapshot_path
+        self.writer = writer or DirectWriter()
+        self.journal_path = os.path.splitext(snapshot_path)[0] + ".journal"
+        self.snapshot_every = snapshot_every
+        self._last: Optional[Dict[Path, str]] = None  # path -> JSON text as last persisted
+        self._entries = 0
+        self._seq = 0
+        self.offset = 0  # bytes of journal covered by the last save
+
+    @staticmethod
+    def _encode(save_data: Dict) -> Dict[Path, str]:
+        return {path: json.dumps(value) for path, value in flatten(save_data)}
+
+    def save(self, save_data: Dict, reason: Optional[str] = None) -> str:
+        """Persist save_data; returns "snapshot", "delta" or "unchanged"."""
+        encoded = self._encode(save_data)
+        if self._last is None or self._entries >= self.snapshot_every:
+            self.write_snapshot(save_data)
+            self._last = encoded
+            return "snapshot"
+
+        changed = [(path, text) for path, text in encoded.items() if self._last.get(path) != text]
+        removed = [path for path in self._last if path not in encoded]
+        if not changed and not removed:
+            return "unchanged"
+
+        self._seq += 1
+        line = '{"seq": %d, "reason": %s, "set": [%s], "del": %s}\n' % (
+            self._seq,
+            json.dumps(reason),
+            ", ".join(f"[{json.dumps(list(path))}, {text}]" for path, text in changed),
+            json.dumps([list(path) for path in removed]),
+        )
+        data = line.encode()
+        self.writer.submit(self.journal_path, data, append=True)
+        self.offset += len(data)
+        self._entries += 1
+        self._last = encoded
+        return "delta"
+
+    def write_snapshot(self, save_data: Dict):
+        data = json.dumps(save_data).encode()
+        # The snapshot covers everything the journal held. Emptying the journal
+        # first means a crash in between leaves an older save, not stale deltas
+        # replayed over a newer snapshot.
+        self.writer.submit(self.journal_path, b"")
+        self.writer.submit(self.snapshot_path, data)
+        self._entries = 0
+        self.offset = 0
+
+    def load(self, offset: Optional[int] = None) -> Dict:
+        """Latest snapshot with the journal replayed on top; primes this journal.
+
+        offset limits replay to the journal bytes known to be complete, as
+        recorded in the manifest; without it the whole journal is read.
+        Whatever follows the replayed entries (a torn line, or entries past
+        offset) is cut off, so the next delta is appended to a clean end.
+        """
+        self.writer.flush(self.snapshot_path, self.journal_path)
+        with open(self.snapshot_path, 'r') as f:
+            save_data = json.load(f)
+        entries = 0
+        consumed = 0
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'rb') as f:
+                journal = f.read()
+            replayable = journal if offset is None else journal[:offset]
+            for line in replayable.splitlines(keepends=True):
+                if not line.endswith(b"\n"):
+                    break  # Torn final line from an interrupted write
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                # Deletions first: a leaf that became a dict shows up in both lists
+                for path in entry["del"]:
+                    delete_path(save_data, path)
+                for path, value in entry["set"]:
+                    set_path(save_data, path, value)
+                self._seq = entry["seq"]
+                entries += 1
+                consumed += len(line)
+            if consumed < len(journal):
+                self.writer.submit(self.journal_path, journal[:consumed])
+        self._last = self._encode(save_data)
+        self._entries = entries
+        self.offset = consumed
+        return save_data
+
+class SlotInfo(NamedTuple):
+    slot: str
+    name: str
+    major: str
+    semester: int
+    gpa: float
+    mtime: float
+    offset: int
+
+    def describe(self) -> str:
+        saved = time.strftime("%Y-%m-%d %H:%M", time.localtime(self.mtime))
+        return (f"{self.name} ({self.major}) - Semester {self.semester}, "
+                f"GPA {self.gpa:.2f}, saved {saved}")
+
+class SaveManifest:
+    """Append-only index of save slots: the last record per slot wins.
+
+    Each save appends one short JSON line, so keeping the index current
+    never rewrites it; compact() drops superseded lines once they make up
+    most of the file.
+    """
+
+    FILENAME = "saves_manifest.jsonl"
+
+    def __init__(self, directory: str = ".", writer=None):
+        self.path = os.path.join(directory, self.FILENAME)
+        self.directory = directory
+        self.writer = writer or DirectWriter()
+        self._slots: Optional[Dict[str, SlotInfo]] = None
+        self._lines = 0
+
+    def slots(self) -> List[SlotInfo]:
+        """Slots sorted by most recently saved first."""
+        return sorted(self._read().values(), key=lambda info: info.mtime, reverse=True)
+
+    def get(self, slot: str) -> Optional[SlotInfo]:
+        return self._read().get(slot)
+
+    def _read(self) -> Dict[str, SlotInfo]:
+        if self._slots is None:
+            self.writer.flush(self.path)
+            self._slots = {}
+            self._lines = 0
+            if not os.path.exists(self.path):
+                self.rebuild()
+            else:
+                with open(self.path, 'r') as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._lines += 1
+                        if record.get("deleted"):
+                            self._slots.pop(record["slot"], None)
+                        else:
+                            self._slots[record["slot"]] = SlotInfo(**record)
+        return self._slots
+
+    def record(self, slot: str, save_data: Dict, offset: int = 0,
+               mtime: Optional[float] = None):
+        player = save_data["player"]
+        info = SlotInfo(slot, player["name"], player["major"], player["semester"],
+                        round(player["gpa"], 4), mtime or time.time(), offset)
+        # Load the index before queueing the append, so reading it never waits on the writer
+        slots = self._read()
+        self._append(info._asdict())
+        slots[slot] = info
+        self.compact()
+
+    def remove(self, slot: str):
+        slots = self._read()
+        self._append({"slot": slot, "deleted": True})
+        slots.pop(slot, None)
+
+    def _append(self, record: Dict):
+        self.writer.submit(self.path, (json.dumps(record) + "\n").encode(), append=True)
+        self._lines += 1
+
+    def compact(self, min_lines: int = 1000):
+        slots = self._read()
+        if self._lines < min_lines or self._lines < 2 * len(slots):
+            return
+        data = "".join(json.dumps(info._asdict()) + "\n" for info in slots.values())
+        self.writer.submit(self.path, data.encode())
+        self._lines = len(slots)
+
+    def rebuild(self):
+        """One-off migration: index existing save_*.json files by reading them."""
+        self._slots = {}
+        self._lines = 0
+        self.writer.submit(self.path, b"")
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith("save_") and filename.endswith(".json")):
+                continue
+            journal = SaveJournal(os.path.join(self.directory, filename), writer=self.writer)
+            try:
+                save_data = journal.load()
+                mtime = os.path.getmtime(journal.snapshot_path)
+            except (OSError, ValueError, KeyError):
+                continue
+            self.record(filename, save_data, journal.offset, mtime)
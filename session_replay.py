@@ -0,0 +1,356 @@
+"""Record games as (seed, answers) and replay them headlessly to catch behaviour changes.
+
+A recording holds the rng seed, every answer the player gave to the
+DecisionPolicy (menu choices, typed numbers and text, character
+creation) and a hash of the game state after each completed step. Since
+every random draw comes from the simulator's rng, the seed and answers
+are enough to re-run the game exactly: replay() feeds the answers back
+through ScriptedPolicy with no console I/O and compares each step's
+state with the recorded hash, so after a change to an event handler
+(first_major_assignment, academic_challenge, ...) it reports the first
+step at which a recorded session goes another way.
+
+Recordings are JSON, one per .json file or one per line of a .jsonl
+file. session_server writes one per session with --record-dir; the
+"record" command records a console game and "generate" a corpus of
+RandomPolicy games. "replay" checks a whole corpus across all cores:
+
+    python session_replay.py replay recordings/ --processes 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from ProjectTest import (ConsolePolicy, DecisionPolicy, RandomPolicy, UniversityLifeSimulator,
+                         discard_output, get_logger)
+
+RECORDING_VERSION = 1
+
+class ReplayDiverged(Exception):
+    """The replayed game asked for something other than the next recorded answer."""
+
+class RecordingPolicy(DecisionPolicy):
+    """Passes every decision to inner and records the answer.
+
+    Answers are [method, value] pairs. When inner raises ValueError (the
+    console's ask_number on text that is not a number) the entry is just
+    [method], and ScriptedPolicy raises ValueError there too.
+    """
+
+    def __init__(self, inner: DecisionPolicy):
+        self.inner = inner
+        self.answers: List[list] = []
+
+    def truncate(self, length: int):
+        """Forget answers after the first length (from a step that is being re-run)."""
+        del self.answers[length:]
+
+    def _record(self, method: str, *args):
+        try:
+            value = getattr(self.inner, method)(*args)
+        except ValueError:
+            self.answers.append([method])
+            raise
+        self.answers.append([method, list(value) if isinstance(value, tuple) else value])
+        return value
+
+    def choose(self, options: List[str]) -> int:
+        return self._record("choose", options)
+
+    def confirm(self, prompt: str) -> bool:
+        return self._record("confirm", prompt)
+
+    def ask_text(self, prompt: str) -> str:
+        return self._record("ask_text", prompt)
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        return self._record("ask_number", prompt, low, high, kind)
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        return self._record("create_character", majors, difficulties)
+
+class ScriptedPolicy(DecisionPolicy):
+    """Gives back recorded answers in order; raises ReplayDiverged as soon as they stop fitting."""
+
+    def __init__(self, answers: Sequence[list]):
+        self.answers = answers
+        self.position = 0
+
+    @property
+    def remaining(self) -> int:
+        return len(self.answers) - self.position
+
+    def _next(self, method: str):
+        index = self.position
+        if index >= len(self.answers):
+            raise ReplayDiverged(f"the game asked for {method} after all {index} recorded answers")
+        entry = self.answers[index]
+        if entry[0] != method:
+            raise ReplayDiverged(f"answer {index} was recorded for {entry[0]} but the game asked for {method}")
+        self.position += 1
+        if len(entry) == 1:
+            raise ValueError(f"recorded invalid answer {index}")
+        return entry[1]
+
+    def _check_choice(self, choice: int, count: int, method: str) -> int:
+        if not 1 <= choice <= count:
+            raise ReplayDiverged(f"answer {self.position - 1} chose {choice} from a {method} "
+                                 f"of {count} options")
+        return choice
+
+    def choose(self, options: List[str]) -> int:
+        return self._check_choice(self._next("choose"), len(options), "menu")
+
+    def confirm(self, prompt: str) -> bool:
+        return self._next("confirm")
+
+    def ask_text(self, prompt: str) -> str:
+        return self._next("ask_text")
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        return self._next("ask_number")
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        name, major_choice, diff_choice = self._next("create_character")
+        self._check_choice(major_choice, len(majors), "major list")
+        self._check_choice(diff_choice, len(difficulties), "difficulty list")
+        return name, major_choice, diff_choice
+
+def state_hash(sim: UniversityLifeSimulator) -> str:
+    """Short digest of everything a step can change, rng included."""
+    state = {
+        # No player exists until character creation, only the clock and weather
+        "save_data": sim.build_save_data() if sim.player is not None else None,
+        "clock": sim.clock.to_dict(),
+        "current_weather": sim.current_weather.value,
+        "rng": sim.rng.getstate(),
+    }
+    encoded = json.dumps(state, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+class SessionRecorder:
+    """Collects one game's recording as its steps complete.
+
+    Wraps the player's policy in a RecordingPolicy; the simulator must use
+    recorder.policy and be seeded with recorder.seed. Call step_done after
+    each step and abandon_step when a step is cut short and will be re-run
+    (or never finished), so its partial answers are dropped.
+    """
+
+    def __init__(self, policy: DecisionPolicy, seed: int, offer_load: bool = True):
+        self.policy = RecordingPolicy(policy)
+        self.seed = seed
+        self.offer_load = offer_load  # As passed to game_steps
+        self.step_hashes: List[str] = []
+        self.error: Optional[str] = None
+        # A game that loads a save depends on that file, not just on seed and answers
+        self.replayable = True
+        self._mark = 0
+
+    def abandon_step(self):
+        self.policy.truncate(self._mark)
+
+    def step_done(self, sim: UniversityLifeSimulator, label: str, result):
+        if label == "offer_load_game" and result:
+            self.replayable = False
+        self.step_hashes.append(state_hash(sim))
+        self._mark = len(self.policy.answers)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": RECORDING_VERSION,
+            "seed": self.seed,
+            "offer_load": self.offer_load,
+            "answers": self.policy.answers,
+            "step_hashes": self.step_hashes,
+            "error": self.error,
+            "replayable": self.replayable,
+        }
+
+def new_seed() -> int:
+    return random.SystemRandom().getrandbits(64)
+
+def record_game(policy: DecisionPolicy, seed: Optional[int] = None,
+                simulator_factory: Callable[..., UniversityLifeSimulator] = UniversityLifeSimulator,
+                output=discard_output) -> Dict:
+    """Play one game with policy and return its recording.
+
+    Quitting at a prompt (EOF or Ctrl-C) ends the recording at the last
+    completed step. Any other exception is recorded by type, and replay
+    expects the same one at the same step.
+    """
+    recorder = SessionRecorder(policy, new_seed() if seed is None else seed)
+    sim = simulator_factory(policy=recorder.policy, output=output, rng=random.Random(recorder.seed))
+    steps = sim.game_steps()
+    result = None
+    while True:
+        try:
+            label, step = steps.send(result)
+        except StopIteration:
+            break
+        start = sim.capture_state()
+        try:
+            result = step()
+        except (EOFError, KeyboardInterrupt):
+            sim.restore_state(start)
+            recorder.abandon_step()
+            break
+        except Exception as error:
+            get_logger().exception("Recorded game stopped at %s", label)
+            recorder.error = type(error).__name__
+            break
+        recorder.step_done(sim, label, result)
+    return recorder.to_dict()
+
+class ReplayResult(NamedTuple):
+    source: str
+    seed: int
+    steps: int
+    status: str  # "match", "diverged" or "skipped"
+    detail: str = ""
+
+def replay(recording: Dict, source: str = "",
+           simulator_factory: Callable[..., UniversityLifeSimulator] = UniversityLifeSimulator) -> ReplayResult:
+    """Re-run a recording headlessly and report whether it still plays out the same."""
+    expected = recording["step_hashes"]
+    error = recording.get("error")
+
+    def result(status: str, detail: str = "") -> ReplayResult:
+        return ReplayResult(source, recording["seed"], len(expected), status, detail)
+
+    if not recording.get("replayable", True):
+        return result("skipped", "the game loaded a saved game")
+    policy = ScriptedPolicy(recording["answers"])
+    sim = simulator_factory(policy=policy, output=discard_output, rng=random.Random(recording["seed"]))
+    steps = sim.game_steps(offer_load=recording.get("offer_load", True))
+    outcome = None
+    # The step that raised, if any, is run too, to check it still raises
+    for index in range(len(expected) + (error is not None)):
+        try:
+            label, step = steps.send(outcome)
+        except StopIteration:
+            return result("diverged", f"the game ended after {index} steps")
+        where = f"step {index + 1} ({label}, semester {sim.story_progress.semester})"
+        try:
+            outcome = step()
+        except ReplayDiverged as diverged:
+            return result("diverged", f"{where}: {diverged}")
+        except Exception as raised:
+            if index == len(expected) and type(raised).__name__ == error:
+                break
+            return result("diverged", f"{where} raised {raised!r}")
+        if index == len(expected):
+            return result("diverged", f"{where} completed but raised {error} when recorded")
+        if state_hash(sim) != expected[index]:
+            return result("diverged", f"{where}: state differs")
+    if policy.remaining:
+        return result("diverged", f"{policy.remaining} recorded answers were never asked for")
+    return result("match")
+
+def read_recordings(path: str) -> Iterator[tuple]:
+    """(source, recording) for a .json file, or each line of a .jsonl file."""
+    with open(path, 'r') as f:
+        if not path.endswith(".jsonl"):
+            yield path, json.load(f)
+            return
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield f"{path}:{number}", json.loads(line)
+
+def find_recordings(sources: Sequence[str]) -> List[str]:
+    """Recording files named in sources, with directories expanded to the files inside."""
+    paths = []
+    for source in sources:
+        if not os.path.isdir(source):
+            paths.append(source)
+            continue
+        for root, _, files in os.walk(source):
+            paths.extend(os.path.join(root, name) for name in sorted(files)
+                         if name.endswith((".json", ".jsonl")))
+    return paths
+
+def _replay_chunk(task) -> List[ReplayResult]:
+    recordings, simulator_factory = task
+    return [replay(recording, source, simulator_factory) for source, recording in recordings]
+
+def _chunks(sources: Sequence[str], size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for path in find_recordings(sources):
+        for entry in read_recordings(path):
+            chunk.append(entry)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def replay_corpus(sources: Sequence[str], processes: Optional[int] = None,
+                  simulator_factory: Callable[..., UniversityLifeSimulator] = UniversityLifeSimulator,
+                  chunk_size: int = 20) -> Iterator[ReplayResult]:
+    """Yield a ReplayResult per recording as workers finish them.
+
+    Recordings are read lazily and handed out chunk_size at a time, so a
+    corpus in one big .jsonl file spreads over every worker too.
+    simulator_factory must be picklable.
+    """
+    processes = processes or os.cpu_count() or 1
+    tasks = ((chunk, simulator_factory) for chunk in _chunks(sources, chunk_size))
+    if processes == 1:
+        for task in tasks:
+            yield from _replay_chunk(task)
+        return
+    with Pool(processes) as pool:
+        for results in pool.imap_unordered(_replay_chunk, tasks):
+            yield from results
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Record games and replay them as regression checks.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="play a console game and save its recording")
+    record.add_argument("--seed", type=int)
+    record.add_argument("--out", required=True)
+    generate = commands.add_parser("generate", help="record RandomPolicy games into a .jsonl file")
+    generate.add_argument("--runs", type=int, default=1000)
+    generate.add_argument("--seed", type=int, default=0)
+    generate.add_argument("--out", required=True)
+    check = commands.add_parser("replay", help="replay recordings and report the ones that diverge")
+    check.add_argument("sources", nargs="+", help=".json/.jsonl files or directories of them")
+    check.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        recording = record_game(ConsolePolicy(), args.seed, output=print)
+        with open(args.out, 'w') as f:
+            json.dump(recording, f)
+        print(f"Recorded {len(recording['step_hashes'])} steps to {args.out}")
+        return 0
+
+    if args.command == "generate":
+        from playthrough_farm import derive_seed
+        with open(args.out, 'w') as f:
+            for run_index in range(args.runs):
+                policy = RandomPolicy(derive_seed(args.seed, run_index, "policy"))
+                recording = record_game(policy, derive_seed(args.seed, run_index))
+                f.write(json.dumps(recording, separators=(",", ":")) + "\n")
+        print(f"Recorded {args.runs} games to {args.out}")
+        return 0
+
+    counts = {"match": 0, "diverged": 0, "skipped": 0}
+    diverged = []
+    for result in replay_corpus(args.sources, args.processes):
+        counts[result.status] += 1
+        if result.status == "diverged":
+            diverged.append(result)
+    for result in sorted(diverged):
+        print(f"DIVERGED {result.source} (seed {result.seed}): {result.detail}")
+    print(f"Replayed {sum(counts.values())} sessions: {counts['match']} match, "
+          f"{counts['diverged']} diverged, {counts['skipped']} skipped")
+    return 1 if diverged else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,542 @@
+"""Asyncio server hosting many University Life Simulator games in one process.
+
+Each connection gets a GameSession coroutine. The simulator itself stays
+synchronous: its prompts go through SessionPolicy, which answers from
+the lines the player has sent so far and raises AwaitingInput when it
+runs out. The session then rewinds the simulator to the start of the
+current game step (see UniversityLifeSimulator.game_steps), awaits the
+next line and runs the step again with one more answer. Because every
+random draw comes from the simulator's own rng, which is rewound too, the
+re-run takes the same path; output lines the player has already seen are
+not sent twice.
+
+Sessions idle at a prompt are hibernated to disk and dropped from memory
+(see GameSession.hibernate), either after idle_timeout or least recently
+active first once resident sessions exceed a memory budget; the next
+line from the player brings the session back transparently.
+
+The wire protocol is plain text lines: the server sends game output and
+prompts, and the client sends one answer per line.
+
+Players are anonymous, so sessions never offer to load a saved game: the
+save files in the server's directory belong to nobody in particular.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import types
+from collections import OrderedDict
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from ProjectTest import (Catalog, DecisionPolicy, EventRegistry, GameConfig, Item,
+                         UniversityLifeSimulator, Weather, get_logger)
+from event_log import NULL_EVENT_LOG, EventLog, NullEventLog
+from game_clock import GameClock
+from narrative import NarrativeGenerator, StubBackend
+from save_store import background_writer
+from session_replay import SessionRecorder, new_seed
+
+class AwaitingInput(Exception):
+    """Raised inside a step when the player has not answered the next prompt yet."""
+
+    def __init__(self, prompt: str):
+        super().__init__(prompt)
+        self.prompt = prompt
+
+class SessionPolicy(DecisionPolicy):
+    """Answers prompts from the lines received during the current step.
+
+    Invalid or out-of-range answers are consumed like valid ones and
+    followed by a message and the same prompt again, so a re-run replays
+    them identically.
+    """
+
+    CHOICE_PROMPT = "Enter the number of your choice: "
+
+    def __init__(self, output: Callable[[str], None]):
+        self.output = output
+        self.answers: List[str] = []
+        self.position = 0
+
+    def rewind(self, answers: List[str]):
+        self.answers = answers
+        self.position = 0
+
+    def _next(self, prompt: str) -> str:
+        if self.position >= len(self.answers):
+            raise AwaitingInput(prompt)
+        answer = self.answers[self.position]
+        self.position += 1
+        return answer
+
+    def _choice(self, count: int) -> int:
+        while True:
+            try:
+                choice = int(self._next(self.CHOICE_PROMPT))
+                if 1 <= choice <= count:
+                    return choice
+                self.output(f"Please enter a number between 1 and {count}")
+            except ValueError:
+                self.output("Please enter a valid number")
+
+    def choose(self, options: List[str]) -> int:
+        return self._choice(len(options))
+
+    def confirm(self, prompt: str) -> bool:
+        return self._next(prompt).strip().lower() == 'y'
+
+    def ask_text(self, prompt: str) -> str:
+        return self._next(prompt)
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        # Unlike the console, answers come from the network, so the range is enforced here
+        while True:
+            try:
+                value = kind(self._next(prompt))
+            except ValueError:
+                self.output("Please enter a valid number")
+                continue
+            if low <= value <= high:
+                return value
+            self.output(f"Please enter a number between {low:g} and {high:g}")
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        name = self._next("Enter your name: ").strip() or "Student"
+        self.output("\nChoose your major:")
+        for i, major in enumerate(majors, 1):
+            self.output(f"{i}. {major}")
+        major_choice = self._choice(len(majors))
+        self.output("\nChoose difficulty:")
+        for i, diff in enumerate(difficulties, 1):
+            self.output(f"{i}. {diff}")
+        diff_choice = self._choice(len(difficulties))
+        return name, major_choice, diff_choice
+
+Send = Callable[[str], Awaitable[None]]
+Receive = Callable[[], Awaitable[Optional[str]]]
+
+# Process-wide singletons every session points at; never part of one session's size
+SHARED_TYPES = (type, types.FunctionType, types.ModuleType, types.MethodType,
+                types.BuiltinFunctionType, GameConfig, Catalog, EventRegistry, Item,
+                EventLog, NullEventLog, NarrativeGenerator)
+
+def deep_sizeof(obj, seen: Optional[Set[int]] = None) -> int:
+    """Rough resident size of an object graph: sys.getsizeof over everything reachable.
+
+    Follows containers and instance attributes. Instances of SHARED_TYPES
+    (classes, functions, modules, the config and its tables, Item
+    flyweights, the event log and the narrative generator) are shared
+    between sessions and not counted.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, SHARED_TYPES):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif isinstance(obj, (str, bytes, int, float, bool, Enum)) or obj is None:
+        pass
+    else:
+        if hasattr(obj, "__dict__"):
+            size += deep_sizeof(vars(obj), seen)
+        for name in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, name):
+                size += deep_sizeof(getattr(obj, name), seen)
+    return size
+
+def simulator_size(sim: UniversityLifeSimulator) -> int:
+    """deep_sizeof(sim) without the config tables the simulator holds directly."""
+    shared = {id(sim.config), id(sim.scenarios), id(sim.research_projects)}
+    return deep_sizeof(sim, shared)
+
+class GameSession:
+    """One player's game, driven step by step from awaited input lines.
+
+    While it waits for input the simulator is already rewound to the start
+    of the current step, so hibernate() can write that state out (via
+    build_save_data, i.e. Student.to_dict and the story state, plus the rng)
+    and drop the whole simulator. The next line received brings it back
+    from disk before the step is re-run.
+
+    With record_path set, the seed, answers and per-step state hashes are
+    written there as a session_replay recording when the session ends.
+    """
+
+    def __init__(self, send: Send, receive: Receive, seed: Optional[int] = None,
+                 simulator_factory: Callable[..., UniversityLifeSimulator] = UniversityLifeSimulator,
+                 writer=None, event_log=NULL_EVENT_LOG, session_id=None,
+                 record_path: Optional[str] = None, narrator: Optional[NarrativeGenerator] = None):
+        self.send = send
+        self.receive = receive
+        self.simulator_factory = simulator_factory
+        self.writer = writer or background_writer()
+        self.event_log = event_log
+        self.session_id = session_id
+        self.narrator = narrator
+        self._outbox: List[str] = []
+        self._seen = 0  # Output lines of the current step already delivered
+        self._emitted = 0  # Output lines produced by the current attempt
+        self.policy = SessionPolicy(self._emit)
+        self.record_path = record_path
+        self.recorder: Optional[SessionRecorder] = None
+        if record_path is not None:
+            # A recording is only replayable from a known seed
+            seed = new_seed() if seed is None else seed
+            self.recorder = SessionRecorder(self.policy, seed, offer_load=False)
+        self.sim: Optional[UniversityLifeSimulator] = self._new_simulator(random.Random(seed))
+        self._steps = self.sim.game_steps(offer_load=False)
+        self.label: Optional[str] = None  # Label of the current step
+        self._step = None
+        self._start: Optional[Dict] = None  # capture_state() at the start of the current step
+        self.answers: List[str] = []
+        self.steps_done = 0
+        self.finished = False
+        self.waiting_since: Optional[float] = None  # monotonic time, while awaiting input
+        self.hibernated_path: Optional[str] = None
+        self.resident_size = 0
+        self.waits = 0  # Prompts waited on so far
+        # Set by the host to track idle and resident sessions
+        self.on_wait: Optional[Callable[['GameSession'], None]] = None
+        self.on_wake: Optional[Callable[['GameSession'], None]] = None
+
+    def _new_simulator(self, rng: random.Random) -> UniversityLifeSimulator:
+        policy = self.policy if self.recorder is None else self.recorder.policy
+        sim = self.simulator_factory(policy=policy, output=self._emit, rng=rng)
+        sim.event_log = self.event_log
+        sim.session_id = self.session_id
+        sim.narrator = self.narrator
+        # Steps run on the event loop, so narration that is not ready yet is skipped, never awaited
+        sim.narration_wait = 0
+        return sim
+
+    def _emit(self, text: str):
+        self._emitted += 1
+        if self._emitted > self._seen:
+            self._outbox.append(str(text))
+            self._seen = self._emitted
+
+    async def _deliver(self, prompt: Optional[str] = None):
+        lines = self._outbox
+        self._outbox = []
+        text = "".join(line + "\n" for line in lines)
+        if prompt is not None:
+            text += prompt
+        if text:
+            await self.send(text)
+
+    def hibernate(self, path: str):
+        """Write the waiting session to path and drop its simulator."""
+        if self.waiting_since is None or self.sim is None:
+            raise RuntimeError("Only a resident session waiting for input can hibernate")
+        record = {
+            "label": self.label,
+            "answers": self.answers,
+            "seen": self._seen,
+            "steps_done": self.steps_done,
+            # No player exists until character creation, only the clock and weather
+            "save_data": self.sim.build_save_data() if self.sim.player is not None else None,
+            "clock": self.sim.clock.to_dict(),
+            "current_weather": self.sim.current_weather.value,
+            "rng": self.sim.rng.getstate(),
+            # Narration already shown (or skipped) must come out the same when the step re-runs
+            "narrations": [[*key, text] for key, text in self.sim._narrations.items()],
+        }
+        self.writer.submit(path, json.dumps(record).encode())
+        self.sim = self._steps = self._step = self._start = None
+        self.hibernated_path = path
+        self.resident_size = 0
+        if self.event_log.enabled:
+            self.event_log.emit("hibernate", self.session_id, label=self.label, answers=len(self.answers))
+
+    def _read_hibernated(self, path: str) -> Dict:
+        # Waits for the writer's batch delay and fsync, so it runs off the event loop
+        self.writer.flush(path)
+        with open(path, 'r') as f:
+            record = json.load(f)
+        os.remove(path)
+        return record
+
+    async def _rehydrate(self):
+        record = await asyncio.to_thread(self._read_hibernated, self.hibernated_path)
+        version, internal, gauss_next = record["rng"]
+        rng = random.Random()
+        sim = self._new_simulator(rng)
+        if record["save_data"] is not None:
+            sim.apply_save_data(record["save_data"])
+        sim.clock = GameClock.from_dict(record["clock"])
+        sim.current_weather = Weather(record["current_weather"])
+        rng.setstate((version, tuple(internal), gauss_next))
+        self.sim = sim
+        self._steps = sim.game_steps(resume_at=record["label"])
+        self.label, self._step = next(self._steps)
+        # After next(): starting the step clears the memo the re-run needs
+        sim._narrations = {(milestone, choice, signature): text
+                           for milestone, choice, signature, text in record["narrations"]}
+        self._start = sim.capture_state()
+        self.answers = record["answers"]
+        self._seen = record["seen"]
+        self.steps_done = record["steps_done"]
+        self.hibernated_path = None
+        if self.event_log.enabled:
+            self.event_log.emit("rehydrate", self.session_id, label=self.label)
+
+    def discard(self):
+        """Drop any hibernation file; called when the session is over."""
+        if self.hibernated_path is not None:
+            self.writer.flush(self.hibernated_path)
+            if os.path.exists(self.hibernated_path):
+                os.remove(self.hibernated_path)
+            self.hibernated_path = None
+
+    async def run_step(self):
+        """Run the current step to completion, waiting for the player as often as it needs."""
+        self._start = self.sim.capture_state()
+        self.answers = []
+        self._seen = 0
+        while True:
+            self._emitted = 0
+            self.policy.rewind(self.answers)
+            if self.recorder is not None:
+                self.recorder.abandon_step()
+            try:
+                result = self._step()
+                break
+            except AwaitingInput as waiting:
+                prompt = waiting.prompt
+            # Nothing that references the simulator may stay alive across the await
+            self.sim.restore_state(self._start)
+            await self._deliver(prompt)
+            self.waiting_since = time.monotonic()
+            self.waits += 1
+            if self.on_wait:
+                self.on_wait(self)
+            line = await self.receive()
+            self.waiting_since = None
+            if line is None:
+                raise ConnectionError("Player disconnected")
+            if self.sim is None:
+                await self._rehydrate()
+            self.answers.append(line.rstrip("\r\n"))
+            if self.on_wake:
+                self.on_wake(self)
+        self._start = None
+        self.steps_done += 1
+        if self.recorder is not None:
+            self.recorder.step_done(self.sim, self.label, result)
+        await self._deliver()
+        return result
+
+    async def run(self):
+        result = None
+        if self.event_log.enabled:
+            self.event_log.emit("session_start", self.session_id)
+        try:
+            while True:
+                try:
+                    self.label, self._step = self._steps.send(result)
+                except StopIteration:
+                    break
+                # Output from between steps (e.g. the welcome banner) is never replayed
+                self._seen = self._emitted = 0
+                await self._deliver()
+                result = await self.run_step()
+            self.finished = True
+        except ConnectionError:
+            get_logger().info("Session ended by the player after %d steps", self.steps_done)
+        except Exception as error:
+            if self.recorder is not None:
+                self.recorder.error = type(error).__name__
+            raise
+        finally:
+            self.discard()
+            if self.recorder is not None:
+                if self.recorder.error is None:
+                    self.recorder.abandon_step()
+                self.writer.submit(self.record_path, json.dumps(self.recorder.to_dict()).encode())
+            if self.event_log.enabled:
+                self.event_log.emit("session_end", self.session_id, finished=self.finished,
+                                    steps=self.steps_done)
+
+class SessionServer:
+    """Line-protocol TCP server; every connection plays its own game.
+
+    Sessions waiting for input longer than idle_timeout seconds are
+    hibernated to hibernate_dir. When memory_budget (bytes, as measured by
+    simulator_size) is set, the least recently active waiting sessions are
+    hibernated as soon as the resident ones exceed it. Session and step
+    events go to event_log (event_log.EventLog), tagged with the session id.
+    With record_dir set, every session is recorded there for session_replay.
+    One narrator (narrative.NarrativeGenerator), if given, serves every
+    session, so they share its cache.
+    """
+
+    SIZE_REFRESH = 20  # Re-measure a resident session every this many prompts
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8023, seed: Optional[int] = None,
+                 simulator_factory: Callable[..., UniversityLifeSimulator] = UniversityLifeSimulator,
+                 backlog: int = 1024, idle_timeout: Optional[float] = 300.0,
+                 memory_budget: Optional[int] = None, hibernate_dir: str = "hibernated_sessions",
+                 sweep_interval: float = 5.0, event_log=NULL_EVENT_LOG,
+                 record_dir: Optional[str] = None, narrator: Optional[NarrativeGenerator] = None):
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self.simulator_factory = simulator_factory
+        # asyncio's default of 100 drops connects while a burst of sessions is being set up
+        self.backlog = backlog
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self.hibernate_dir = hibernate_dir
+        self.sweep_interval = sweep_interval
+        self.event_log = event_log
+        self.record_dir = record_dir
+        self.narrator = narrator
+        self.sessions: Dict[int, GameSession] = {}
+        # Resident sessions, least recently active first
+        self._resident: "OrderedDict[int, GameSession]" = OrderedDict()
+        self._resident_bytes = 0
+        self.hibernations = 0
+        self.rehydrations = 0
+        self._next_id = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def _session_seed(self, session_id: int) -> Optional[int]:
+        return None if self.seed is None else self.seed + session_id
+
+    def resident_bytes(self) -> int:
+        return self._resident_bytes
+
+    def _hibernate(self, session_id: int):
+        session = self._resident.pop(session_id)
+        self._resident_bytes -= session.resident_size
+        session.hibernate(os.path.join(self.hibernate_dir, f"session_{session_id}.json"))
+        self.hibernations += 1
+
+    def _session_waiting(self, session_id: int, session: GameSession):
+        self._resident[session_id] = session
+        self._resident.move_to_end(session_id)
+        if self.memory_budget is None:
+            return
+        # Measuring takes about a millisecond, so sizes are only refreshed now and then
+        if not session.resident_size or session.waits % self.SIZE_REFRESH == 0:
+            self._resident_bytes -= session.resident_size
+            session.resident_size = simulator_size(session.sim)
+            self._resident_bytes += session.resident_size
+        for lru_id in list(self._resident):
+            if self._resident_bytes <= self.memory_budget:
+                break
+            if self._resident[lru_id].waiting_since is not None:
+                self._hibernate(lru_id)
+
+    def _session_woken(self, session_id: int, session: GameSession):
+        if session_id not in self._resident:
+            self.rehydrations += 1
+            self._resident[session_id] = session
+        self._resident.move_to_end(session_id)
+
+    def hibernate_idle(self, now: Optional[float] = None) -> int:
+        """Hibernate every session waiting longer than idle_timeout; returns how many."""
+        if self.idle_timeout is None:
+            return 0
+        cutoff = (time.monotonic() if now is None else now) - self.idle_timeout
+        idle = [session_id for session_id, session in self._resident.items()
+                if session.waiting_since is not None and session.waiting_since <= cutoff]
+        for session_id in idle:
+            self._hibernate(session_id)
+        return len(idle)
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.hibernate_idle()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session_id = self._next_id
+        self._next_id += 1
+
+        async def send(text: str):
+            writer.write(text.encode())
+            await writer.drain()
+
+        async def receive() -> Optional[str]:
+            line = await reader.readline()
+            return line.decode(errors="replace") if line else None
+
+        record_path = None
+        if self.record_dir is not None:
+            # Session ids restart with the server, so the start time keeps names unique
+            record_path = os.path.join(self.record_dir, f"session_{int(time.time())}_{session_id}.json")
+        session = GameSession(send, receive, self._session_seed(session_id), self.simulator_factory,
+                              event_log=self.event_log, session_id=session_id, record_path=record_path,
+                              narrator=self.narrator)
+        session.on_wait = lambda s: self._session_waiting(session_id, s)
+        session.on_wake = lambda s: self._session_woken(session_id, s)
+        self.sessions[session_id] = session
+        try:
+            await session.run()
+        except Exception:
+            get_logger().exception("Session %d crashed", session_id)
+        finally:
+            del self.sessions[session_id]
+            if self._resident.pop(session_id, None) is not None:
+                self._resident_bytes -= session.resident_size
+            session.discard()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self):
+        os.makedirs(self.hibernate_dir, exist_ok=True)
+        if self.record_dir is not None:
+            os.makedirs(self.record_dir, exist_ok=True)
+        self._server = await asyncio.start_server(self._handle, self.host, self.port,
+                                                  backlog=self.backlog)
+        if self.idle_timeout is not None:
+            self._sweeper = asyncio.create_task(self._sweep())
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Host University Life Simulator games over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8023)
+    parser.add_argument("--seed", type=int, help="Base seed; session n uses seed + n")
+    parser.add_argument("--idle-timeout", type=float, default=300.0,
+                        help="Seconds waiting for input before a session is hibernated")
+    parser.add_argument("--memory-budget-mb", type=float,
+                        help="Hibernate least recently active sessions beyond this much resident state")
+    parser.add_argument("--hibernate-dir", default="hibernated_sessions")
+    parser.add_argument("--event-log", help="Write structured session and step events to this file")
+    parser.add_argument("--event-log-max-mb", type=float, default=10.0,
+                        help="Rotate the event log once it reaches this size")
+    parser.add_argument("--record-dir",
+                        help="Save a replayable recording of every session here (see session_replay.py)")
+    parser.add_argument("--narrate", action="store_true",
+                        help="Add generated text to story decisions (local stub backend)")
+    parser.add_argument("--narrate-latency", type=float, default=0.0,
+                        help="Seconds the stub backend takes per text, to mimic a remote model")
+    args = parser.parse_args()
+    budget = None if args.memory_budget_mb is None else int(args.memory_budget_mb * 2**20)
+    event_log = (NULL_EVENT_LOG if args.event_log is None
+                 else EventLog(args.event_log, max_bytes=int(args.event_log_max_mb * 2**20)))
+    narrator = NarrativeGenerator(StubBackend(args.narrate_latency)) if args.narrate else None
+    asyncio.run(SessionServer(args.host, args.port, args.seed, idle_timeout=args.idle_timeout,
+                              memory_budget=budget, hibernate_dir=args.hibernate_dir,
+                              event_log=event_log, record_dir=args.record_dir,
+                              narrator=narrator).serve_forever())
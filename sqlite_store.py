@@ -0,0 +1,420 @@
+"""SQLite persistence for hosted games with many players.
+
+Stores the same state save_game writes (Student with its courses,
+StoryProgress, clock and weather) in one database instead of one
+save_*.json per player. Lists and maps that players grow over time
+(inventory, courses and their assignments, research projects,
+relationships, key decisions, achievements) get their own tables; small
+fixed-shape maps stay JSON columns on the player row.
+
+Writes are batched: save_many upserts any number of players in a single
+transaction with executemany. The database runs in WAL mode so
+leaderboard and cohort queries never block writers, and connections come
+from a small pool that threads share.
+"""
+import json
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from save_store import SlotInfo
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    player_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    major TEXT NOT NULL,
+    semester INTEGER NOT NULL,
+    gpa REAL NOT NULL,
+    credits INTEGER NOT NULL,
+    energy INTEGER NOT NULL,
+    max_energy INTEGER NOT NULL,
+    money INTEGER NOT NULL,
+    mental_state TEXT NOT NULL,
+    stress_level INTEGER NOT NULL,
+    job TEXT,
+    skills TEXT NOT NULL,
+    extracurriculars TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    skill_levels TEXT NOT NULL,
+    current_time TEXT NOT NULL,
+    current_weather TEXT NOT NULL,
+    clock TEXT,  -- GameClock.to_dict() as JSON; NULL for rows saved before the game clock
+    story_semester INTEGER NOT NULL,
+    major_plot TEXT,
+    story_arcs TEXT NOT NULL,
+    global_awareness INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_gpa ON players (gpa DESC);
+CREATE INDEX IF NOT EXISTS players_semester ON players (semester, gpa DESC);
+CREATE INDEX IF NOT EXISTS players_major ON players (major, gpa DESC);
+
+CREATE TABLE IF NOT EXISTS inventory (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (player_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS courses (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    credits INTEGER NOT NULL,
+    difficulty INTEGER NOT NULL,
+    midterm_grade REAL NOT NULL,
+    final_grade REAL NOT NULL,
+    attendance INTEGER NOT NULL,
+    participation REAL NOT NULL,
+    PRIMARY KEY (player_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS course_assignments (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    course_position INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    weight REAL NOT NULL,
+    grade REAL NOT NULL,
+    PRIMARY KEY (player_id, course_position, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS research_projects (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    duration INTEGER NOT NULL,
+    progress INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    PRIMARY KEY (player_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS relationships (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    scope TEXT NOT NULL,  -- 'player' (Student.relationships) or 'story'
+    name TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (player_id, scope, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS key_decisions (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    decision TEXT NOT NULL,
+    choice TEXT NOT NULL,
+    PRIMARY KEY (player_id, decision)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS achievements (
+    player_id TEXT NOT NULL REFERENCES players ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    PRIMARY KEY (player_id, name)
+) WITHOUT ROWID;
+"""
+
+PLAYER_COLUMNS = (
+    "player_id", "name", "major", "semester", "gpa", "credits", "energy", "max_energy",
+    "money", "mental_state", "stress_level", "job", "skills", "extracurriculars", "stats",
+    "skill_levels", "current_time", "current_weather", "clock", "story_semester", "major_plot",
+    "story_arcs", "global_awareness", "updated_at",
+)
+UPSERT_PLAYER = "INSERT INTO players ({}) VALUES ({}) ON CONFLICT (player_id) DO UPDATE SET {}".format(
+    ", ".join(PLAYER_COLUMNS),
+    ", ".join("?" * len(PLAYER_COLUMNS)),
+    ", ".join(f"{column} = excluded.{column}" for column in PLAYER_COLUMNS[1:]),
+)
+# Child rows are replaced wholesale on every save of a player
+CHILD_TABLES = ("inventory", "courses", "course_assignments", "research_projects",
+                "relationships", "key_decisions", "achievements")
+CHILD_INSERTS = {
+    "inventory": "INSERT INTO inventory VALUES (?, ?, ?, ?, ?)",
+    "courses": "INSERT INTO courses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+    "course_assignments": "INSERT INTO course_assignments VALUES (?, ?, ?, ?, ?, ?)",
+    "research_projects": "INSERT INTO research_projects VALUES (?, ?, ?, ?, ?, ?, ?)",
+    "relationships": "INSERT INTO relationships VALUES (?, ?, ?, ?)",
+    "key_decisions": "INSERT INTO key_decisions VALUES (?, ?, ?)",
+    "achievements": "INSERT INTO achievements VALUES (?, ?)",
+}
+
+class ConnectionPool:
+    """Up to `size` connections shared between threads, opened on demand.
+
+    Every connection is set up for WAL with synchronous=NORMAL, which keeps
+    commits cheap while readers keep reading during writes.
+    """
+
+    def __init__(self, path: str, size: int = 4):
+        self.path = path
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False,
+                               isolation_level=None)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return self._connect()
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+def _rows(player_id: str, save_data: Dict, updated_at: float) -> Tuple[tuple, Dict[str, List[tuple]]]:
+    player = save_data["player"]
+    courses = player.get("courses", [])
+    story = save_data["story_progress"]
+    player_row = (
+        player_id, player["name"], player["major"], player["semester"], player["gpa"],
+        player["credits"], player["energy"], player["max_energy"], player["money"],
+        player["mental_state"], player["stress_level"], json.dumps(player["job"]),
+        json.dumps(player["skills"]), json.dumps(player["extracurriculars"]),
+        json.dumps(player["stats"]), json.dumps(player["skill_levels"]),
+        save_data["current_time"], save_data["current_weather"],
+        json.dumps(save_data["clock"]) if "clock" in save_data else None, story["semester"],
+        story["major_plot"], json.dumps(story["story_arcs"]), story["global_awareness"],
+        updated_at,
+    )
+    children = {
+        "inventory": [(player_id, i, item["name"], item["type"], item["value"])
+                      for i, item in enumerate(player["inventory"])],
+        "courses": [(player_id, i, c["name"], c["credits"], c["difficulty"], c["midterm_grade"],
+                     c["final_grade"], c["attendance"], c["participation"])
+                    for i, c in enumerate(courses)],
+        "course_assignments": [(player_id, i, j, a["name"], a["weight"], a["grade"])
+                               for i, c in enumerate(courses)
+                               for j, a in enumerate(c["assignments"])],
+        "research_projects": [(player_id, i, p["name"], p["difficulty"], p["duration"],
+                               p["progress"], int(p["completed"]))
+                              for i, p in enumerate(player["research_projects"])],
+        "relationships": ([(player_id, "player", name, level)
+                           for name, level in player["relationships"].items()] +
+                          [(player_id, "story", name, level)
+                           for name, level in story["relationships"].items()]),
+        "key_decisions": [(player_id, decision, choice)
+                          for decision, choice in story["key_decisions"].items()],
+        "achievements": [(player_id, name) for name in story["achievements"]],
+    }
+    return player_row, children
+
+class SqliteStore:
+    """Players keyed by player_id (the game uses the lower-cased player name)."""
+
+    def __init__(self, path: str = "university_sim.db", pool_size: int = 4):
+        self.pool = ConnectionPool(path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+            if "clock" not in columns:
+                # Databases created before the game clock was stored
+                conn.execute("ALTER TABLE players ADD COLUMN clock TEXT")
+
+    def close(self):
+        self.pool.close()
+
+    def save_many(self, players: Iterable[Tuple[str, Dict]]) -> int:
+        """Upsert (player_id, save_data) pairs in one transaction.
+
+        save_data has the build_save_data() layout. Returns the number of
+        players written.
+        """
+        now = time.time()
+        player_rows = []
+        child_rows: Dict[str, List[tuple]] = {table: [] for table in CHILD_TABLES}
+        for player_id, save_data in players:
+            player_row, children = _rows(player_id, save_data, now)
+            player_rows.append(player_row)
+            for table, rows in children.items():
+                child_rows[table].extend(rows)
+        if not player_rows:
+            return 0
+        ids = [(row[0],) for row in player_rows]
+        with self.pool.transaction() as conn:
+            conn.executemany(UPSERT_PLAYER, player_rows)
+            for table in CHILD_TABLES:
+                conn.executemany(f"DELETE FROM {table} WHERE player_id = ?", ids)
+                if child_rows[table]:
+                    conn.executemany(CHILD_INSERTS[table], child_rows[table])
+        return len(player_rows)
+
+    def save(self, sim) -> str:
+        """Upsert one simulator's current player; returns its player_id."""
+        player_id = sim.player.name.lower()
+        self.save_many([(player_id, sim.build_save_data())])
+        return player_id
+
+    def load(self, player_id: str) -> Optional[Dict]:
+        """The build_save_data() layout for a player, or None if it was never saved."""
+        with self.pool.connection() as conn:
+            conn.row_factory = sqlite3.Row
+            try:
+                row = conn.execute("SELECT * FROM players WHERE player_id = ?",
+                                   (player_id,)).fetchone()
+                if row is None:
+                    return None
+                children = {
+                    table: conn.execute(f"SELECT * FROM {table} WHERE player_id = ?",
+                                        (player_id,)).fetchall()
+                    for table in CHILD_TABLES
+                }
+            finally:
+                conn.row_factory = None
+
+        def ordered(table, *keys):
+            return sorted(children[table], key=lambda r: tuple(r[k] for k in keys))
+
+        assignments: Dict[int, List[Dict]] = {}
+        for a in ordered("course_assignments", "course_position", "position"):
+            assignments.setdefault(a["course_position"], []).append(
+                {"name": a["name"], "weight": a["weight"], "grade": a["grade"]})
+        courses = [{
+            "name": c["name"], "credits": c["credits"], "difficulty": c["difficulty"],
+            "assignments": assignments.get(c["position"], []),
+            "midterm_grade": c["midterm_grade"], "final_grade": c["final_grade"],
+            "attendance": c["attendance"], "participation": c["participation"],
+        } for c in ordered("courses", "position")]
+        relationships = {"player": {}, "story": {}}
+        for r in children["relationships"]:
+            relationships[r["scope"]][r["name"]] = r["level"]
+
+        save_data = {
+            "player": {
+                "name": row["name"],
+                "major": row["major"],
+                "semester": row["semester"],
+                "energy": row["energy"],
+                "max_energy": row["max_energy"],
+                "gpa": row["gpa"],
+                "credits": row["credits"],
+                "inventory": [{"name": i["name"], "type": i["type"], "value": i["value"]}
+                              for i in ordered("inventory", "position")],
+                "skills": json.loads(row["skills"]),
+                "money": row["money"],
+                "mental_state": row["mental_state"],
+                "stress_level": row["stress_level"],
+                "relationships": relationships["player"],
+                "job": json.loads(row["job"]),
+                "extracurriculars": json.loads(row["extracurriculars"]),
+                "stats": json.loads(row["stats"]),
+                "research_projects": [
+                    {"name": p["name"], "difficulty": p["difficulty"], "duration": p["duration"],
+                     "progress": p["progress"], "completed": bool(p["completed"])}
+                    for p in ordered("research_projects", "position")
+                ],
+                "skill_levels": json.loads(row["skill_levels"]),
+                "courses": courses,
+            },
+            "current_time": row["current_time"],
+            "current_weather": row["current_weather"],
+            "story_progress": {
+                "semester": row["story_semester"],
+                "major_plot": row["major_plot"],
+                "story_arcs": json.loads(row["story_arcs"]),
+                "relationships": relationships["story"],
+                "key_decisions": {d["decision"]: d["choice"] for d in children["key_decisions"]},
+                "global_awareness": row["global_awareness"],
+                "achievements": sorted(a["name"] for a in children["achievements"]),
+            },
+        }
+        if row["clock"] is not None:
+            save_data["clock"] = json.loads(row["clock"])
+        return save_data
+
+    def restore(self, sim, player_id: str) -> bool:
+        """Load a stored player into sim."""
+        save_data = self.load(player_id)
+        if save_data is None:
+            return False
+        sim.apply_save_data(save_data)
+        return True
+
+    def delete(self, player_id: str):
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM players WHERE player_id = ?", (player_id,))
+
+    def slots(self, limit: Optional[int] = None) -> List[SlotInfo]:
+        """Stored players for the save picker, most recently saved first."""
+        sql = ("SELECT player_id, name, major, semester, gpa, updated_at, 0 FROM players "
+               "ORDER BY updated_at DESC")
+        params: tuple = ()
+        if limit is not None:
+            sql += " LIMIT ?"
+            params = (limit,)
+        with self.pool.connection() as conn:
+            return [SlotInfo(*row) for row in conn.execute(sql, params)]
+
+    def leaderboard(self, limit: int = 10, major: Optional[str] = None,
+                    semester: Optional[int] = None) -> List[Tuple[str, str, int, float]]:
+        """Top (name, major, semester, gpa) rows, optionally within one major/semester."""
+        clauses, params = [], []
+        if major is not None:
+            clauses.append("major = ?")
+            params.append(major)
+        if semester is not None:
+            clauses.append("semester = ?")
+            params.append(semester)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        with self.pool.connection() as conn:
+            return conn.execute(
+                f"SELECT name, major, semester, gpa FROM players {where}"
+                "ORDER BY gpa DESC LIMIT ?", params + [limit]).fetchall()
+
+    def cohort_summary(self, semester: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Per-major player count and average/best GPA, optionally for one semester."""
+        where, params = ("WHERE semester = ? ", (semester,)) if semester is not None else ("", ())
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT major, COUNT(*), AVG(gpa), MAX(gpa) FROM players {where}"
+                "GROUP BY major ORDER BY major", params).fetchall()
+        return {major: {"players": count, "gpa_mean": mean, "gpa_max": best}
+                for major, count, mean, best in rows}
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect a University Life Simulator database.")
+    parser.add_argument("database", nargs="?", default="university_sim.db")
+    parser.add_argument("--major")
+    parser.add_argument("--semester", type=int)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+    store = SqliteStore(args.database)
+    for rank, (name, major, semester, gpa) in enumerate(
+            store.leaderboard(args.limit, args.major, args.semester), 1):
+        print(f"{rank:>3}. {name} ({major}) - Semester {semester}, GPA {gpa:.2f}")
+    print(json.dumps(store.cohort_summary(args.semester), indent=2))
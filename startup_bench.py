@@ -0,0 +1,102 @@
+"""Measure how long a fresh simulator process takes to become interactive.
+
+Each sample starts a new interpreter, the way per-job simulator processes
+are started, and measures:
+
+  interpreter  python -c pass, the floor nothing here can improve
+  import       importing ProjectTest, timed inside the child
+  first prompt launching `python ProjectTest.py` until the first question
+               ("Do you want to load a saved game?") is written
+
+One warm-up sample of each is taken and discarded first, so bytecode
+compilation and a cold disk cache do not count, then medians over --runs
+samples are reported. The import and first-prompt
+times are also reported net of the bare interpreter, and are checked
+against --import-budget-ms and --prompt-budget-ms. If either budget is
+exceeded the exit status is 1, so the benchmark can gate CI.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIRST_PROMPT = b"Do you want to load a saved game?"
+
+def time_interpreter() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+def time_import(cwd: str) -> float:
+    code = ("import sys, time; sys.path.insert(0, %r); start = time.perf_counter(); "
+            "import ProjectTest; print(time.perf_counter() - start)" % HERE)
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, check=True,
+                            capture_output=True)
+    return float(result.stdout)
+
+def time_first_prompt(cwd: str) -> float:
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, os.path.join(HERE, "ProjectTest.py")], cwd=cwd,
+                             stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                             stderr=subprocess.DEVNULL)
+    seen = b""
+    try:
+        # input() flushes its prompt, so the question arrives as soon as it is asked
+        while FIRST_PROMPT not in seen:
+            chunk = os.read(child.stdout.fileno(), 4096)
+            if not chunk:
+                raise RuntimeError("simulator exited before its first prompt")
+            seen += chunk
+        return time.perf_counter() - start
+    finally:
+        child.kill()
+        child.wait()
+        child.stdin.close()
+        child.stdout.close()
+
+def measure(runs: int, cwd: str) -> Dict[str, float]:
+    samples: Dict[str, List[float]] = {"interpreter": [], "import": [], "first_prompt": []}
+    time_interpreter(), time_import(cwd), time_first_prompt(cwd)  # Warm-up
+    for _ in range(runs):
+        samples["interpreter"].append(time_interpreter())
+        samples["import"].append(time_import(cwd))
+        samples["first_prompt"].append(time_first_prompt(cwd))
+    return {name: statistics.median(values) for name, values in samples.items()}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for the simulator.")
+    parser.add_argument("--runs", type=int, default=10, help="samples per measurement")
+    parser.add_argument("--cwd", default=".",
+                        help="directory the simulator starts in (its config.yaml is used if present)")
+    # About a third above the slowest median seen so far (50 ms), still well below eager imports (79 ms)
+    parser.add_argument("--import-budget-ms", type=float, default=65.0,
+                        help="allowed import time of ProjectTest")
+    parser.add_argument("--prompt-budget-ms", type=float, default=80.0,
+                        help="allowed time to first prompt beyond bare interpreter startup")
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs, args.cwd)
+    interpreter_ms = result["interpreter"] * 1000
+    import_ms = result["import"] * 1000
+    prompt_ms = result["first_prompt"] * 1000 - interpreter_ms
+    print(f"interpreter startup:  {interpreter_ms:7.1f} ms")
+    print(f"import ProjectTest:   {import_ms:7.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"time to first prompt: {result['first_prompt'] * 1000:7.1f} ms  "
+          f"({prompt_ms:.1f} ms over interpreter, budget {args.prompt_budget_ms:.0f} ms)")
+
+    over = []
+    if import_ms > args.import_budget_ms:
+        over.append("import")
+    if prompt_ms > args.prompt_budget_ms:
+        over.append("first prompt")
+    if over:
+        print("Over budget: " + ", ".join(over), file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,343 @@
+"""Exhaustive explorer for the story events reachable from trigger_story_event.
+
+Plays every choice of every milestone handler (and both ends of every random
+draw inside them) from a fresh character, one arc event at a time, across
+all semesters. Game states are canonicalized and collapsed in a
+transposition table, so paths that reach the same state are searched once.
+Each MajorPlot is searched in its own process and scored with its own
+weights; the report lists the best- and worst-case paths per plot, choices
+that are never on an optimal continuation, choices that always lead to the
+same state as a sibling, milestones without handlers and event handlers no
+milestone ever reaches.
+"""
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ProjectTest import (DecisionPolicy, MajorPlot, MentalState, StoryProgress, Student,
+                         UniversityLifeSimulator, discard_output)
+
+ROUNDS_PER_SEMESTER = 3  # game_steps runs three run_event_round steps per semester
+
+# How much each plot values the end state; used to rank paths
+PLOT_WEIGHTS = {
+    MajorPlot.ACADEMIC_EXCELLENCE: {"gpa": 100, "credits": 2, "relationships": 0.2, "awareness": 0.5, "skills": 2},
+    MajorPlot.SOCIAL_BUTTERFLY: {"gpa": 20, "credits": 0.5, "relationships": 1.5, "awareness": 0.5, "skills": 1},
+    MajorPlot.ENTREPRENEURIAL_SPIRIT: {"gpa": 20, "credits": 0.5, "relationships": 0.5, "awareness": 1, "skills": 5},
+    MajorPlot.RESEARCH_PIONEER: {"gpa": 50, "credits": 1, "relationships": 0.2, "awareness": 2, "skills": 4},
+}
+ACHIEVEMENT_POINTS = 5
+KEY_DECISION_POINTS = 3
+
+
+class _NeedAnswer(Exception):
+    """Raised when a scripted run reaches a choice or draw past the end of its script."""
+
+    def __init__(self, alternatives: List[Tuple[object, str]]):
+        self.alternatives = alternatives
+
+class _Script:
+    def __init__(self, answers: Tuple):
+        self.answers = answers
+        self.position = 0
+        self.labels: List[str] = []
+        self.first_choice: Optional[str] = None
+
+    def next(self, alternatives: List[Tuple[object, str]]):
+        if self.position == len(self.answers):
+            raise _NeedAnswer(alternatives)
+        value, label = self.answers[self.position]
+        self.position += 1
+        self.labels.append(label)
+        return value
+
+class _ScriptedPolicy(DecisionPolicy):
+    def __init__(self):
+        self.script: Optional[_Script] = None
+        self.milestone = ""
+
+    def choose(self, options: List[str]) -> int:
+        alternatives = [(i, f"{self.milestone}: {option}") for i, option in enumerate(options, 1)]
+        choice = self.script.next(alternatives)
+        if self.script.first_choice is None:
+            self.script.first_choice = alternatives[choice - 1][1]
+        return choice
+
+    # Story handlers only ever make menu choices
+    def confirm(self, prompt: str) -> bool:
+        raise RuntimeError(f"Story handlers are not expected to ask: {prompt}")
+
+    def ask_text(self, prompt: str) -> str:
+        raise RuntimeError(f"Story handlers are not expected to ask: {prompt}")
+
+    def ask_number(self, prompt: str, low: float, high: float, kind=int):
+        raise RuntimeError(f"Story handlers are not expected to ask: {prompt}")
+
+    def create_character(self, majors: List[str], difficulties: List[str]):
+        raise RuntimeError("Story handlers are not expected to create characters")
+
+class _BoundaryRandom(random.Random):
+    """Branches on the extreme outcomes of each draw instead of sampling.
+
+    Every threshold test in the story handlers compares a draw against a
+    value, so the two ends of the range cover both sides of it.
+    """
+
+    def __init__(self):
+        super().__init__(0)
+        self.script: Optional[_Script] = None
+
+    def randint(self, a, b):
+        if a == b:
+            return a
+        return self.script.next([(a, f"(roll {a})"), (b, f"(roll {b})")])
+
+    def random(self):
+        return self.script.next([(0.0, "(lucky draw)"), (0.999999, "(unlucky draw)")])
+
+    def uniform(self, a, b):
+        return self.script.next([(a, f"(draw {a})"), (b, f"(draw {b})")])
+
+    def choice(self, seq):
+        return self.script.next([(item, f"({item})") for item in seq])
+
+class _Node(NamedTuple):
+    player: Student
+    story: StoryProgress
+
+class PlotReport(NamedTuple):
+    plot: str
+    states_explored: int
+    best_score: float
+    best_path: List[str]
+    worst_score: float
+    worst_path: List[str]
+    never_optimal: List[str]
+    equivalent_choices: List[str]
+    missing_handlers: List[str]
+    unreachable_handlers: List[str]
+
+def canonical_key(node: _Node, round_index: int, arc_index: int) -> Tuple:
+    player, story = node.player, node.story
+    return (
+        story.semester, round_index, arc_index,
+        tuple(arc.current_milestone for arc in story.story_arcs.values()),
+        story.major_plot,
+        tuple(sorted(story.relationships.items())),
+        tuple(sorted(story.key_decisions.items())),
+        frozenset(story.achievements),
+        story.global_awareness,
+        player.energy, player.max_energy, player.stress_level,
+        round(player.gpa, 6), player.credits, player.money,
+        tuple(player.skills), tuple(sorted(player.skill_levels.items())),
+        tuple(sorted(player.relationships.items())),
+    )
+
+def score(node: _Node, plot: MajorPlot) -> float:
+    weights = PLOT_WEIGHTS[plot]
+    player, story = node.player, node.story
+    return (
+        weights["gpa"] * player.gpa +
+        weights["credits"] * player.credits +
+        weights["relationships"] * sum(story.relationships.values()) +
+        weights["awareness"] * story.global_awareness +
+        weights["skills"] * sum(player.skill_levels.values()) +
+        ACHIEVEMENT_POINTS * len(story.achievements) +
+        KEY_DECISION_POINTS * len(story.key_decisions)
+    )
+
+def _clone(node: _Node) -> _Node:
+    """Independent copy of a node's state; much cheaper than deepcopy."""
+    return _Node(node.player.fork(), node.story.fork())
+
+def _flatten(path) -> List[str]:
+    labels = []
+    while path:
+        step, path = path
+        labels.extend(step)
+    return labels
+
+class StoryExplorer:
+    def __init__(self, plot: MajorPlot, semesters: int = 8):
+        self.plot = plot
+        self.semesters = semesters
+        self.policy = _ScriptedPolicy()
+        self.rng = _BoundaryRandom()
+        self.sim = UniversityLifeSimulator(policy=self.policy, output=discard_output,
+                                           rng=random.Random(0))
+        self.sim.rng = self.rng  # Only branch on draws made by story events
+        self.arc_names = list(StoryProgress().story_arcs)
+        # canonical key -> (best score, best path, worst score, worst path)
+        self.table: Dict[Tuple, Tuple] = {}
+        # choice label -> [times offered, times optimal]
+        self.choice_stats: Dict[str, List[int]] = {}
+        # choice label -> True while it has always matched a sibling's resulting state
+        self.equivalent: Dict[str, bool] = {}
+        self.missing_handlers = set()
+        self.reached_handlers = set()
+
+    def start_node(self) -> _Node:
+        player = Student("Explorer", "Computer Science")
+        story = StoryProgress()
+        story.set_major_plot(self.plot)
+        return _Node(player, story)
+
+    def _handler(self, story: StoryProgress, arc_index: int):
+        arc_name = self.arc_names[arc_index]
+        milestone = story.story_arcs[arc_name].get_current_milestone()
+        handler = self.sim.events.get(arc_name, milestone)
+        if handler is None:
+            self.missing_handlers.add(milestone)
+        return handler
+
+    def _play_arc_event(self, round_index: int, arc_index: int):
+        sim = self.sim
+        self.policy.milestone = sim.story_progress.story_arcs[
+            self.arc_names[arc_index]].get_current_milestone()
+        handler = self._handler(sim.story_progress, arc_index)
+        if handler is not None:
+            self.reached_handlers.add(handler.__name__)
+            handler(sim)
+
+        if arc_index == len(self.arc_names) - 1:
+            # Same bookkeeping as run_event_round after each round
+            sim.player.update_mental_state()
+            if sim.player.mental_state == MentalState.BURNOUT:
+                self.policy.milestone = "Burnout"
+                sim.handle_rest()
+            if round_index == ROUNDS_PER_SEMESTER - 1:
+                # end_semester without course grades, then start_semester
+                sim.story_progress.advance_semester()
+                sim.player.semester_up(discard_output)
+                sim.player.energy = sim.player.max_energy
+                sim.player.stress_level = 0
+
+    def _outcomes(self, node: _Node, round_index: int, arc_index: int):
+        """Every (script, resulting node) pair for one arc event."""
+        outcomes = []
+        pending = [()]
+        while pending:
+            answers = pending.pop()
+            script = _Script(answers)
+            self.policy.script = script
+            self.rng.script = script
+            self.sim.player, self.sim.story_progress = _clone(node)
+            try:
+                self._play_arc_event(round_index, arc_index)
+            except _NeedAnswer as need:
+                pending.extend(answers + (alternative,) for alternative in need.alternatives)
+                continue
+            outcomes.append((script, _Node(self.sim.player, self.sim.story_progress)))
+        return outcomes
+
+    def _next_position(self, round_index: int, arc_index: int):
+        arc_index += 1
+        if arc_index == len(self.arc_names):
+            arc_index = 0
+            round_index = (round_index + 1) % ROUNDS_PER_SEMESTER
+        return round_index, arc_index
+
+    def evaluate(self, node: _Node, round_index: int = 0, arc_index: int = 0,
+                 key: Optional[Tuple] = None):
+        if node.story.semester > self.semesters:
+            value = score(node, self.plot)
+            return value, None, value, None
+
+        next_round, next_arc = self._next_position(round_index, arc_index)
+        if arc_index < len(self.arc_names) - 1 and self._handler(node.story, arc_index) is None:
+            # Nothing can happen here, so skip straight to the next arc
+            return self.evaluate(node, next_round, next_arc)
+
+        if key is None:
+            key = canonical_key(node, round_index, arc_index)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+
+        best = worst = None
+        by_choice: Dict[str, float] = {}
+        results_by_choice: Dict[str, set] = {}
+        for script, child in self._outcomes(node, round_index, arc_index):
+            child_key = canonical_key(child, next_round, next_arc)
+            child_best, child_best_path, child_worst, child_worst_path = self.evaluate(
+                child, next_round, next_arc, child_key)
+            step = tuple(f"S{node.story.semester} {label}" for label in script.labels)
+            if best is None or child_best > best[0]:
+                best = (child_best, (step, child_best_path))
+            if worst is None or child_worst < worst[0]:
+                worst = (child_worst, (step, child_worst_path))
+            if script.first_choice is not None:
+                by_choice[script.first_choice] = max(
+                    by_choice.get(script.first_choice, child_best), child_best)
+                results_by_choice.setdefault(script.first_choice, set()).add(child_key)
+
+        self._record_choices(by_choice, results_by_choice, best[0])
+        entry = (best[0], best[1], worst[0], worst[1])
+        self.table[key] = entry
+        return entry
+
+    def _record_choices(self, by_choice, results_by_choice, best_score):
+        for label, choice_best in by_choice.items():
+            stats = self.choice_stats.setdefault(label, [0, 0])
+            stats[0] += 1
+            if choice_best >= best_score:
+                stats[1] += 1
+            outcome = results_by_choice[label]
+            same_as_sibling = any(other != label and results_by_choice[other] == outcome
+                                  for other in results_by_choice)
+            self.equivalent[label] = self.equivalent.get(label, True) and same_as_sibling
+
+    def unreachable_handlers(self) -> List[str]:
+        # Registered handlers plus *_event methods the registry never picked up
+        candidates = self.sim.events.handler_names() | {
+            name for name in dir(UniversityLifeSimulator)
+            if name.endswith("_event") and name != "trigger_story_event"}
+        return sorted(candidates - self.reached_handlers)
+
+    def report(self) -> PlotReport:
+        best_score, best_path, worst_score, worst_path = self.evaluate(self.start_node())
+        return PlotReport(
+            plot=self.plot.value,
+            states_explored=len(self.table),
+            best_score=best_score,
+            best_path=_flatten(best_path),
+            worst_score=worst_score,
+            worst_path=_flatten(worst_path),
+            never_optimal=sorted(label for label, (_, optimal) in self.choice_stats.items()
+                                 if optimal == 0),
+            equivalent_choices=sorted(label for label, same in self.equivalent.items() if same),
+            missing_handlers=sorted(self.missing_handlers),
+            unreachable_handlers=self.unreachable_handlers(),
+        )
+
+def explore_plot(plot: MajorPlot, semesters: int = 8) -> PlotReport:
+    return StoryExplorer(plot, semesters).report()
+
+def explore_all(semesters: int = 8, processes: Optional[int] = None) -> List[PlotReport]:
+    plots = list(MajorPlot)
+    with ProcessPoolExecutor(max_workers=processes or len(plots)) as pool:
+        return list(pool.map(explore_plot, plots, [semesters] * len(plots)))
+
+def format_report(report: PlotReport) -> str:
+    lines = [f"=== {report.plot} ({report.states_explored} distinct states) ===",
+             f"Best case: {report.best_score:.1f}"]
+    lines += [f"  {step}" for step in report.best_path]
+    lines.append(f"Worst case: {report.worst_score:.1f}")
+    lines += [f"  {step}" for step in report.worst_path]
+    lines.append("Never on an optimal continuation:")
+    lines += [f"  {label}" for label in report.never_optimal] or ["  (none)"]
+    lines.append("Always equivalent to a sibling choice:")
+    lines += [f"  {label}" for label in report.equivalent_choices] or ["  (none)"]
+    lines.append(f"Milestones without handlers: {', '.join(report.missing_handlers) or '(none)'}")
+    lines.append(f"Handlers no milestone reaches: {', '.join(report.unreachable_handlers) or '(none)'}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explore every story branch per major plot.")
+    parser.add_argument("--semesters", type=int, default=8)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+    for report in explore_all(args.semesters, args.processes):
+        print(format_report(report))
+        print()